@@ -0,0 +1,346 @@
+"""
+Benchmarks the scrape -> parse -> export pipeline against a local stand-in for ufc.com.
+
+The server serves a recorded rankings page and recorded athlete pages, either from a replay archive written with
+scrape_data.py -record or from the saved fixtures in tests/fixtures, with configurable
+latency and jitter. Results are written as JSON so runs can be compared.
+
+    python -m benchmarks.bench_pipeline --athletes 10 100 1000 --latency-ms 50 --output bench.json
+"""
+
+import argparse
+import http.server
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+
+# Extractors timed individually on every page
+EXTRACTOR_NAMES = [
+    "scrape_athlete_nickname",
+    "scrape_athlete_record",
+    "scrape_athlete_ranking",
+    "scrape_athlete_biography",
+    "scrape_striking_accuracy",
+    "scrape_grappling_accuracy",
+    "scrape_fight_metrics",
+    "scrape_athlete_page",
+]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the UFC scraping pipeline against a local server")
+    parser.add_argument("--athletes", help="Athlete counts to benchmark", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency-ms", help="Mean server latency per page in milliseconds", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", help="Maximum deviation from the mean latency", type=float, default=20.0)
+    parser.add_argument("--workers", help="Concurrent fetches", type=int, default=50)
+    parser.add_argument("--parser", help="Parser backend", choices=["html.parser", "lxml"], default="html.parser")
+    parser.add_argument("--corpus", help="Replay archive whose rankings and athlete pages are served", default=None)
+    parser.add_argument("--seed", help="Seed of the latency jitter", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write the results to, printed when not set", default=None)
+    return parser.parse_args()
+
+
+def load_athlete_pages(corpus_path=None):
+    """
+    Loads the athlete pages the stand-in server cycles through.
+
+    :param corpus_path: Optional replay archive to take the recorded athlete pages from
+    :return: List of bytes of athlete pages
+    """
+
+    if corpus_path:
+        from src.scraper.corpus import PageReplayer
+
+        replayer = PageReplayer(corpus_path)
+        pages = [
+            replayer.get_response(recording["url"]).content
+            for key, recording in sorted(replayer.manifest.items())
+            if key.startswith("athlete/") and recording["status_code"] == 200
+        ]
+        replayer.close()
+
+    else:
+        athletes_directory = os.path.join(FIXTURES_DIRECTORY, "athletes")
+        pages = []
+
+        for filename in sorted(os.listdir(athletes_directory)):
+            with open(os.path.join(athletes_directory, filename), "rb") as file:
+                pages.append(file.read())
+
+    if not pages:
+        raise ValueError("No athlete pages to serve")
+
+    return pages
+
+
+def load_rankings_page(corpus_path=None):
+    """
+    Loads the rankings page the stand-in server serves on /rankings.
+
+    :param corpus_path: Optional replay archive to take the recorded rankings page from
+    :return: Bytes of the rankings page
+    """
+
+    if corpus_path:
+        from src.scraper.corpus import PageReplayer
+
+        replayer = PageReplayer(corpus_path)
+        recording = replayer.manifest.get("rankings")
+        page = replayer.get_response(recording["url"]).content if recording is not None else None
+        replayer.close()
+
+        if page is not None:
+            return page
+
+    with open(os.path.join(FIXTURES_DIRECTORY, "rankings.html"), "rb") as file:
+        return file.read()
+
+
+class BenchmarkServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rankings_page, athlete_pages, latency_ms, jitter_ms, seed):
+        super().__init__(("127.0.0.1", 0), BenchmarkPageHandler)
+        self.rankings_page = rankings_page
+        self.athlete_pages = athlete_pages
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_delay(self):
+        with self.random_lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+class BenchmarkPageHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the recorded rankings page, and athlete number N as the N-th recorded page, wrapping around them."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(self.server.get_delay())
+
+        path = self.path.rstrip("/")
+
+        if path == "/rankings":
+            body = self.server.rankings_page
+        else:
+            slug = path.rsplit("/", 1)[-1]
+            athlete_number = int(slug.rsplit("-", 1)[-1]) if slug.rsplit("-", 1)[-1].isdigit() else 0
+            body = self.server.athlete_pages[athlete_number % len(self.server.athlete_pages)]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def summarize(samples):
+    """
+    :param samples: List of durations in seconds
+    :return: Dict of summary statistics in milliseconds
+    """
+
+    ordered = sorted(samples)
+
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def benchmark_rankings(scraper):
+    """
+    Times fetching and parsing the rankings page with scrape_ufc_rankings().
+
+    :return: Dict with the time and the number of rankings and athletes found
+    """
+
+    start = time.perf_counter()
+    rankings = scraper.scrape_ufc_rankings()
+    elapsed = time.perf_counter() - start
+
+    return {"seconds": round(elapsed, 4), "rankings": len(rankings), "athletes": len(scraper.current_rankings_list)}
+
+
+def benchmark_fetch(scraper, athlete_list):
+    """
+    Fetches every athlete page through the scraper's pooled session.
+
+    :return: Tuple of the fetch results dict and the list of fetched html pages
+    """
+
+    latencies = [0.0] * len(athlete_list)
+    pages = [""] * len(athlete_list)
+
+    def fetch(athlete_index):
+        start = time.perf_counter()
+        page = scraper.fetch_page(scraper.get_athlete_url(athlete_list[athlete_index]))
+        latencies[athlete_index] = time.perf_counter() - start
+        pages[athlete_index] = page.text
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=scraper.max_workers) as executor:
+        list(executor.map(fetch, range(len(athlete_list))))
+
+    elapsed = time.perf_counter() - start
+    bytes_downloaded = sum(len(page.encode("utf-8")) for page in pages)
+
+    results = {
+        "seconds": round(elapsed, 4),
+        "pages_per_second": round(len(athlete_list) / elapsed, 2),
+        "bytes_downloaded": bytes_downloaded,
+        "latency": summarize(latencies),
+    }
+
+    return results, pages
+
+
+def benchmark_parse(scraper, pages):
+    """
+    Times building the soup and running each extractor on every fetched page.
+
+    :return: Dict of parse timings per stage
+    """
+
+    soup_samples = []
+    extractor_samples = {extractor_name: [] for extractor_name in EXTRACTOR_NAMES}
+
+    for html_content in pages:
+        start = time.perf_counter()
+        soup = scraper.make_soup(html_content)
+        soup_samples.append(time.perf_counter() - start)
+
+        for extractor_name in EXTRACTOR_NAMES:
+            extractor = getattr(scraper, extractor_name)
+            start = time.perf_counter()
+            extractor(soup)
+            extractor_samples[extractor_name].append(time.perf_counter() - start)
+
+    return {
+        "make_soup": summarize(soup_samples),
+        "extractors": {name: summarize(samples) for name, samples in extractor_samples.items()},
+    }
+
+
+def benchmark_export(scraper, results):
+    """
+    Times export_to_excel() on the scraped results inside a scratch directory.
+
+    :return: Dict with the export time and file size
+    """
+
+    working_directory = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as scratch_directory:
+        os.makedirs(os.path.join(scratch_directory, "fighter_stats"))
+        os.chdir(scratch_directory)
+
+        try:
+            start = time.perf_counter()
+            excel_filepath = scraper.export_to_excel(results)
+            elapsed = time.perf_counter() - start
+            file_size = os.path.getsize(excel_filepath)
+
+        finally:
+            os.chdir(working_directory)
+
+    return {"seconds": round(elapsed, 4), "bytes_written": file_size}
+
+
+def run_benchmark(number_of_athletes, server, arguments):
+    from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+    scraper = UFCWebsiteScraper(max_workers=arguments.workers, parser_backend=arguments.parser)
+    scraper.BASE_URL = server.url + "/athlete/"
+    scraper.RANKINGS_URL = server.url + "/rankings"
+    rankings_results = benchmark_rankings(scraper)
+    athlete_list = [f"Benchmark Athlete {athlete_number}" for athlete_number in range(number_of_athletes)]
+
+    fetch_results, pages = benchmark_fetch(scraper, athlete_list)
+    parse_results = benchmark_parse(scraper, pages)
+
+    start = time.perf_counter()
+    results = [scraper.extract_athlete_stats(name, html) for name, html in zip(athlete_list, pages)]
+    extract_seconds = time.perf_counter() - start
+
+    return {
+        "athletes": number_of_athletes,
+        "scrape_ufc_rankings": rankings_results,
+        "fetch": fetch_results,
+        "parse": parse_results,
+        "extract_athlete_stats_seconds": round(extract_seconds, 4),
+        "export_to_excel": benchmark_export(scraper, results),
+    }
+
+
+def main():
+    arguments = parse_arguments()
+
+    server = BenchmarkServer(
+        load_rankings_page(arguments.corpus),
+        load_athlete_pages(arguments.corpus),
+        arguments.latency_ms,
+        arguments.jitter_ms,
+        arguments.seed,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    runs = [run_benchmark(number_of_athletes, server, arguments) for number_of_athletes in arguments.athletes]
+
+    server.shutdown()
+    server.server_close()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_ms": arguments.latency_ms,
+            "jitter_ms": arguments.jitter_ms,
+            "workers": arguments.workers,
+            "parser": arguments.parser,
+            "corpus": arguments.corpus,
+            "seed": arguments.seed,
+            "distinct_pages": len(server.athlete_pages),
+        },
+        "runs": runs,
+    }
+
+    output = json.dumps(report, indent=2)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            file.write(output)
+
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,165 @@
+import logging
 import time
 
+from src.scraper.cache import ResponseCache
+from src.scraper.cli import parse_arguments
+from src.scraper.corpus import PageRecorder, PageReplayer
+from src.scraper.metrics import serve_metrics
+from src.scraper.reporting import configure_logging
+from src.scraper.retry import RetryPolicy
+from src.scraper.slugs import SlugIndex
+from src.scraper.store import HistoryStore
+from src.scraper.throttle import AdaptiveThrottle
 from src.scraper.ufc_scraper import UFCWebsiteScraper
 
+logger = logging.getLogger("scrape_data")
+
 
 def main():
     start_time = time.time()
+    args = parse_arguments()
+    log_listener = configure_logging(args["log_level"], json_format=args["log_json"])
+
+    # Flush every queued log message, even when the run fails
+    try:
+        cache = None
+
+        if args["cache_dir"]:
+            cache = ResponseCache(
+                args["cache_dir"], ttl=args["cache_ttl"], max_size_bytes=args["cache_max_mb"] * 1024 * 1024
+            )
+
+        recorder = PageRecorder(args["record"]) if args["record"] else None
+        replayer = PageReplayer(args["replay"]) if args["replay"] else None
+
+        throttle = None
+
+        if not args["fixed_concurrency"]:
+            throttle = AdaptiveThrottle(latency_target=args["latency_target"], rate=args["max_rate"])
+
+        retry_policy = RetryPolicy(max_attempts=args["max_attempts"])
+        slug_index = SlugIndex(args["slug_index"])
+
+        ufc_scraper = UFCWebsiteScraper(
+            parser_backend=args["parser"],
+            partial_parse=args["partial_parse"],
+            cache=cache,
+            recorder=recorder,
+            replayer=replayer,
+            progress_interval=args["progress_interval"],
+            throttle=throttle,
+            retry_policy=retry_policy,
+            compact_records=args["compact_records"],
+            divisions=args["divisions"],
+            slug_index=slug_index,
+            history_concurrency=args["history_concurrency"],
+            fight_history=args["fight_history"],
+        )
+
+        metrics_server = None
+
+        if args["metrics_port"] is not None:
+            metrics_server = serve_metrics(ufc_scraper.metrics, port=args["metrics_port"])
+            logger.info("Serving metrics on http://127.0.0.1:%s/metrics", metrics_server.server_address[1])
+
+        if args["previous"]:
+            number_of_athletes = ufc_scraper.load_previous_run(args["previous"])
+            logger.info("Loaded %s athletes from previous run %s", number_of_athletes, args["previous"])
+
+        logger.info("Scraping the UFC Rankings website . . .")
+        text_filepath = ufc_scraper.scrape_ufc_rankings_to_txt_file()
+        logger.info("Finished! Scraped UFC Rankings to %s", text_filepath)
+        logger.info(
+            "Found %s rankings of %s athletes",
+            len(ufc_scraper.current_rankings),
+            len(ufc_scraper.current_rankings_list),
+        )
+
+        store = HistoryStore(args["store"]) if args["store"] else None
+        results = None
+
+        if args["crawl"]:
+            logger.info("Scraping each fighter from the athletes directory . . .")
+
+            if args["stream"]:
+                athlete_source = ufc_scraper.iter_directory_athletes(args["crawl_pages"])
+                output_filepaths = ufc_scraper.stream_athlete_stats(athlete_source, args["stream"], store=store)
+                logger.info("Finished! Streamed data to %s", ", ".join(output_filepaths))
+            else:
+                results = ufc_scraper.crawl_athlete_stats(args["crawl_pages"])
+        else:
+            logger.info("Scraping each fighter from the rankings . . .")
+            current_rankings_list = ufc_scraper.current_rankings_list
+
+            if args["stream"]:
+                output_filepaths = ufc_scraper.stream_athlete_stats(current_rankings_list, args["stream"], store=store)
+                logger.info("Finished! Streamed data to %s", ", ".join(output_filepaths))
+            elif args["engine"] == "async":
+                results = ufc_scraper.run_async_scrape_athlete_stats(current_rankings_list)
+            elif args["engine"] == "pipeline":
+                results = ufc_scraper.pipelined_scrape_athlete_stats(current_rankings_list, args["parse_workers"])
+            else:
+                results = ufc_scraper.threaded_scrape_athlete_stats(current_rankings_list)
+
+        logger.info("Finished!")
+        logger.info("Saved %s athlete slugs to %s", len(slug_index), slug_index.save())
+
+        if ufc_scraper.failed_athletes:
+            logger.warning("Failed to scrape %s athletes:", len(ufc_scraper.failed_athletes))
+
+            for athlete_name, error in ufc_scraper.failed_athletes.items():
+                logger.warning("    %s: %s", athlete_name, error)
+
+        # The athletes the results were scraped for, in the same order
+        athlete_list = ufc_scraper.current_roster if args["crawl"] else ufc_scraper.current_rankings_list
+
+        if args["fight_history"]:
+            logger.info("Scraping each fighter's fight history . . .")
+            fights = ufc_scraper.scrape_fight_histories(athlete_list)
+            logger.info("Finished! Scraped %s fights to %s", len(fights), ufc_scraper.export_fight_history(fights))
+
+        if recorder is not None:
+            logger.info("Recorded every scraped page to %s", recorder.close())
+
+        # A streamed run has already written its athletes out and kept none of them in memory
+        if results is not None:
+            logger.info("Exporting data to Excel. . .")
+            excel_filepath = ufc_scraper.export_to_excel(results, normalize=args["normalize"])
+            logger.info("Finished! Scraped data to %s", excel_filepath)
+
+            # Athletes are scraped once however many rankings they hold, the rankings sheet lists every ranking
+            if not args["crawl"]:
+                rankings_filepath = ufc_scraper.export_rankings_to_excel(results, normalize=args["normalize"])
+                logger.info("Finished! Exported the rankings with each athlete's data to %s", rankings_filepath)
+
+            if args["columnar"]:
+                columnar_filepath = ufc_scraper.export_to_columnar(
+                    results, args["columnar"], args["compression"], args["partition_by"], normalize=args["normalize"]
+                )
+                logger.info("Finished! Exported columnar data to %s", columnar_filepath)
+
+            if store is not None:
+                logger.info(
+                    "Finished! Saved run history to %s", ufc_scraper.export_to_store(store, results, athlete_list)
+                )
 
-    ufc_scraper = UFCWebsiteScraper()
+            state_filepath = ufc_scraper.export_run_state(results)
+            logger.info("Saved run state for incremental scrapes to %s", state_filepath)
 
-    print("Scraping the UFC Rankings website . . .")
-    text_filepath = ufc_scraper.scrape_ufc_rankings_to_txt_file()
-    print(f"Finished! Scraped UFC Rankings to {text_filepath}")
+        if store is not None:
+            store.close()
 
-    print("Scraping each fighter from the rankings . . .")
-    current_rankings_list = ufc_scraper.current_rankings_list
-    results = ufc_scraper.threaded_scrape_athlete_stats(current_rankings_list)
-    print("Finished!")
+        if args["metrics_json"]:
+            logger.info("Saved run metrics to %s", ufc_scraper.metrics.export_json(args["metrics_json"]))
 
-    print("Exporting data to Excel. . .")
-    excel_filepath = ufc_scraper.export_to_excel(results)
-    print(f"Finished! Scraped data to {excel_filepath}")
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
-    program_time = round(time.time() - start_time, 2)
+        program_time = round(time.time() - start_time, 2)
 
-    print(f"--------------- {program_time} seconds ---------------")
+        logger.info("--------------- %s seconds ---------------", program_time)
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+
+class CacheEntry:
+    def __init__(self, url, status_code, headers, content, encoding, stored_at):
+        """
+        :param url: String containing the URL the response was fetched from
+        :param status_code: HTTP status code of the cached response
+        :param headers: Dict of the response headers that were kept
+        :param content: Bytes of the response body
+        :param encoding: Text encoding of the response body
+        :param stored_at: Unix timestamp of when the response was last fetched or revalidated
+        """
+
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.stored_at = stored_at
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def to_response(self):
+        """
+        Rebuilds a requests.Response object from the cached entry.
+
+        :return: requests.Response object
+        """
+
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.headers.update(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content
+
+        return response
+
+    def is_fresh(self, ttl):
+        """
+        :param ttl: Number of seconds a response may be served without revalidation
+        :return: True if the entry is younger than ttl
+        """
+
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self):
+        """
+        Builds the request headers that let the server answer 304 Not Modified
+        if the page has not changed since it was cached.
+
+        :return: Dict of If-None-Match and/or If-Modified-Since headers
+        """
+
+        headers = dict()
+
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+
+        return headers
+
+
+class ResponseCache:
+    # Response headers kept alongside the body
+    KEPT_HEADERS = ["ETag", "Last-Modified", "Content-Type"]
+
+    def __init__(self, directory, ttl=0, max_size_bytes=512 * 1024 * 1024):
+        """
+        On-disk cache of HTTP responses keyed by URL. Fresh entries are served without
+        a request and stale ones are revalidated with their ETag/Last-Modified validators.
+        The least recently used entries are evicted once the cache outgrows max_size_bytes.
+
+        :param directory: Directory the cached responses are stored in
+        :param ttl: Number of seconds a response is served without revalidation
+        :param max_size_bytes: Maximum total size of the cached bodies in bytes
+        """
+
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size_bytes = max_size_bytes
+        self.lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.total_size = sum(size for _, size, _ in self.list_bodies())
+
+    def list_bodies(self):
+        """
+        :return: List of (last access time, size in bytes, filename) tuples of every cached body
+        """
+
+        bodies = []
+
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".body"):
+                continue
+
+            try:
+                stat = os.stat(os.path.join(self.directory, filename))
+            except OSError:
+                continue
+
+            bodies.append((stat.st_mtime, stat.st_size, filename))
+
+        return bodies
+
+    def get_paths(self, url):
+        """
+        :param url: String containing the URL of the cached response
+        :return: Tuple of the metadata and body filepaths of the URL's entry
+        """
+
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".json"), os.path.join(self.directory, key + ".body")
+
+    def get(self, url):
+        """
+        Looks up the cached response of a URL.
+
+        :param url: String containing the URL to look up
+        :return: CacheEntry object, or None if the URL is not cached
+        """
+
+        metadata_path, body_path = self.get_paths(url)
+
+        try:
+            with open(metadata_path) as file:
+                metadata = json.load(file)
+
+            with open(body_path, "rb") as file:
+                content = file.read()
+
+        except (OSError, ValueError):
+            return None
+
+        # Record the access for least recently used eviction
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+        return CacheEntry(
+            url, metadata["status_code"], metadata["headers"], content, metadata["encoding"], metadata["stored_at"]
+        )
+
+    def store(self, url, status_code, headers, content, encoding):
+        """
+        Writes a response into the cache, replacing any previous entry of the URL.
+
+        :param url: String containing the URL the response was fetched from
+        :param status_code: HTTP status code of the response
+        :param headers: Mapping of the response headers
+        :param content: Bytes of the response body
+        :param encoding: Text encoding of the response body
+        :return: CacheEntry object that was stored
+        """
+
+        kept_headers = {header: headers[header] for header in self.KEPT_HEADERS if headers.get(header)}
+        entry = CacheEntry(url, status_code, kept_headers, content, encoding, time.time())
+        _, body_path = self.get_paths(url)
+
+        previous_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+
+        # Write the body first so a metadata file never points at a missing body
+        self.write_atomically(body_path, content)
+        self.write_metadata(entry)
+
+        with self.lock:
+            self.total_size += len(content) - previous_size
+
+        if self.total_size > self.max_size_bytes:
+            self.evict()
+
+        return entry
+
+    def refresh(self, entry):
+        """
+        Marks a cached response as revalidated after the server answered 304 Not Modified.
+
+        :param entry: CacheEntry object that was revalidated
+        :return: The same CacheEntry object with its stored_at timestamp reset
+        """
+
+        entry.stored_at = time.time()
+        self.write_metadata(entry)
+
+        return entry
+
+    def write_metadata(self, entry):
+        """
+        Writes the status, validators and timestamp of a cached response next to its body.
+
+        :param entry: CacheEntry object to write the metadata of
+        :return: None
+        """
+
+        metadata_path, _ = self.get_paths(entry.url)
+
+        metadata = {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "encoding": entry.encoding,
+            "stored_at": entry.stored_at,
+        }
+
+        self.write_atomically(metadata_path, json.dumps(metadata).encode("utf-8"))
+
+    def write_atomically(self, filepath, data):
+        """
+        Writes data to a temporary file and renames it into place so readers never see a partial file.
+
+        :param filepath: Destination filepath
+        :param data: Bytes to write
+        :return: None
+        """
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+
+            os.replace(temporary_path, filepath)
+
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits within max_size_bytes.
+
+        :return: Number of entries evicted
+        """
+
+        with self.lock:
+            bodies = self.list_bodies()
+            total_size = sum(size for _, size, _ in bodies)
+            evicted = 0
+
+            for _, size, filename in sorted(bodies):
+                if total_size <= self.max_size_bytes:
+                    break
+
+                key = filename[: -len(".body")]
+
+                for extension in [".json", ".body"]:
+                    try:
+                        os.remove(os.path.join(self.directory, key + extension))
+                    except OSError:
+                        pass
+
+                total_size -= size
+                evicted += 1
+
+            self.total_size = total_size
+
+            return evicted
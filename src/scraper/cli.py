@@ -0,0 +1,242 @@
+import argparse
+
+from src.scraper.columnar import COLUMNAR_FORMATS, COMPRESSION_CODECS, PARTITION_COLUMNS, import_pyarrow
+from src.scraper.ufc_scraper import DIVISON_MAPPING
+
+
+def build_argument_parser():
+    """
+    Builds the command line interface of scrape_data.py. It lives outside the scraper
+    module, so importing the scraper never reads the host process's command line.
+
+    :return: argparse.ArgumentParser object
+    """
+
+    parser = argparse.ArgumentParser(description="Specify UFC divisions")
+    parser.add_argument("-all", help="Pull all divisions", action="store_true")
+    parser.add_argument("-flw", help="Flyweight", action="store_true")
+    parser.add_argument("-bw", help="Bantamweight", action="store_true")
+    parser.add_argument("-fw", help="Featherweight", action="store_true")
+    parser.add_argument("-lw", help="Lightweight", action="store_true")
+    parser.add_argument("-ww", help="Welterweight", action="store_true")
+    parser.add_argument("-mw", help="Middleweight", action="store_true")
+    parser.add_argument("-lhw", help="Light Heavyweight", action="store_true")
+    parser.add_argument("-hw", help="Heavyweight", action="store_true")
+    parser.add_argument("-wsw", help="Women's Strawweight", action="store_true")
+    parser.add_argument("-wflw", help="Women's Flyweight", action="store_true")
+    parser.add_argument("-wbw", help="Women's Bantamweight", action="store_true")
+    # parser.add_argument('-wfw', help="Women's Featherweight", action="store_true")
+    parser.add_argument("-p4p", help="Pound-for-Pound", action="store_true")
+    parser.add_argument(
+        "-engine",
+        help="Concurrency engine used to scrape athlete pages",
+        choices=["threaded", "async", "pipeline"],
+        default="threaded",
+    )
+    parser.add_argument(
+        "-parse_workers",
+        help="Number of processes parsing athlete pages with the pipeline engine",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-parser",
+        help="BeautifulSoup parser backend used to parse pages",
+        choices=["html.parser", "lxml"],
+        default="html.parser",
+    )
+    parser.add_argument(
+        "-previous",
+        help="State file of a previous run, athletes whose pages did not change reuse its stats",
+        default=None,
+    )
+    parser.add_argument(
+        "-record",
+        help="Zip archive to record the rankings page and every athlete page into",
+        default=None,
+    )
+    parser.add_argument(
+        "-replay",
+        help="Zip archive recorded with -record to scrape instead of ufc.com",
+        default=None,
+    )
+    parser.add_argument(
+        "-metrics_json",
+        help="JSON file to write the run's timings and counters to",
+        default=None,
+    )
+    parser.add_argument(
+        "-metrics_port",
+        help="Serve the run's metrics in the Prometheus text format on this port while scraping",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-log_level",
+        help="Minimum level of the log messages to print",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+    )
+    parser.add_argument(
+        "-log_json",
+        help="Print log messages as one JSON event per line",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-progress_interval",
+        help="Minimum number of seconds between two progress lines while scraping athletes",
+        type=float,
+        default=5.0,
+    )
+    parser.add_argument(
+        "-max_rate",
+        help="Maximum number of requests per second sent to ufc.com",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "-latency_target",
+        help="Number of seconds above which a response counts as slow and the number of requests in flight is lowered",
+        type=float,
+        default=2.0,
+    )
+    parser.add_argument(
+        "-fixed_concurrency",
+        help="Always keep the maximum number of requests in flight instead of adapting to the server's responses",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-max_attempts",
+        help="Maximum number of attempts at fetching a page that timed out or came back with a 429 or 5xx",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "-stream",
+        help="Write athletes to the output files as they are scraped instead of all at once at the end of the run",
+        nargs="+",
+        choices=["csv", "jsonl", "xlsx"],
+        default=None,
+    )
+    parser.add_argument(
+        "-columnar",
+        help="Also export the data into a columnar file, requires pyarrow",
+        choices=COLUMNAR_FORMATS,
+        default=None,
+    )
+    parser.add_argument(
+        "-compression",
+        help="Compression codec of the columnar export",
+        choices=COMPRESSION_CODECS,
+        default="zstd",
+    )
+    parser.add_argument(
+        "-partition_by",
+        help="Write the columnar export into a dataset partitioned by these columns",
+        nargs="+",
+        choices=PARTITION_COLUMNS,
+        default=None,
+    )
+    parser.add_argument(
+        "-normalize",
+        help="Export percentages, counts, lengths, durations and dates as typed values instead of raw strings",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-compact_records",
+        help="Keep each athlete's statistics in a compact fixed-field record instead of a dict",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-store",
+        help="Filepath of a SQLite database to also upsert each run's rankings and data into",
+        default=None,
+    )
+    parser.add_argument(
+        "-crawl",
+        help="Scrape every athlete of the UFC athletes directory instead of only the ranked athletes",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-crawl_pages",
+        help="Maximum number of pages of the athletes directory to crawl",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-fight_history",
+        help="Also scrape every fight of each athlete's record into a separate -fights.xlsx file",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-history_concurrency",
+        help="Maximum number of pages of one athlete's fight history fetched concurrently",
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        "-slug_index",
+        help="JSON file of the athletes' page slugs collected from the rankings, reused and updated every run",
+        default="fighter_stats/athlete_slugs.json",
+    )
+    parser.add_argument(
+        "-cache_dir",
+        help="Directory of the on-disk response cache, pages are downloaded every run when not set",
+        default=None,
+    )
+    parser.add_argument(
+        "-cache_ttl",
+        help="Seconds a cached page is reused before it is revalidated with the server",
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        "-cache_max_mb",
+        help="Maximum size of the response cache in megabytes",
+        type=int,
+        default=512,
+    )
+    parser.add_argument(
+        "-partial_parse",
+        help="Only parse the sections of athlete pages that hold their statistics",
+        action="store_true",
+    )
+
+    return parser
+
+
+def parse_arguments(argv=None):
+    """
+    :param argv: Optional list of command line arguments, defaults to sys.argv[1:]
+    :return: Dict of the parsed arguments, with "divisions" holding the selected division names or None for all
+    """
+
+    parser = build_argument_parser()
+    args = vars(parser.parse_args(argv))
+
+    # Fail before scraping rather than after, when the export is all that is left to do
+    if args["columnar"]:
+        try:
+            import_pyarrow()
+
+        except ImportError as error:
+            parser.error(str(error))
+
+    if not any(args[option] for option in args if option in DIVISON_MAPPING.values()):
+        args["all"] = True
+
+    args["divisions"] = get_selected_divisions(args)
+
+    return args
+
+
+def get_selected_divisions(args):
+    """
+    :param args: Dict of the parsed arguments
+    :return: List of the names of the divisions selected with their flags, or None when every division is scraped
+    """
+
+    if args["all"]:
+        return None
+
+    return [division for division, option in DIVISON_MAPPING.items() if args.get(option)]
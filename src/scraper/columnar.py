@@ -0,0 +1,209 @@
+import logging
+import re
+from datetime import datetime
+
+from src.scraper.normalize import (
+    COUNT_COLUMNS,
+    DATE_COLUMNS,
+    DECIMAL_COLUMNS,
+    DURATION_COLUMNS,
+    INCH_COLUMNS,
+    PERCENT_COLUMNS,
+    POUND_COLUMNS,
+    RECORD_COLUMNS,
+    get_normalized_columns,
+    normalize_athlete_statistics,
+)
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ["parquet", "arrow"]
+COMPRESSION_CODECS = ["zstd", "snappy", "gzip", "lz4", "none"]
+PARTITION_COLUMNS = ["division", "scrape_date"]
+
+# Codecs the Arrow IPC format supports
+ARROW_COMPRESSION_CODECS = ["zstd", "lz4"]
+
+RANKING_PATTERN = re.compile(r"^(?:#\d+\s+)?(.*?)(?:\s+(?:Division|Champion))?$")
+
+
+def import_pyarrow():
+    """
+    pyarrow is only needed by the columnar export, so it is imported on first use.
+
+    :return: The pyarrow module
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+
+    except ImportError as error:
+        raise ImportError("The columnar export needs pyarrow, install it with `pip install pyarrow`") from error
+
+    return pyarrow
+
+
+def get_division(ranking):
+    """
+    :param ranking: String containing the athlete's ranking, e.g. "#12 Lightweight Division"
+    :return: String containing the division, e.g. "Lightweight", or None for unranked athletes
+    """
+
+    if not ranking:
+        return None
+
+    return RANKING_PATTERN.match(ranking.strip()).group(1) or None
+
+
+def build_athlete_schema(columns, column_types=None):
+    """
+    Builds the fixed schema of the athlete table from the columns the extractors emit.
+
+    :param columns: Ordered list of the fields of an athlete's compiled fighter statistics
+    :param column_types: Optional dict mapping columns to pyarrow types, other columns are strings
+    :return: pyarrow.Schema object
+    """
+
+    pa = import_pyarrow()
+    column_types = column_types or dict()
+
+    fields = [pa.field(column, column_types.get(column, pa.string())) for column in columns]
+    fields.append(pa.field("division", pa.string()))
+    fields.append(pa.field("scrape_date", pa.date32()))
+
+    return pa.schema(fields)
+
+
+def get_normalized_column_types():
+    """
+    :return: Dict mapping the typed columns of normalize_athlete_statistics() to pyarrow types
+    """
+
+    pa = import_pyarrow()
+    column_types = dict()
+
+    for column in COUNT_COLUMNS + DURATION_COLUMNS + RECORD_COLUMNS:
+        column_types[column] = pa.int64()
+
+    for column in PERCENT_COLUMNS + POUND_COLUMNS + DECIMAL_COLUMNS + INCH_COLUMNS:
+        column_types[column] = pa.float64()
+
+    for column in DATE_COLUMNS:
+        column_types[column] = pa.date32()
+
+    return column_types
+
+
+def build_athlete_table(athlete_statistics, columns, scraped_at, normalize=False):
+    """
+    Converts athletes' compiled fighter statistics into a table with a fixed schema.
+    Missing fields become nulls and fields outside the schema are dropped.
+
+    :param athlete_statistics: List of dicts containing the compiled statistics of athlete data
+    :param columns: Ordered list of the fields of an athlete's compiled fighter statistics
+    :param scraped_at: datetime of the scrape
+    :param normalize: Whether to write the typed columns of normalize_athlete_statistics() instead of raw strings
+    :return: pyarrow.Table object
+    """
+
+    pa = import_pyarrow()
+
+    # Athletes that failed to scrape have no statistics
+    athlete_statistics = [statistics for statistics in athlete_statistics if statistics]
+
+    dropped_columns = {column for statistics in athlete_statistics for column in statistics} - set(columns)
+
+    for column in sorted(dropped_columns):
+        logger.warning("Dropping the %s field, which is not one of the columnar schema's columns", column)
+
+    divisions = [get_division(statistics.get("ranking")) for statistics in athlete_statistics]
+    scrape_dates = [scraped_at.date()] * len(athlete_statistics)
+
+    if not normalize:
+        schema = build_athlete_schema(columns)
+        arrays = {column: [statistics.get(column) for statistics in athlete_statistics] for column in columns}
+        arrays["division"] = divisions
+        arrays["scrape_date"] = scrape_dates
+
+        return pa.Table.from_pydict(arrays, schema=schema)
+
+    normalized_columns = get_normalized_columns(columns)
+    schema = build_athlete_schema(normalized_columns, get_normalized_column_types())
+    data = normalize_athlete_statistics(athlete_statistics, columns)
+
+    arrays = [pa.array(data[column], from_pandas=True) for column in normalized_columns]
+    arrays.append(pa.array(divisions, pa.string()))
+    arrays.append(pa.array(scrape_dates, pa.date32()))
+
+    return pa.Table.from_arrays(
+        [array.cast(field.type) for array, field in zip(arrays, schema)],
+        schema=schema,
+    )
+
+
+def write_athlete_table(table, path, output_format="parquet", compression="zstd", partition_by=None, basename=None):
+    """
+    Writes an athlete table to a single file, or to a hive-partitioned dataset directory
+    when partition columns are given, e.g. path/scrape_date=2023-05-01/division=Lightweight/.
+
+    :param table: pyarrow.Table object to write
+    :param path: Filepath of the file, or directory of the dataset when partitioned
+    :param output_format: "parquet" or "arrow" (Arrow IPC)
+    :param compression: Compression codec, one of COMPRESSION_CODECS
+    :param partition_by: Optional list of columns from PARTITION_COLUMNS to partition the dataset by
+    :param basename: Name of the files written into each partition, defaults to "part"
+    :return: path
+    """
+
+    pa = import_pyarrow()
+
+    if output_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format {output_format!r}, expected one of {COLUMNAR_FORMATS}")
+
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(f"Unsupported compression {compression!r}, expected one of {COMPRESSION_CODECS}")
+
+    if output_format == "arrow" and compression not in ARROW_COMPRESSION_CODECS + ["none"]:
+        raise ValueError(f"Arrow IPC files only support the {ARROW_COMPRESSION_CODECS} compression codecs")
+
+    codec = None if compression == "none" else compression
+
+    if partition_by:
+        if output_format == "parquet":
+            file_format = pa.dataset.ParquetFileFormat()
+            file_options = file_format.make_write_options(compression=codec or "none")
+        else:
+            file_format = pa.dataset.IpcFileFormat()
+            file_options = file_format.make_write_options(compression=codec)
+
+        pa.dataset.write_dataset(
+            table,
+            path,
+            format=file_format,
+            file_options=file_options,
+            partitioning=list(partition_by),
+            partitioning_flavor="hive",
+            basename_template=f"{basename or 'part'}-{{i}}.{output_format}",
+            # Each scrape adds its own files next to the earlier scrapes' files
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    elif output_format == "parquet":
+        pa.parquet.write_table(table, path, compression=codec or "none")
+
+    else:
+        with pa.ipc.new_file(path, table.schema, options=pa.ipc.IpcWriteOptions(compression=codec)) as writer:
+            writer.write_table(table)
+
+    return path
+
+
+def parse_scrape_datetime(current_datetime):
+    """
+    :param current_datetime: String containing the scraper's "%d%m%Y%H%M%S" timestamp
+    :return: datetime object
+    """
+
+    return datetime.strptime(current_datetime, "%d%m%Y%H%M%S")
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+import zipfile
+from urllib.parse import urlsplit
+
+import requests
+
+MANIFEST_NAME = "manifest.json"
+
+
+def get_corpus_key(url):
+    """
+    Builds the host-independent key a page is archived under, so a corpus recorded
+    from ufc.com can be replayed against any base URL.
+
+    :param url: String containing the URL of the page
+    :return: Path and query of the URL as a string, e.g. "athlete/jon-jones"
+    """
+
+    split_url = urlsplit(url)
+    key = split_url.path.strip("/")
+
+    if split_url.query:
+        key += "?" + split_url.query
+
+    return key
+
+
+class PageRecorder:
+    def __init__(self, archive_path):
+        """
+        Records every fetched page into a compressed zip archive that PageReplayer can
+        serve later without touching the network.
+
+        :param archive_path: Filepath of the .zip archive to create
+        """
+
+        self.archive_path = archive_path
+        self.archive = zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self.manifest = dict()
+        self.body_names = set()
+        self.lock = threading.Lock()
+
+    def record(self, url, status_code, content, encoding):
+        """
+        Writes a fetched page into the archive, replacing any earlier recording of the same page.
+
+        :param url: String containing the URL the page was fetched from
+        :param status_code: HTTP status code of the response
+        :param content: Bytes of the response body
+        :param encoding: Text encoding of the response body
+        :return: None
+        """
+
+        key = get_corpus_key(url)
+
+        # Bodies are stored by content, so identical pages such as 404s are archived once
+        body_name = "pages/" + hashlib.sha1(content).hexdigest() + ".html"
+
+        with self.lock:
+            if body_name not in self.body_names:
+                self.archive.writestr(body_name, content)
+                self.body_names.add(body_name)
+
+            self.manifest[key] = {
+                "url": url,
+                "status_code": status_code,
+                "encoding": encoding,
+                "body": body_name,
+            }
+
+    def close(self):
+        """
+        Writes the manifest and closes the archive.
+
+        :return: Filepath of the .zip archive as a string
+        """
+
+        with self.lock:
+            self.archive.writestr(MANIFEST_NAME, json.dumps(self.manifest, indent=2))
+            self.archive.close()
+
+        return self.archive_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PageReplayer:
+    def __init__(self, archive_path):
+        """
+        Serves pages from an archive written by PageRecorder in place of ufc.com.
+
+        :param archive_path: Filepath of the .zip archive to replay
+        """
+
+        self.archive_path = archive_path
+        self.archive = zipfile.ZipFile(archive_path, "r")
+        self.manifest = json.loads(self.archive.read(MANIFEST_NAME))
+        self.lock = threading.Lock()
+
+    def get_response(self, url):
+        """
+        Looks up a recorded page. Pages that were never recorded come back as an empty 404.
+
+        :param url: String containing the URL of the page
+        :return: requests.Response object
+        """
+
+        response = requests.Response()
+        response.url = url
+        recording = self.manifest.get(get_corpus_key(url))
+
+        if recording is None:
+            response.status_code = 404
+            response._content = b""
+            return response
+
+        # ZipFile reads share one file handle
+        with self.lock:
+            content = self.archive.read(recording["body"])
+
+        response.status_code = recording["status_code"]
+        response.encoding = recording["encoding"]
+        response._content = content
+
+        return response
+
+    def close(self):
+        self.archive.close()
@@ -0,0 +1,36 @@
+from src.scraper.slugs import get_slug_from_href
+
+
+def parse_athletes_directory(soup):
+    """
+    Parses one page of the UFC athletes directory.
+
+    :param soup: BeautifulSoup object containing html of a page of the athletes directory
+    :return: List of (name, slug) tuples of the athletes listed on the page, in page order
+    """
+
+    athletes = []
+
+    for athlete_card in soup.find_all(class_="c-listing-athlete-flipcard"):
+        name_html = athlete_card.find(class_="c-listing-athlete__name")
+
+        if name_html is None:
+            continue
+
+        # The card links to the athlete's page from its back side
+        slugs = [get_slug_from_href(link_html.get("href")) for link_html in athlete_card.find_all("a")]
+        slugs = [slug for slug in slugs if slug]
+
+        if slugs:
+            athletes.append((name_html.get_text().strip(), slugs[0]))
+
+    return athletes
+
+
+def has_next_page(soup):
+    """
+    :param soup: BeautifulSoup object containing html of a page of the athletes directory
+    :return: True if the page links to a next page of the directory
+    """
+
+    return soup.find("a", attrs={"rel": "next"}) is not None
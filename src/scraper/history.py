@@ -0,0 +1,130 @@
+import math
+import re
+
+from src.scraper.slugs import get_slug_from_href
+
+# Columns of the long-format fight history table, one row per fight
+FIGHT_HISTORY_FIELDS = ["name", "opponent", "opponent_slug", "result", "method", "round", "time", "event", "date"]
+
+# Labels of the result rows of a fight card and the fields they fill
+RESULT_LABELS = {"round": "round", "time": "time", "method": "method"}
+
+RECORD_PATTERN = re.compile(r"^\s*(\d+)-(\d+)-(\d+)")
+
+
+def get_event_slug(href):
+    """
+    :param href: String containing a link to an event, e.g. "https://www.ufc.com/event/ufc-285#10411"
+    :return: String containing the event's slug, e.g. "ufc-285", or None if the link is not an event page
+    """
+
+    path = href.split("#", 1)[0].split("?", 1)[0].rstrip("/")
+    section, _, slug = path.rpartition("/")
+
+    return slug if section.endswith("/event") and slug else None
+
+
+def parse_fight_result(fight_html, athlete_slug):
+    """
+    Reads the result of a fight from the plaques of the two corners, from the athlete's point of view.
+
+    :param fight_html: Tag of the c-card-event--athlete-results card
+    :param athlete_slug: String containing the slug of the athlete's page
+    :return: Tuple of the result ("Win", "Loss", "Draw", "NC" or None) and the opponent's slug
+    """
+
+    athlete_plaque, opponent_plaque, opponent_slug = None, None, None
+
+    for corner_html in fight_html.find_all(class_="c-card-event--athlete-results__image"):
+        link_html = corner_html.find("a")
+        slug = get_slug_from_href(link_html.get("href")) if link_html is not None else None
+        plaque_html = corner_html.find(class_="c-card-event--athlete-results__plaque")
+        plaque = plaque_html.get_text().strip() if plaque_html is not None else None
+
+        if slug == athlete_slug:
+            athlete_plaque = plaque
+        else:
+            opponent_plaque, opponent_slug = plaque, slug
+
+    if athlete_plaque == "Win":
+        return "Win", opponent_slug
+
+    if opponent_plaque == "Win":
+        return "Loss", opponent_slug
+
+    return athlete_plaque or opponent_plaque, opponent_slug
+
+
+def parse_fight_history(soup, athlete_name, athlete_slug):
+    """
+    Parses the fights listed on one page of an athlete's record.
+
+    :param soup: BeautifulSoup object containing html of the UFC athlete's webpage
+    :param athlete_name: String containing the athlete's name
+    :param athlete_slug: String containing the slug of the athlete's page, to tell their corner from the opponent's
+    :return: List of dicts with the FIGHT_HISTORY_FIELDS of each fight, most recent first
+    """
+
+    fights = []
+
+    for fight_html in soup.find_all(class_="c-card-event--athlete-results"):
+        fight = dict.fromkeys(FIGHT_HISTORY_FIELDS)
+        fight["name"] = athlete_name
+        fight["result"], fight["opponent_slug"] = parse_fight_result(fight_html, athlete_slug)
+
+        # The headline links both athletes, e.g. "Jones vs Gane"
+        headline_html = fight_html.find(class_="c-card-event--athlete-results__headline")
+
+        if headline_html is not None:
+            for link_html in headline_html.find_all("a"):
+                if get_slug_from_href(link_html.get("href")) == fight["opponent_slug"]:
+                    fight["opponent"] = link_html.get_text().strip()
+
+        date_html = fight_html.find(class_="c-card-event--athlete-results__date")
+
+        if date_html is not None:
+            fight["date"] = date_html.get_text().strip()
+
+        for result_html in fight_html.find_all(class_="c-card-event--athlete-results__result"):
+            label_html = result_html.find(class_="c-card-event--athlete-results__result-label")
+            text_html = result_html.find(class_="c-card-event--athlete-results__result-text")
+
+            if label_html is None or text_html is None:
+                continue
+
+            field = RESULT_LABELS.get(label_html.get_text().strip().lower())
+
+            if field is not None:
+                fight[field] = text_html.get_text().strip()
+
+        for link_html in fight_html.find_all("a"):
+            event_slug = get_event_slug(link_html.get("href") or "")
+
+            if event_slug is not None:
+                fight["event"] = event_slug
+                break
+
+        fights.append(fight)
+
+    return fights
+
+
+def estimate_fight_history_pages(record, fights_per_page):
+    """
+    Estimates the number of pages of an athlete's record, to avoid fetching pages past
+    its end. The record also counts fights outside the UFC, which the history does not
+    list, so the estimate is an upper bound rather than the number of pages to fetch.
+
+    :param record: String containing the athlete's record, e.g. "26-1-0 (W-L-D)"
+    :param fights_per_page: Number of fights listed on the first page
+    :return: Estimated number of pages including the first one, or None if the record is unknown
+    """
+
+    match = RECORD_PATTERN.match(record or "")
+
+    if match is None or not fights_per_page:
+        return None
+
+    number_of_fights = sum(int(count) for count in match.groups())
+
+    return max(1, math.ceil(number_of_fights / fights_per_page))
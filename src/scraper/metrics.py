@@ -0,0 +1,319 @@
+import bisect
+import http.server
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Upper bounds in seconds of the fetch latency histogram buckets
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# Upper bounds in seconds of the queue wait histogram buckets
+QUEUE_WAIT_BUCKETS = [0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0]
+
+
+class Histogram:
+    def __init__(self, buckets):
+        """
+        :param buckets: Sorted list of bucket upper bounds, an implicit +Inf bucket is added
+        """
+
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, snapshot):
+        """
+        :param snapshot: Dict produced by to_dict() of a histogram with the same buckets
+        :return: None
+        """
+
+        for bucket_index, bucket_count in enumerate(snapshot["counts"]):
+            self.counts[bucket_index] += bucket_count
+
+        self.sum += snapshot["sum"]
+        self.count += snapshot["count"]
+
+    def to_dict(self):
+        return {"buckets": self.buckets, "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+class ScrapeMetrics:
+    def __init__(self):
+        """
+        Thread-safe counters and timings collected over a scraping run: fetch latencies,
+        bytes downloaded, HTTP status codes, time spent in each parsing/export stage,
+        how often each extractor fell back to its default values, how long work
+        waited for a free worker, how many fetches were retried, how many pages the
+        response cache served and how many athletes had no page.
+        """
+
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.fetch_latency = Histogram(LATENCY_BUCKETS)
+        self.queue_wait = Histogram(QUEUE_WAIT_BUCKETS)
+        self.bytes_downloaded = 0
+        self.status_counts = Counter()
+        self.stage_seconds = defaultdict(float)
+        self.stage_counts = Counter()
+        self.fallback_counts = Counter()
+        self.retry_counts = Counter()
+        self.cache_hits = Counter()
+        self.athletes_not_found = 0
+
+    def observe_fetch(self, seconds, status_code, number_of_bytes):
+        """
+        :param seconds: Time the request took
+        :param status_code: HTTP status code of the response
+        :param number_of_bytes: Size of the response body
+        :return: None
+        """
+
+        with self.lock:
+            self.fetch_latency.observe(seconds)
+            self.status_counts[str(status_code)] += 1
+            self.bytes_downloaded += number_of_bytes
+
+    def observe_queue_wait(self, seconds):
+        """
+        :param seconds: Time an athlete waited between being queued and a worker picking it up
+        :return: None
+        """
+
+        with self.lock:
+            self.queue_wait.observe(seconds)
+
+    def observe_stage(self, stage, seconds):
+        """
+        :param stage: Name of the stage, e.g. "parse_fight_metrics" or "export_to_excel"
+        :param seconds: Time spent in the stage
+        :return: None
+        """
+
+        with self.lock:
+            self.stage_seconds[stage] += seconds
+            self.stage_counts[stage] += 1
+
+    @contextmanager
+    def time_stage(self, stage):
+        """
+        Context manager timing the enclosed block as one run of a stage.
+
+        :param stage: Name of the stage
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def count_fallback(self, section):
+        """
+        :param section: Name of the page section whose extractor fell back to default values
+        :return: None
+        """
+
+        with self.lock:
+            self.fallback_counts[section] += 1
+
+    def count_retry(self, reason):
+        """
+        :param reason: Failure that triggered the retry, e.g. "timeout", "connection" or "429"
+        :return: None
+        """
+
+        with self.lock:
+            self.retry_counts[reason] += 1
+
+    def count_cache_hit(self, kind):
+        """
+        :param kind: "fresh" for a page served from the cache without a request, "revalidated" for a 304
+        :return: None
+        """
+
+        with self.lock:
+            self.cache_hits[kind] += 1
+
+    def count_athlete_not_found(self):
+        """
+        :return: None
+        """
+
+        with self.lock:
+            self.athletes_not_found += 1
+
+    def merge(self, snapshot):
+        """
+        Adds the metrics collected elsewhere, e.g. in a parsing process, into these metrics.
+
+        :param snapshot: Dict produced by to_dict()
+        :return: None
+        """
+
+        with self.lock:
+            self.fetch_latency.merge(snapshot["fetch_latency_seconds"])
+            self.queue_wait.merge(snapshot["queue_wait_seconds"])
+            self.bytes_downloaded += snapshot["bytes_downloaded"]
+            self.status_counts.update(snapshot["http_status_counts"])
+            self.fallback_counts.update(snapshot["fallback_counts"])
+            self.retry_counts.update(snapshot["retry_counts"])
+            self.cache_hits.update(snapshot["cache_hits"])
+            self.athletes_not_found += snapshot["athletes_not_found"]
+
+            for stage, stage_metrics in snapshot["stages"].items():
+                self.stage_seconds[stage] += stage_metrics["seconds"]
+                self.stage_counts[stage] += stage_metrics["count"]
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "elapsed_seconds": time.time() - self.started_at,
+                "fetch_latency_seconds": self.fetch_latency.to_dict(),
+                "queue_wait_seconds": self.queue_wait.to_dict(),
+                "bytes_downloaded": self.bytes_downloaded,
+                "http_status_counts": dict(self.status_counts),
+                "stages": {
+                    stage: {"seconds": self.stage_seconds[stage], "count": self.stage_counts[stage]}
+                    for stage in sorted(self.stage_seconds)
+                },
+                "fallback_counts": dict(self.fallback_counts),
+                "retry_counts": dict(self.retry_counts),
+                "cache_hits": dict(self.cache_hits),
+                "athletes_not_found": self.athletes_not_found,
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def export_json(self, json_filepath):
+        """
+        :param json_filepath: Filepath of the .json file to write
+        :return: Filepath of the .json file as a string
+        """
+
+        with open(json_filepath, "w") as file:
+            file.write(self.to_json())
+
+        return json_filepath
+
+    def to_prometheus(self):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        :return: String of the metrics
+        """
+
+        snapshot = self.to_dict()
+        lines = []
+
+        def add_histogram(name, description, histogram):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} histogram")
+            cumulative_count = 0
+
+            for upper_bound, bucket_count in zip(histogram["buckets"] + ["+Inf"], histogram["counts"]):
+                cumulative_count += bucket_count
+                lines.append(f'{name}_bucket{{le="{upper_bound}"}} {cumulative_count}')
+
+            lines.append(f"{name}_sum {histogram['sum']}")
+            lines.append(f"{name}_count {histogram['count']}")
+
+        add_histogram(
+            "ufc_scraper_fetch_latency_seconds", "Latency of page fetches.", snapshot["fetch_latency_seconds"]
+        )
+        add_histogram(
+            "ufc_scraper_queue_wait_seconds", "Time athletes waited for a free worker.", snapshot["queue_wait_seconds"]
+        )
+
+        lines.append("# HELP ufc_scraper_downloaded_bytes_total Bytes of page bodies downloaded.")
+        lines.append("# TYPE ufc_scraper_downloaded_bytes_total counter")
+        lines.append(f"ufc_scraper_downloaded_bytes_total {snapshot['bytes_downloaded']}")
+
+        lines.append("# HELP ufc_scraper_http_responses_total HTTP responses by status code.")
+        lines.append("# TYPE ufc_scraper_http_responses_total counter")
+
+        for status_code, status_count in sorted(snapshot["http_status_counts"].items()):
+            lines.append(f'ufc_scraper_http_responses_total{{code="{status_code}"}} {status_count}')
+
+        lines.append("# HELP ufc_scraper_stage_seconds_total Time spent in each parsing and export stage.")
+        lines.append("# TYPE ufc_scraper_stage_seconds_total counter")
+
+        for stage, stage_metrics in snapshot["stages"].items():
+            lines.append(f'ufc_scraper_stage_seconds_total{{stage="{stage}"}} {stage_metrics["seconds"]}')
+
+        lines.append("# HELP ufc_scraper_stage_runs_total Number of runs of each parsing and export stage.")
+        lines.append("# TYPE ufc_scraper_stage_runs_total counter")
+
+        for stage, stage_metrics in snapshot["stages"].items():
+            lines.append(f'ufc_scraper_stage_runs_total{{stage="{stage}"}} {stage_metrics["count"]}')
+
+        lines.append("# HELP ufc_scraper_fallbacks_total Extractors that fell back to default values, by section.")
+        lines.append("# TYPE ufc_scraper_fallbacks_total counter")
+
+        for section, fallback_count in sorted(snapshot["fallback_counts"].items()):
+            lines.append(f'ufc_scraper_fallbacks_total{{section="{section}"}} {fallback_count}')
+
+        lines.append("# HELP ufc_scraper_retries_total Fetches retried after a transient failure, by reason.")
+        lines.append("# TYPE ufc_scraper_retries_total counter")
+
+        for reason, retry_count in sorted(snapshot["retry_counts"].items()):
+            lines.append(f'ufc_scraper_retries_total{{reason="{reason}"}} {retry_count}')
+
+        lines.append("# HELP ufc_scraper_cache_hits_total Pages served by the response cache, by kind.")
+        lines.append("# TYPE ufc_scraper_cache_hits_total counter")
+
+        for kind, hit_count in sorted(snapshot["cache_hits"].items()):
+            lines.append(f'ufc_scraper_cache_hits_total{{kind="{kind}"}} {hit_count}')
+
+        lines.append("# HELP ufc_scraper_athletes_not_found_total Athletes whose page does not exist.")
+        lines.append("# TYPE ufc_scraper_athletes_not_found_total counter")
+        lines.append(f"ufc_scraper_athletes_not_found_total {snapshot['athletes_not_found']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, port=9100, host="127.0.0.1"):
+    """
+    Serves the metrics on /metrics in the Prometheus text format, and as JSON on
+    /metrics.json, from a background thread.
+
+    :param metrics: ScrapeMetrics object to serve
+    :param port: Port to listen on, 0 picks a free port
+    :param host: Interface to listen on
+    :return: The running http.server.ThreadingHTTPServer, call shutdown() to stop it
+    """
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+
+            body = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
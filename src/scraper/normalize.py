@@ -0,0 +1,205 @@
+import logging
+
+import pandas as pd
+
+from src.scraper.record import to_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Values the extractors and ufc.com use for a missing statistic
+NULL_VALUES = ["", "N/A", "n/a", "--", "-"]
+
+PERCENT_COLUMNS = [
+    "significant_strike_accuracy",
+    "takedown_accuracy",
+    "significant_strikes_defense",
+    "takedown_defense",
+]
+
+COUNT_COLUMNS = [
+    "age",
+    "significant_strikes_landed",
+    "significant_strikes_attempted",
+    "takedowns_landed",
+    "takedowns_attempted",
+    "significant_strikes_by_position_standing",
+    "significant_strikes_by_position_clinch",
+    "significant_strikes_by_position_ground",
+    "significant_strikes_by_target_head",
+    "significant_strikes_by_target_body",
+    "significant_strikes_by_target_leg",
+    "win_by_way_knockout",
+    "win_by_way_decision",
+    "win_by_way_submission",
+]
+
+POUND_COLUMNS = ["weight"]
+
+DECIMAL_COLUMNS = [
+    "significant_strikes_landed_per_min",
+    "significant_strikes_absorbed_per_min",
+    "takedown_average_per_15_min",
+    "submission_average_per_15_min",
+    "knockdown_ratio",
+]
+
+INCH_COLUMNS = ["height", "reach", "leg_reach"]
+
+DURATION_COLUMNS = ["average_fight_time"]
+
+DATE_COLUMNS = ["octagon_debut"]
+
+# Columns split out of the "26-1-0 (W-L-D)" record
+RECORD_COLUMNS = ["wins", "losses", "draws"]
+
+
+def to_number(values):
+    """
+    :param values: pandas.Series of strings
+    :return: pandas.Series of Float64 numbers, null where the value is missing or not a number
+    """
+
+    return pd.to_numeric(values.str.replace(",", "", regex=False).str.strip(), errors="coerce").astype("Float64")
+
+
+def normalize_percent(values):
+    """
+    :param values: pandas.Series of strings such as "47%"
+    :return: pandas.Series of Float64 percentages, e.g. 47.0
+    """
+
+    return to_number(values.str.rstrip("%"))
+
+
+def normalize_count(values):
+    """
+    :param values: pandas.Series of strings such as "1,463"
+    :return: pandas.Series of Int64 counts
+    """
+
+    return to_number(values).round().astype("Int64")
+
+
+def normalize_decimal(values):
+    """
+    :param values: pandas.Series of strings such as "4.30" or "204.00 lbs"
+    :return: pandas.Series of Float64 values
+    """
+
+    return to_number(values.str.extract(r"(-?[\d,]*\.?\d+)", expand=False))
+
+
+def normalize_inches(values):
+    """
+    :param values: pandas.Series of strings such as "76.00", "84.5 in" or "5' 11\\""
+    :return: pandas.Series of Float64 lengths in inches
+    """
+
+    feet_and_inches = values.str.extract(r"^\s*(\d+)\s*'\s*(\d+(?:\.\d+)?)?")
+    feet_inches = to_number(feet_and_inches[0]) * 12 + to_number(feet_and_inches[1].fillna("0"))
+
+    return feet_inches.where(feet_and_inches[0].notna(), normalize_decimal(values))
+
+
+def normalize_duration(values):
+    """
+    :param values: pandas.Series of strings such as "5:43" or "1:02:10"
+    :return: pandas.Series of Int64 durations in seconds
+    """
+
+    parts = values.str.extract(r"^\s*(?:(\d+):)?(\d+):(\d{2})\s*$")
+    seconds = to_number(parts[0].fillna("0")) * 3600 + to_number(parts[1]) * 60 + to_number(parts[2])
+
+    return seconds.round().astype("Int64")
+
+
+def normalize_date(values):
+    """
+    :param values: pandas.Series of strings such as "Aug. 09, 2008" or "Sept. 9, 2017"
+    :return: pandas.Series of datetime64 dates, NaT where the date is missing
+    """
+
+    cleaned_values = values.str.replace(".", "", regex=False).str.replace("Sept", "Sep", regex=False).str.strip()
+
+    return pd.to_datetime(cleaned_values, format="%b %d, %Y", errors="coerce")
+
+
+def normalize_record(values):
+    """
+    :param values: pandas.Series of strings such as "26-1-0 (W-L-D)"
+    :return: pandas.DataFrame of the Int64 wins, losses and draws
+    """
+
+    record = values.str.extract(r"^\s*(\d+)-(\d+)-(\d+)")
+    record.columns = RECORD_COLUMNS
+
+    return record.apply(to_number).astype("Int64")
+
+
+NORMALIZERS = [
+    (PERCENT_COLUMNS, normalize_percent),
+    (COUNT_COLUMNS, normalize_count),
+    (POUND_COLUMNS, normalize_decimal),
+    (DECIMAL_COLUMNS, normalize_decimal),
+    (INCH_COLUMNS, normalize_inches),
+    (DURATION_COLUMNS, normalize_duration),
+    (DATE_COLUMNS, normalize_date),
+]
+
+
+def get_normalized_columns(columns):
+    """
+    :param columns: Ordered list of the fields of an athlete's compiled fighter statistics
+    :return: Ordered list of the columns of the normalized statistics, with the split record after "record"
+    """
+
+    if "record" not in columns:
+        return list(columns)
+
+    record_index = columns.index("record") + 1
+
+    return list(columns[:record_index]) + RECORD_COLUMNS + list(columns[record_index:])
+
+
+def normalize_athlete_statistics(athlete_statistics, columns=None):
+    """
+    Converts the raw strings the extractors return into typed columns, a whole column at
+    a time: percentages, counts and rates become numbers, heights and reaches inches,
+    the average fight time seconds, the octagon debut a date, and the record is split
+    into wins, losses and draws. Missing and unparsable values become nulls.
+
+    :param athlete_statistics: List of dicts or AthleteRecords containing the compiled statistics of athlete data
+    :param columns: Optional ordered list of the columns to keep
+    :return: pandas.DataFrame with typed columns
+    """
+
+    data = to_dataframe(athlete_statistics)
+
+    if columns is not None:
+        data = data.reindex(columns=columns)
+
+    for column_names, normalizer in NORMALIZERS:
+        for column in column_names:
+            if column not in data:
+                continue
+
+            raw_values = data[column].astype("string").str.strip()
+            missing_values = raw_values.isna() | raw_values.isin(NULL_VALUES)
+            normalized_values = normalizer(raw_values.mask(missing_values))
+
+            # Count the values that were present but could not be parsed
+            number_unparsed = int((normalized_values.isna() & ~missing_values).sum())
+
+            if number_unparsed:
+                logger.warning("Could not parse %s values of the %s column", number_unparsed, column)
+
+            data[column] = normalized_values
+
+    if "record" in data:
+        record = normalize_record(data["record"].astype("string"))
+        record_index = data.columns.get_loc("record") + 1
+
+        for offset, column in enumerate(RECORD_COLUMNS):
+            data.insert(record_index + offset, column, record[column])
+
+    return data
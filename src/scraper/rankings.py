@@ -0,0 +1,168 @@
+from typing import NamedTuple
+
+import bs4
+
+from src.scraper.slugs import Athlete, get_slug_from_href
+
+# Division headers of the rankings page that differ from the division names in DIVISON_MAPPING
+DIVISION_HEADERS = {"Pound-for-Pound Top Rank": "Pound-for-Pound"}
+
+# Divisions left out of the rankings unless they are selected explicitly
+EXCLUDED_DIVISIONS = ["Pound-for-Pound", "Women's Featherweight"]
+
+
+class RankingEntry(NamedTuple):
+    division: str
+    rank: int
+    name: str
+    champion: bool = False
+    slug: str = None
+
+
+def parse_slug(name_html):
+    """
+    :param name_html: Tag of the views-row holding a fighter's name and the link to their page
+    :return: String containing the slug of the fighter's page, or None if there is no link
+    """
+
+    link_html = name_html.find("a")
+
+    return get_slug_from_href(link_html.get("href")) if link_html is not None else None
+
+
+def parse_rank(fighter_html, position):
+    """
+    :param fighter_html: Tag of the fighter's views-field-title cell
+    :param position: Position of the fighter in the division, used when the row has no rank cell
+    :return: Integer rank of the fighter
+    """
+
+    row = fighter_html.find_parent("tr")
+    rank_html = row.find(class_="views-field-weight-class-rank") if row is not None else None
+
+    try:
+        return int(rank_html.get_text().strip())
+
+    except (AttributeError, ValueError):
+        return position
+
+
+def parse_rankings(soup, divisions=None):
+    """
+    Parses the rankings page into one entry per ranked fighter, the champion of each
+    division being rank 0.
+
+    :param soup: BeautifulSoup object containing html of the UFC rankings webpage
+    :param divisions: Optional list of the divisions to keep, defaults to every division outside EXCLUDED_DIVISIONS
+    :return: List of RankingEntry tuples in page order
+    """
+
+    rankings = []
+
+    # Look at each grouping of rankings
+    for grouping in soup.find_all(class_="view-grouping"):
+        if not isinstance(grouping, bs4.element.Tag):
+            continue
+
+        division = grouping.find(class_="view-grouping-header").get_text().strip()
+        division = DIVISION_HEADERS.get(division, division)
+
+        if divisions is None:
+            if division in EXCLUDED_DIVISIONS:
+                continue
+
+        elif division not in divisions:
+            continue
+
+        try:
+            # Get the division's champion's name and clean the text
+            champion_html = grouping.find(class_="info").find(class_="views-row")
+            champion = champion_html.get_text().strip()
+            rankings.append(RankingEntry(division, 0, champion, champion=True, slug=parse_slug(champion_html)))
+
+        except AttributeError:
+            # There is no active champion!
+            pass
+
+        # Get the top 15 fighters in the current division
+        top_15 = grouping.find_all(class_="views-field views-field-title")
+
+        for position, fighter in enumerate(top_15, start=1):
+            fighter_name_html = fighter.find(class_="views-row")
+            fighter_name = fighter_name_html.get_text().strip()
+            slug = parse_slug(fighter_name_html)
+            rankings.append(RankingEntry(division, parse_rank(fighter, position), fighter_name, slug=slug))
+
+    return rankings
+
+
+def get_athlete_key(athlete):
+    """
+    :param athlete: RankingEntry or Athlete tuple
+    :return: String identifying the athlete, their slug when they are linked to a page and their name otherwise
+    """
+
+    return athlete.slug or athlete.name
+
+
+def get_athlete_list(rankings):
+    """
+    :param rankings: List of RankingEntry tuples
+    :return: List of Athlete tuples of the ranked athletes' names and slugs in ranking order, each athlete once
+             however many times they are ranked, and athletes sharing a name but linked to different pages apart
+    """
+
+    athletes = dict()
+
+    for entry in rankings:
+        athletes.setdefault(get_athlete_key(entry), Athlete(entry.name, entry.slug))
+
+    return list(athletes.values())
+
+
+def join_rankings(rankings, athlete_list, athlete_statistics):
+    """
+    Fans the statistics of each scraped athlete back out to every ranking they hold, so
+    an athlete ranked in their division and pound-for-pound appears in both rows while
+    having been scraped once.
+
+    :param rankings: List of RankingEntry tuples
+    :param athlete_list: List of the scraped Athlete tuples, from get_athlete_list()
+    :param athlete_statistics: List of the athletes' compiled statistics, in the order of athlete_list
+    :return: List of dicts with the division, rank and champion flag followed by the athlete's statistics
+    """
+
+    statistics_by_athlete = {
+        get_athlete_key(athlete): statistics for athlete, statistics in zip(athlete_list, athlete_statistics)
+    }
+    ranked_statistics = []
+
+    for entry in rankings:
+        statistics = statistics_by_athlete.get(get_athlete_key(entry)) or {"name": entry.name}
+        ranked_statistics.append(
+            {"division": entry.division, "rank": entry.rank, "champion": entry.champion, **statistics}
+        )
+
+    return ranked_statistics
+
+
+def write_rankings_txt_file(rankings, text_filepath):
+    """
+    Writes the rankings as each division's name followed by its tab-indented fighters.
+
+    :param rankings: List of RankingEntry tuples
+    :param text_filepath: Filepath of the .txt file to write
+    :return: text_filepath
+    """
+
+    with open(text_filepath, "w") as file:
+        current_division = None
+
+        for entry in rankings:
+            if entry.division != current_division:
+                current_division = entry.division
+                file.write(current_division + "\n")
+
+            file.write("".join(["\t", entry.name, "\n"]))
+
+    return text_filepath
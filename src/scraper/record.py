@@ -0,0 +1,161 @@
+from collections.abc import Mapping
+
+# Every field the extractors return, in export order
+ATHLETE_FIELDS = (
+    "name",
+    "nickname",
+    "record",
+    "ranking",
+    "status",
+    "hometown",
+    "age",
+    "height",
+    "weight",
+    "octagon_debut",
+    "reach",
+    "leg_reach",
+    "place_of_birth",
+    "trains_at",
+    "fighting_style",
+    "significant_strikes_landed",
+    "significant_strikes_attempted",
+    "significant_strike_accuracy",
+    "takedowns_landed",
+    "takedowns_attempted",
+    "takedown_accuracy",
+    "significant_strikes_landed_per_min",
+    "significant_strikes_absorbed_per_min",
+    "takedown_average_per_15_min",
+    "submission_average_per_15_min",
+    "significant_strikes_defense",
+    "takedown_defense",
+    "knockdown_ratio",
+    "average_fight_time",
+    "significant_strikes_by_position_standing",
+    "significant_strikes_by_position_clinch",
+    "significant_strikes_by_position_ground",
+    "significant_strikes_by_target_head",
+    "significant_strikes_by_target_body",
+    "significant_strikes_by_target_leg",
+    "win_by_way_knockout",
+    "win_by_way_decision",
+    "win_by_way_submission",
+)
+
+ATHLETE_FIELD_SET = frozenset(ATHLETE_FIELDS)
+
+
+class AthleteRecord(Mapping):
+    # A fixed set of slots instead of a per-athlete dict, "extra" holds any biography field outside ATHLETE_FIELDS
+    __slots__ = ATHLETE_FIELDS + ("extra",)
+
+    def __init__(self, **fields):
+        """
+        Compact, read-only record of an athlete's compiled fighter statistics. It behaves
+        like the dict the extractors used to return, so it can be passed anywhere a dict
+        of statistics is expected. Fields the page did not list are None and left out of
+        the mapping.
+
+        :param fields: The athlete's statistics by field name
+        """
+
+        for field in ATHLETE_FIELDS:
+            object.__setattr__(self, field, None)
+
+        object.__setattr__(self, "extra", None)
+
+        for field, value in fields.items():
+            if field in ATHLETE_FIELD_SET:
+                object.__setattr__(self, field, value)
+            else:
+                if self.extra is None:
+                    object.__setattr__(self, "extra", dict())
+
+                self.extra[field] = value
+
+    @classmethod
+    def from_dict(cls, athlete_statistics):
+        """
+        :param athlete_statistics: Dict containing an athlete's compiled fighter statistics
+        :return: AthleteRecord object
+        """
+
+        if isinstance(athlete_statistics, cls):
+            return athlete_statistics
+
+        return cls(**athlete_statistics)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("AthleteRecord is read-only")
+
+    def __getitem__(self, field):
+        if field in ATHLETE_FIELD_SET:
+            value = getattr(self, field)
+
+            if value is not None:
+                return value
+
+        elif self.extra is not None and field in self.extra:
+            return self.extra[field]
+
+        raise KeyError(field)
+
+    def __iter__(self):
+        for field in ATHLETE_FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        number_of_fields = sum(getattr(self, field) is not None for field in ATHLETE_FIELDS)
+
+        return number_of_fields + (len(self.extra) if self.extra is not None else 0)
+
+    def __repr__(self):
+        return f"AthleteRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        return self.__class__.from_dict, (dict(self),)
+
+    def to_dict(self):
+        """
+        :return: Dict containing the athlete's compiled fighter statistics, as the extractors used to return
+        """
+
+        return dict(self)
+
+    def to_row(self):
+        """
+        :return: Tuple of the values of ATHLETE_FIELDS, None for the fields the page did not list
+        """
+
+        return tuple(getattr(self, field) for field in ATHLETE_FIELDS)
+
+
+def to_dataframe(athlete_statistics):
+    """
+    Builds a DataFrame from athletes' compiled fighter statistics. Lists of AthleteRecords
+    are built row by row with the fixed ATHLETE_FIELDS columns instead of merging the keys
+    of every dict, with any extra fields appended after them.
+
+    :param athlete_statistics: List of AthleteRecords and/or dicts
+    :return: pandas.DataFrame object
+    """
+
+    # pandas is imported on first use, so importing the records does not import it
+    import pandas as pd
+
+    if not any(isinstance(statistics, AthleteRecord) for statistics in athlete_statistics):
+        return pd.DataFrame(athlete_statistics)
+
+    records = [AthleteRecord.from_dict(statistics) for statistics in athlete_statistics]
+    data = pd.DataFrame.from_records([record.to_row() for record in records], columns=ATHLETE_FIELDS)
+
+    extras = [record.extra or {} for record in records]
+
+    if any(extras):
+        data = data.join(pd.DataFrame(extras))
+
+    return data
@@ -0,0 +1,193 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Attributes every LogRecord has, anything else on a record was passed through extra={...}
+STANDARD_RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        """
+        Formats a record as a single line of JSON, including any fields passed through extra={...}.
+
+        :param record: logging.LogRecord to format
+        :return: String containing the JSON event
+        """
+
+        event = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for attribute, value in record.__dict__.items():
+            if attribute not in STANDARD_RECORD_ATTRIBUTES:
+                event[attribute] = value
+
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(event, default=str)
+
+
+def configure_logging(level="INFO", json_format=False, stream=None):
+    """
+    Routes every log record through a queue to a single background thread that writes
+    them out, so scraping threads never block on the console.
+
+    :param level: Minimum level of the records to write, e.g. "DEBUG" or "WARNING"
+    :param json_format: Whether to write one JSON event per line instead of plain text
+    :param stream: Stream to write to, defaults to stderr
+    :return: The running logging.handlers.QueueListener, call stop() to flush and stop it
+    """
+
+    stream_handler = logging.StreamHandler(stream or sys.stderr)
+
+    if json_format:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(message)s", "%H:%M:%S"))
+
+    record_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(record_queue, stream_handler)
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [logging.handlers.QueueHandler(record_queue)]
+    root_logger.setLevel(level)
+
+    listener.start()
+
+    return listener
+
+
+class ProgressReporter:
+    def __init__(self, total, interval=5.0):
+        """
+        Aggregates the progress of a run into a single periodic log line with the number
+        of completed and in-flight athletes, the completion rate and an ETA, instead of
+        several lines per athlete.
+
+        :param total: Number of athletes in the run
+        :param interval: Minimum number of seconds between two progress lines
+        """
+
+        self.total = total
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.last_reported_at = self.started_at
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+
+    def add(self, number_of_athletes=1):
+        """
+        Adds athletes discovered while the run is going to the total.
+
+        :param number_of_athletes: Number of athletes to add
+        :return: None
+        """
+
+        with self.lock:
+            self.total += number_of_athletes
+
+    def start(self):
+        """
+        Marks an athlete as in flight.
+
+        :return: None
+        """
+
+        with self.lock:
+            self.in_flight += 1
+
+    def finish(self, succeeded=True):
+        """
+        Marks an in-flight athlete as done and logs the progress if the last line is older than interval.
+
+        :param succeeded: Whether the athlete was scraped successfully
+        :return: None
+        """
+
+        now = time.perf_counter()
+
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+            if not succeeded:
+                self.failed += 1
+
+            if now - self.last_reported_at < self.interval:
+                return
+
+            self.last_reported_at = now
+
+        self.report()
+
+    @contextmanager
+    def track(self):
+        """
+        Context manager marking the enclosed block as one athlete in flight, failed if it raises.
+        """
+
+        self.start()
+
+        try:
+            yield
+        except BaseException:
+            self.finish(succeeded=False)
+            raise
+
+        self.finish()
+
+    def snapshot(self):
+        """
+        :return: Dict of the completed, failed and in-flight counts, the rate in athletes per second and the ETA
+        """
+
+        with self.lock:
+            completed, failed, in_flight = self.completed, self.failed, self.in_flight
+
+        elapsed_seconds = time.perf_counter() - self.started_at
+        rate = completed / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        eta_seconds = (self.total - completed) / rate if rate > 0 else None
+
+        return {
+            "completed": completed,
+            "total": self.total,
+            "failed": failed,
+            "in_flight": in_flight,
+            "rate": round(rate, 2),
+            "eta_seconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+        }
+
+    def report(self):
+        """
+        Logs the current progress.
+
+        :return: None
+        """
+
+        progress = self.snapshot()
+        eta = f"{progress['eta_seconds']}s" if progress["eta_seconds"] is not None else "unknown"
+
+        logger.info(
+            "Scraped %s/%s athletes (%s failed), %s in flight, %s athletes/s, ETA %s",
+            progress["completed"],
+            progress["total"],
+            progress["failed"],
+            progress["in_flight"],
+            progress["rate"],
+            eta,
+            extra={"progress": progress},
+        )
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import random
+import sys
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottledResponseError(requests.HTTPError):
+    def __init__(self, url, status_code, retry_after=None):
+        """
+        Raised when the server answers with a status code that signals throttling or an
+        overload, so the page holds no statistics and is worth fetching again later.
+
+        :param url: String containing the URL that was fetched
+        :param status_code: HTTP status code of the response
+        :param retry_after: Optional number of seconds the server asked us to wait
+        """
+
+        super().__init__(f"{status_code} response for {url}")
+        self.url = url
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """
+    :param value: Value of a Retry-After header, or None
+    :return: Number of seconds to wait as a float, or None if the header is missing or an HTTP date
+    """
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_failure_reason(error):
+    """
+    Classifies an error raised while fetching a page.
+
+    :param error: Exception raised by the fetch
+    :return: String naming the transient failure, e.g. "timeout" or "429", or None if retrying would not help
+    """
+
+    if isinstance(error, ThrottledResponseError):
+        return str(error.status_code)
+
+    if isinstance(error, (requests.Timeout, asyncio.TimeoutError)):
+        return "timeout"
+
+    if isinstance(error, (requests.ConnectionError, ConnectionError)):
+        return "connection"
+
+    # aiohttp is only imported by the async engine
+    aiohttp = sys.modules.get("aiohttp")
+
+    if aiohttp is not None and isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+        return "connection"
+
+    return None
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30.0, metrics=None):
+        """
+        Retries transient fetch failures with exponential backoff and full jitter, so
+        workers that failed together do not all come back at the same moment.
+
+        :param max_attempts: Maximum number of attempts, including the first one
+        :param base_delay: Number of seconds the backoff starts from
+        :param max_delay: Maximum number of seconds to wait between two attempts
+        :param metrics: Optional ScrapeMetrics counting the retries by failure reason
+        """
+
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = metrics
+
+    def get_delay(self, attempt, error):
+        """
+        :param attempt: Number of attempts made so far
+        :param error: Exception raised by the last attempt
+        :return: Number of seconds to wait before the next attempt
+        """
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = getattr(error, "retry_after", None)
+
+        if retry_after is not None:
+            delay = max(delay, min(self.max_delay, retry_after))
+
+        return delay
+
+    def should_retry(self, attempt, error):
+        """
+        :param attempt: Number of attempts made so far
+        :param error: Exception raised by the last attempt
+        :return: True if the error is transient and attempts are left
+        """
+
+        reason = get_failure_reason(error)
+
+        if reason is None or attempt >= self.max_attempts:
+            return False
+
+        if self.metrics is not None:
+            self.metrics.count_retry(reason)
+
+        logger.debug("Retrying after a %s failure (attempt %s of %s): %r", reason, attempt, self.max_attempts, error)
+
+        return True
+
+    def call(self, function, *args):
+        """
+        Calls function until it succeeds, it raises a non-transient error or no attempts are left.
+
+        :param function: Function to call
+        :param args: Positional arguments of the function
+        :return: The function's return value
+        """
+
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            try:
+                return function(*args)
+            except Exception as error:
+                if not self.should_retry(attempt, error):
+                    raise
+
+                time.sleep(self.get_delay(attempt, error))
+
+    async def async_call(self, coroutine_function, *args):
+        """
+        Coroutine counterpart of call() that waits on the event loop.
+
+        :param coroutine_function: Coroutine function to await
+        :param args: Positional arguments of the coroutine function
+        :return: The coroutine's return value
+        """
+
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            try:
+                return await coroutine_function(*args)
+            except Exception as error:
+                if not self.should_retry(attempt, error):
+                    raise
+
+                await asyncio.sleep(self.get_delay(attempt, error))
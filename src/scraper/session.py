@@ -0,0 +1,25 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeouts in seconds for every request made by the scraper
+DEFAULT_TIMEOUT = (5, 30)
+
+
+def create_session(pool_size=50):
+    """
+    Creates a requests Session whose connection pool keeps enough keep-alive connections
+    open for every worker thread, so athlete pages reuse TCP/TLS connections to ufc.com
+    instead of paying a fresh handshake each time.
+
+    :param pool_size: Number of connections kept per host, should match the scraper's concurrency
+    :return: Configured requests.Session object
+    """
+
+    session = requests.Session()
+
+    # Block instead of opening throwaway connections when the pool is exhausted
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
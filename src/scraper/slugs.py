@@ -0,0 +1,162 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+# Characters dropped from names instead of becoming a dash, e.g. "O'Malley" -> "omalley"
+DROPPED_CHARACTERS_PATTERN = re.compile(r"['’.]")
+NON_SLUG_CHARACTERS_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Letters NFKD does not decompose into a base letter and an accent
+TRANSLITERATIONS = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D", "ß": "ss"})
+
+
+class Athlete(NamedTuple):
+    name: str
+    slug: str = None
+
+
+def as_athlete(athlete):
+    """
+    :param athlete: String containing an athlete's name, or an Athlete tuple when the slug of their page is known
+    :return: Athlete tuple, its slug being None when only the name is known
+    """
+
+    if isinstance(athlete, str):
+        return Athlete(athlete.strip())
+
+    athlete_name, slug = athlete
+
+    return Athlete(athlete_name.strip(), slug)
+
+
+def strip_accents(text):
+    """
+    :param text: String such as "Jiří Procházka"
+    :return: String without diacritics, e.g. "Jiri Prochazka"
+    """
+
+    return "".join(
+        character
+        for character in unicodedata.normalize("NFKD", text.translate(TRANSLITERATIONS))
+        if not unicodedata.combining(character)
+    )
+
+
+def make_slug(athlete_name):
+    """
+    Guesses the slug of an athlete's page from their name, the way ufc.com builds them.
+    Only used for athletes whose real slug is not known.
+
+    :param athlete_name: String containing the athlete's name, e.g. "Sean O'Malley"
+    :return: String containing the slug, e.g. "sean-omalley"
+    """
+
+    slug = DROPPED_CHARACTERS_PATTERN.sub("", strip_accents(athlete_name).lower())
+
+    return NON_SLUG_CHARACTERS_PATTERN.sub("-", slug).strip("-")
+
+
+def get_name_key(athlete_name):
+    """
+    :param athlete_name: String containing the athlete's name
+    :return: String that matches the other forms of the name, e.g. "Jan Błachowicz" and "jan blachowicz"
+    """
+
+    return make_slug(athlete_name)
+
+
+def get_slug_from_href(href):
+    """
+    :param href: String containing a link to an athlete's page, e.g. "/athlete/jiri-prochazka"
+    :return: String containing the slug, or None if the link is not an athlete page
+    """
+
+    if not href:
+        return None
+
+    path = urlsplit(href).path.rstrip("/")
+    section, _, slug = path.rpartition("/")
+
+    if not section.endswith("/athlete") or not slug:
+        return None
+
+    return slug
+
+
+class SlugIndex:
+    def __init__(self, filepath=None):
+        """
+        Index of the real slugs of athletes' pages, collected from the links of the
+        rankings page. Names are also indexed by a key without accents, case and
+        punctuation, so a name spelled differently on a later run still resolves.
+        Athletes sharing a name share an entry, so the index is only a fallback for
+        athletes scraped without the slug of their page.
+
+        :param filepath: Optional JSON file the index is loaded from and saved to
+        """
+
+        self.filepath = filepath
+        self.slugs = dict()
+        self.slugs_by_key = dict()
+        self.lock = threading.Lock()
+
+        if filepath is not None and os.path.exists(filepath):
+            with open(filepath, encoding="utf-8") as file:
+                for athlete_name, slug in json.load(file).items():
+                    self.add(athlete_name, slug)
+
+    def add(self, athlete_name, slug):
+        """
+        :param athlete_name: String containing the athlete's name
+        :param slug: String containing the slug of the athlete's page
+        :return: None
+        """
+
+        with self.lock:
+            self.slugs[athlete_name] = slug
+            self.slugs_by_key[get_name_key(athlete_name)] = slug
+
+    def resolve(self, athlete_name):
+        """
+        :param athlete_name: String containing the athlete's name
+        :return: String containing the slug of the athlete's page, or None if the athlete is not indexed
+        """
+
+        if athlete_name in self.slugs:
+            return self.slugs[athlete_name]
+
+        return self.slugs_by_key.get(get_name_key(athlete_name))
+
+    def __len__(self):
+        return len(self.slugs)
+
+    def save(self):
+        """
+        Saves the index to its JSON file, renaming it into place so a crash never leaves a partial file.
+
+        :return: Filepath of the JSON file as a string
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        with self.lock:
+            data = json.dumps(dict(sorted(self.slugs.items())), indent=2, ensure_ascii=False)
+
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(data)
+
+            os.replace(temporary_path, self.filepath)
+
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        return self.filepath
@@ -0,0 +1,275 @@
+import itertools
+import json
+import sqlite3
+
+from src.scraper.record import ATHLETE_FIELDS
+from src.scraper.slugs import make_slug
+
+SCHEMA_VERSION = 2
+
+# Statistics columns of athlete_stats, the name is stored next to the slug the rows are keyed on
+STAT_COLUMNS = [field for field in ATHLETE_FIELDS if field != "name"]
+
+
+class HistoryStore:
+    def __init__(self, database_path, batch_size=500):
+        """
+        SQLite database holding every run's rankings and athlete statistics, so an
+        athlete's history is one indexed query away instead of spread over a
+        spreadsheet per run. The database is in WAL mode, so readers never block the
+        scraper writing into it.
+
+        :param database_path: Filepath of the SQLite database, created if it does not exist
+        :param batch_size: Number of athletes upserted per statement batch
+        """
+
+        self.database_path = database_path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(database_path)
+
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        """
+        Creates the tables and indexes if they do not exist yet.
+
+        :return: None
+        """
+
+        schema_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+        # Tables created by another version have other keys, which CREATE TABLE IF NOT EXISTS would keep
+        if schema_version not in (0, SCHEMA_VERSION):
+            raise ValueError(
+                f"{self.database_path} has schema version {schema_version}, expected {SCHEMA_VERSION}, "
+                "write this run into a new database"
+            )
+
+        stat_columns = ", ".join(f'"{column}" TEXT' for column in STAT_COLUMNS)
+
+        with self.connection:
+            self.connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY,
+                    scraped_at TEXT NOT NULL UNIQUE
+                );
+
+                CREATE TABLE IF NOT EXISTS rankings (
+                    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                    division TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    PRIMARY KEY (run_id, division, rank, name)
+                );
+
+                CREATE TABLE IF NOT EXISTS athlete_stats (
+                    slug TEXT NOT NULL,
+                    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+                    name TEXT NOT NULL,
+                    {stat_columns},
+                    extra TEXT,
+                    PRIMARY KEY (slug, run_id)
+                );
+
+                CREATE INDEX IF NOT EXISTS rankings_name ON rankings (name, run_id);
+                CREATE INDEX IF NOT EXISTS athlete_stats_name ON athlete_stats (name, run_id);
+                CREATE INDEX IF NOT EXISTS athlete_stats_run ON athlete_stats (run_id);
+
+                PRAGMA user_version = {SCHEMA_VERSION};
+                """)
+
+    def start_run(self, scraped_at):
+        """
+        Registers a run, or finds it again if it was already registered.
+
+        :param scraped_at: datetime of the run
+        :return: Integer ID of the run
+        """
+
+        scraped_at = scraped_at.isoformat(timespec="seconds")
+
+        with self.connection:
+            self.connection.execute("INSERT INTO runs (scraped_at) VALUES (?) ON CONFLICT DO NOTHING", (scraped_at,))
+
+        return self.connection.execute("SELECT run_id FROM runs WHERE scraped_at = ?", (scraped_at,)).fetchone()[0]
+
+    def write_rankings(self, run_id, rankings):
+        """
+        Replaces the rankings of a run. Tied athletes share a rank, while an athlete listed
+        twice at the same rank of a division raises sqlite3.IntegrityError.
+
+        :param run_id: Integer ID of the run
+        :param rankings: Iterable of RankingEntry tuples, rank 0 being the champion
+        :return: None
+        """
+
+        with self.connection:
+            self.connection.execute("DELETE FROM rankings WHERE run_id = ?", (run_id,))
+            self.connection.executemany(
+                "INSERT INTO rankings (run_id, division, rank, name) VALUES (?, ?, ?, ?)",
+                [(run_id, entry.division, entry.rank, entry.name) for entry in rankings],
+            )
+
+    def write_athlete_stats(self, run_id, athlete_statistics, athlete_slugs=None):
+        """
+        Upserts athletes' statistics into a run in batches of batch_size, one transaction
+        per batch. Athletes that failed to scrape are skipped.
+
+        :param run_id: Integer ID of the run
+        :param athlete_statistics: Iterable of dicts or AthleteRecords of compiled fighter statistics
+        :param athlete_slugs: Optional iterable of the slugs of the athletes' pages, in the order of athlete_statistics,
+                              athletes without one are keyed on the slug guessed from their name
+        :return: Number of athletes written
+        """
+
+        number_written = 0
+        batch = []
+
+        if athlete_slugs is None:
+            athlete_slugs = itertools.repeat(None)
+
+        for statistics, athlete_slug in zip(athlete_statistics, athlete_slugs):
+            if not statistics:
+                continue
+
+            batch.append(self.get_athlete_row(run_id, statistics, athlete_slug))
+
+            if len(batch) >= self.batch_size:
+                number_written += self.upsert_rows(batch)
+                batch = []
+
+        if batch:
+            number_written += self.upsert_rows(batch)
+
+        return number_written
+
+    def get_athlete_row(self, run_id, athlete_statistics, athlete_slug=None):
+        """
+        :param run_id: Integer ID of the run
+        :param athlete_statistics: Dict or AthleteRecord of an athlete's compiled fighter statistics
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: Tuple of the athlete_stats columns
+        """
+
+        extra = {field: value for field, value in athlete_statistics.items() if field not in ATHLETE_FIELDS}
+
+        return (
+            athlete_slug or make_slug(athlete_statistics["name"]),
+            run_id,
+            athlete_statistics["name"],
+            *(athlete_statistics.get(column) for column in STAT_COLUMNS),
+            json.dumps(extra) if extra else None,
+        )
+
+    def upsert_rows(self, rows):
+        """
+        :param rows: List of tuples from get_athlete_row()
+        :return: Number of rows upserted
+        """
+
+        columns = ["slug", "run_id", "name"] + STAT_COLUMNS + ["extra"]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f'"{column}" = excluded."{column}"' for column in ["name"] + STAT_COLUMNS + ["extra"])
+
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO athlete_stats ({column_list}) VALUES ({placeholders}) "
+                f"ON CONFLICT (slug, run_id) DO UPDATE SET {updates}",
+                rows,
+            )
+
+        return len(rows)
+
+    def get_athlete_history(self, name, fields, limit=50):
+        """
+        Looks up an athlete's statistics over their most recent runs.
+
+        :param name: String containing the athlete's name
+        :param fields: List of statistics to look up, e.g. ["significant_strike_accuracy"]
+        :param limit: Maximum number of runs to return
+        :return: List of dicts with the run's scraped_at and the requested statistics, newest first
+        """
+
+        unknown_fields = set(fields) - set(STAT_COLUMNS)
+
+        if unknown_fields:
+            raise ValueError(f"Unknown athlete statistics {sorted(unknown_fields)}")
+
+        column_list = ", ".join(f'athlete_stats."{field}"' for field in fields)
+        cursor = self.connection.execute(
+            f"SELECT runs.scraped_at, {column_list} FROM athlete_stats JOIN runs USING (run_id) "
+            "WHERE athlete_stats.name = ? ORDER BY runs.scraped_at DESC LIMIT ?",
+            (name, limit),
+        )
+
+        return [dict(zip(["scraped_at"] + list(fields), row)) for row in cursor]
+
+    def get_ranking_history(self, name, limit=50):
+        """
+        :param name: String containing the athlete's name
+        :param limit: Maximum number of runs to return
+        :return: List of dicts with the run's scraped_at, the division and the rank, newest first
+        """
+
+        cursor = self.connection.execute(
+            "SELECT runs.scraped_at, rankings.division, rankings.rank FROM rankings JOIN runs USING (run_id) "
+            "WHERE rankings.name = ? ORDER BY runs.scraped_at DESC LIMIT ?",
+            (name, limit),
+        )
+
+        return [dict(zip(["scraped_at", "division", "rank"], row)) for row in cursor]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HistoryStoreWriter:
+    def __init__(self, store, run_id):
+        """
+        Adapts a HistoryStore to the record writer interface of the streaming mode,
+        upserting athletes in batches as they are scraped.
+
+        :param store: HistoryStore object to write into
+        :param run_id: Integer ID of the run
+        """
+
+        self.store = store
+        self.run_id = run_id
+        self.batch = []
+        self.slugs = []
+        self.records_written = 0
+
+    def write(self, athlete_statistics, athlete_slug=None):
+        """
+        :param athlete_statistics: Dict containing an athlete's compiled fighter statistics
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: None
+        """
+
+        self.batch.append(athlete_statistics)
+        self.slugs.append(athlete_slug)
+
+        if len(self.batch) >= self.store.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.records_written += self.store.write_athlete_stats(self.run_id, self.batch, self.slugs)
+        self.batch = []
+        self.slugs = []
+
+    def close(self):
+        """
+        :return: Filepath of the SQLite database as a string
+        """
+
+        self.flush()
+        return self.store.database_path
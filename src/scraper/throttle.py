@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status codes with which a server signals it is overloaded or throttling us
+THROTTLING_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        """
+        Caps the request rate at rate requests per second on average, while allowing
+        bursts of up to burst requests.
+
+        :param rate: Number of tokens added per second
+        :param burst: Maximum number of tokens the bucket holds, defaults to max(1, rate)
+        """
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token from the bucket, going into debt when it is empty.
+
+        :return: Number of seconds to wait before the reserved token may be used
+        """
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+
+            return max(0.0, -self.tokens / self.rate)
+
+
+class AdaptiveThrottle:
+    def __init__(
+        self,
+        max_limit=50,
+        initial_limit=10,
+        min_limit=1,
+        latency_target=2.0,
+        backoff_factor=0.5,
+        cooldown=1.0,
+        rate=None,
+        burst=None,
+    ):
+        """
+        AIMD controller of the number of requests in flight. Every healthy response raises the
+        limit by 1/limit, so it grows by about one request per round trip, while a slow
+        response or a 429/5xx multiplies it by backoff_factor. An optional token bucket caps
+        the request rate on top of that.
+
+        :param max_limit: Maximum number of requests in flight, lowered to the scraper's concurrency with cap_limit()
+        :param initial_limit: Number of requests in flight allowed at the start
+        :param min_limit: Minimum number of requests in flight
+        :param latency_target: Number of seconds above which a response counts as slow
+        :param backoff_factor: Factor the limit is multiplied by on a slow or throttled response
+        :param cooldown: Minimum number of seconds between two decreases, so one burst of errors only backs off once
+        :param rate: Optional maximum number of requests per second
+        :param burst: Maximum burst of requests allowed by the rate cap
+        """
+
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.latency_target = latency_target
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        self.token_bucket = TokenBucket(rate, burst) if rate else None
+        self.in_flight = 0
+        self.last_decreased_at = 0.0
+        self.condition = threading.Condition()
+        self.async_waiters = []
+
+    def cap_limit(self, max_limit):
+        """
+        Lowers max_limit to the number of requests the scraper can have in flight, so the
+        limit never grows past a concurrency that is never reached and the first slow or
+        throttled response backs off from a limit that was actually in use.
+
+        :param max_limit: Maximum number of requests the scraper sends concurrently
+        :return: None
+        """
+
+        with self.condition:
+            self.max_limit = max(self.min_limit, min(self.max_limit, max_limit))
+            self.limit = min(self.limit, self.max_limit)
+
+    def try_acquire(self):
+        """
+        Takes a request slot if one is free.
+
+        :return: True if a slot was taken
+        """
+
+        with self.condition:
+            if self.in_flight >= int(self.limit):
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def acquire(self):
+        """
+        Blocks until a request may be sent.
+
+        :return: None
+        """
+
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+
+            self.in_flight += 1
+
+        if self.token_bucket is not None:
+            time.sleep(self.token_bucket.reserve())
+
+    async def async_acquire(self):
+        """
+        Coroutine counterpart of acquire() that waits on the event loop.
+
+        :return: None
+        """
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self.condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    break
+
+                # Woken up by release(), which may run on another thread than this event loop
+                waiter = loop.create_future()
+                self.async_waiters.append((loop, waiter))
+
+            await waiter
+
+        if self.token_bucket is not None:
+            await asyncio.sleep(self.token_bucket.reserve())
+
+    def release(self, latency, status_code):
+        """
+        Frees a request slot and adjusts the limit from the outcome of the request.
+
+        :param latency: Number of seconds the request took
+        :param status_code: HTTP status code of the response, or None if the request raised
+        :return: None
+        """
+
+        now = time.monotonic()
+
+        with self.condition:
+            self.in_flight -= 1
+            overloaded = status_code is None or status_code in THROTTLING_STATUS_CODES or latency > self.latency_target
+
+            if overloaded:
+                if now - self.last_decreased_at >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_factor)
+                    self.last_decreased_at = now
+                    logger.debug(
+                        "Backing off to %s requests in flight after a %s response in %.2fs",
+                        int(self.limit),
+                        status_code,
+                        latency,
+                    )
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
+            async_waiters, self.async_waiters = self.async_waiters, []
+
+        # The loop of a waiter that was cancelled may have finished since
+        for loop, waiter in async_waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(wake_async_waiter, waiter)
+
+
+def wake_async_waiter(waiter):
+    """
+    :param waiter: asyncio.Future of a coroutine waiting in async_acquire(), unless it was cancelled
+    :return: None
+    """
+
+    if not waiter.done():
+        waiter.set_result(None)
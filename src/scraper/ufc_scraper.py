@@ -1,11 +1,29 @@
-import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
 import os
-import threading
+import re
+import time
+from collections import deque
+from collections.abc import Sized
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
 
 import bs4
-import pandas as pd
-import requests
+
+from src.scraper.directory import has_next_page, parse_athletes_directory
+from src.scraper.history import FIGHT_HISTORY_FIELDS, estimate_fight_history_pages, parse_fight_history
+from src.scraper.metrics import ScrapeMetrics
+from src.scraper.rankings import get_athlete_list, join_rankings, parse_rankings, write_rankings_txt_file
+from src.scraper.record import ATHLETE_FIELDS, AthleteRecord, to_dataframe
+from src.scraper.reporting import ProgressReporter
+from src.scraper.retry import RetryPolicy, ThrottledResponseError, parse_retry_after
+from src.scraper.session import DEFAULT_TIMEOUT, create_session
+from src.scraper.slugs import Athlete, SlugIndex, as_athlete, make_slug
+from src.scraper.store import HistoryStoreWriter
+from src.scraper.throttle import THROTTLING_STATUS_CODES
 
 DIVISON_MAPPING = {
     "Flyweight": "flw",
@@ -23,126 +41,566 @@ DIVISON_MAPPING = {
     "Pound-for-Pound": "p4p",
 }
 
-parser = argparse.ArgumentParser(description="Specify UFC divisions")
-parser.add_argument("-all", help="Pull all divisions", action="store_true")
-parser.add_argument("-flw", help="Flyweight", action="store_true")
-parser.add_argument("-bw", help="Bantamweight", action="store_true")
-parser.add_argument("-fw", help="Featherweight", action="store_true")
-parser.add_argument("-lw", help="Lightweight", action="store_true")
-parser.add_argument("-ww", help="Welterweight", action="store_true")
-parser.add_argument("-mw", help="Middleweight", action="store_true")
-parser.add_argument("-lhw", help="Light Heavyweight", action="store_true")
-parser.add_argument("-hw", help="Heavyweight", action="store_true")
-parser.add_argument("-wsw", help="Women's Strawweight", action="store_true")
-parser.add_argument("-wflw", help="Women's Flyweight", action="store_true")
-parser.add_argument("-wbw", help="Women's Bantamweight", action="store_true")
-# parser.add_argument('-wfw', help="Women's Featherweight", action="store_true")
-# parser.add_argument('-p4p', help="Pound-for-Pound", action="store_true")
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup tree builders the scraper can parse pages with
+PARSER_BACKENDS = ["html.parser", "lxml"]
+
+# Classes of the athlete webpage sections read by the extractors
+ATHLETE_PAGE_SECTIONS = [
+    "field field-name-nickname",
+    "c-hero__headline-suffix tz-change-inner",
+    "c-bio__info-details",
+    "l-overlap-group__item--odd",
+    "l-overlap-group__item--even",
+    "l-overlap-group__item--odd--full-width",
+    "l-container__content--narrow stats-records__outer-container",
+]
+
+# Only builds the athlete webpage sections above when partial parsing is enabled
+ATHLETE_PAGE_STRAINER = bs4.SoupStrainer(class_=ATHLETE_PAGE_SECTIONS)
+
+# Also builds the fight cards and the "load more" link when the first page of the fight history is kept
+FIGHT_HISTORY_SECTIONS = ["c-card-event--athlete-results", "pager__item"]
+ATHLETE_HISTORY_PAGE_STRAINER = bs4.SoupStrainer(class_=ATHLETE_PAGE_SECTIONS + FIGHT_HISTORY_SECTIONS)
+
+# Markup stripped before hashing a page so per-request tokens in scripts and whitespace do not count as changes
+VOLATILE_MARKUP_PATTERN = re.compile(r"<script\b.*?</script>|\s+", flags=re.DOTALL | re.IGNORECASE)
+
+# Scraper instance reused by each worker process of the pipeline engine
+_process_scraper = None
+
+# Parsing processes are started from a clean server process rather than forked from the fetch threads, since a
+# child forked while another thread holds the logging, metrics or connection pool locks can deadlock on them
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
 
-args = vars(parser.parse_args())
 
-if not any(args.values()):
-    args["all"] = True
+def extract_athlete_stats_in_process(
+    athlete_name, html_content, parser_backend="html.parser", partial_parse=False, fight_history_url=None
+):
+    """
+    Process pool entry point that extracts an athlete's statistics from the html of their
+    webpage, so the CPU-bound parsing runs outside of the fetching process.
+
+    :param athlete_name: String containing the athlete's name
+    :param html_content: String containing the html of the UFC athlete's webpage
+    :param parser_backend: BeautifulSoup parser backend to parse the html with
+    :param partial_parse: Whether to only build the sections of the page the extractors read
+    :param fight_history_url: URL of the athlete's webpage when the first page of their fight history is also
+                              parsed from it, or None
+    :return: Tuple of the dict containing athlete's compiled fighter statistics, the parsing
+             metrics collected in this process, to be merged into the parent's metrics, and
+             the first_fight_history_pages parsed in this process, to be handed to the parent's
+    """
+
+    global _process_scraper
+
+    # Reuse one scraper per worker process
+    if (
+        _process_scraper is None
+        or _process_scraper.parser_backend != parser_backend
+        or _process_scraper.partial_parse != partial_parse
+    ):
+        _process_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=parser_backend, partial_parse=partial_parse)
+
+    _process_scraper.metrics = ScrapeMetrics()
+    _process_scraper.fight_history = fight_history_url is not None
+    _process_scraper.first_fight_history_pages = dict()
+    athlete_statistics = _process_scraper.extract_athlete_stats(athlete_name, html_content, fight_history_url)
+
+    return athlete_statistics, _process_scraper.metrics.to_dict(), _process_scraper.first_fight_history_pages
 
 
 class UFCWebsiteScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers=50,
+        timeout=DEFAULT_TIMEOUT,
+        session=None,
+        parser_backend="html.parser",
+        partial_parse=False,
+        cache=None,
+        recorder=None,
+        replayer=None,
+        metrics=None,
+        progress_interval=5.0,
+        throttle=None,
+        retry_policy=None,
+        compact_records=False,
+        divisions=None,
+        slug_index=None,
+        history_concurrency=4,
+        fight_history=False,
+    ):
+        """
+        :param max_workers: Maximum number of athlete pages scraped concurrently
+        :param timeout: Timeout in seconds for each request, either a number or a (connect, read) tuple
+        :param session: Optional requests.Session to use instead of a pooled session sized to max_workers
+        :param parser_backend: BeautifulSoup parser backend, "lxml" uses the C-accelerated lxml parser
+        :param partial_parse: Only build the sections of athlete webpages the extractors read
+        :param cache: Optional ResponseCache used to revalidate pages instead of downloading them again
+        :param recorder: Optional PageRecorder that archives every fetched page
+        :param replayer: Optional PageReplayer that serves pages from an archive instead of ufc.com
+        :param metrics: Optional ScrapeMetrics to collect the run's timings and counters into
+        :param progress_interval: Minimum number of seconds between two progress lines while scraping athletes
+        :param throttle: Optional AdaptiveThrottle tuning the number of requests in flight from server responses
+        :param retry_policy: Optional RetryPolicy for transient fetch failures, defaults to three attempts
+        :param compact_records: Return each athlete's statistics as a compact AthleteRecord instead of a dict
+        :param divisions: Optional list of the divisions to scrape the rankings of, e.g. ["Lightweight"], defaults to all
+        :param slug_index: Optional SlugIndex of the athletes' page slugs, to reuse the slugs collected on earlier runs
+        :param history_concurrency: Maximum number of pages of one athlete's fight history fetched concurrently
+        :param fight_history: Keep the first page of each athlete's fight history from the webpage their statistics
+                              are scraped from, so scrape_fight_histories() does not download it again
+        """
+
+        if parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unsupported parser backend {parser_backend!r}, expected one of {PARSER_BACKENDS}")
+
+        unknown_divisions = set(divisions or []) - set(DIVISON_MAPPING)
+
+        if unknown_divisions:
+            raise ValueError(f"Unknown divisions {sorted(unknown_divisions)}, expected any of {list(DIVISON_MAPPING)}")
+
         self.BASE_URL = "https://www.ufc.com/athlete/"
+        self.RANKINGS_URL = "https://www.ufc.com/rankings"
+        self.ATHLETES_DIRECTORY_URL = "https://www.ufc.com/athletes/all"
         self.current_datetime = datetime.now().strftime("%d%m%Y%H%M%S")
         self.current_rankings_list = []
+        self.current_rankings = []
+        self.current_roster = []
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.parser_backend = parser_backend
+        self.partial_parse = partial_parse
+        self.session = session if session is not None else create_session(pool_size=max_workers)
+        self.cache = cache
+        self.recorder = recorder
+        self.replayer = replayer
+        self.previous_run = dict()
+        self.content_hashes = dict()
+        self.metrics = metrics if metrics is not None else ScrapeMetrics()
+        self.progress_interval = progress_interval
+        self.progress = ProgressReporter(0, progress_interval)
+        self.throttle = throttle
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.failed_athletes = dict()
+        self.compact_records = compact_records
+        self.divisions = list(divisions) if divisions is not None else None
+        self.slug_index = slug_index if slug_index is not None else SlugIndex()
+        self.history_concurrency = history_concurrency
+        self.fight_history = fight_history
+        self.first_fight_history_pages = dict()
+
+        if self.retry_policy.metrics is None:
+            self.retry_policy.metrics = self.metrics
+
+        if self.throttle is not None:
+            self.throttle.cap_limit(max_workers)
+
+        # Parse the fallbacks once instead of for every missing page
+        self.empty_athlete_statistics = self.get_missing_athlete_stats_template()
+
+    def fetch_page(self, url):
+        """
+        Fetches a page, from the replay archive when one is configured and from ufc.com
+        otherwise, recording it when a recorder is configured.
+
+        :param url: String containing the URL to fetch
+        :return: requests.Response object
+        """
+
+        if self.replayer is not None:
+            start = time.perf_counter()
+            page = self.replayer.get_response(url)
+            self.metrics.observe_fetch(time.perf_counter() - start, page.status_code, len(page.content))
+        else:
+            page = self.download_page(url)
+
+        if self.recorder is not None:
+            self.recorder.record(url, page.status_code, page.content, page.encoding)
+
+        return page
+
+    def download_page(self, url):
+        """
+        Performs a GET request through the scraper's shared keep-alive session. When a
+        response cache is configured, fresh pages are served from disk and stale ones are
+        revalidated so an unchanged page only costs a 304.
+
+        :param url: String containing the URL to fetch
+        :return: requests.Response object
+        """
+
+        if self.cache is None:
+            return self.send_request(url)
+
+        entry = self.cache.get(url)
+
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            self.metrics.count_cache_hit("fresh")
+            return entry.to_response()
 
-    def export_to_excel(self, athlete_statistics):
+        headers = entry.conditional_headers() if entry is not None else {}
+        page = self.send_request(url, headers=headers)
+
+        if page.status_code == 304 and entry is not None:
+            self.metrics.count_cache_hit("revalidated")
+            return self.cache.refresh(entry).to_response()
+
+        if page.status_code == 200:
+            self.cache.store(url, page.status_code, page.headers, page.content, page.encoding)
+
+        return page
+
+    def send_request(self, url, headers=None):
+        """
+        Sends a GET request, waiting for the throttle to allow it and reporting how
+        the server responded so it can adjust the number of requests in flight. The
+        fetch metrics record the response as it came over the wire, e.g. a 304 without a body.
+
+        :param url: String containing the URL to fetch
+        :param headers: Optional dict of request headers
+        :return: requests.Response object
+        """
+
+        if self.throttle is not None:
+            self.throttle.acquire()
+
+        start = time.perf_counter()
+        status_code = None
+
+        try:
+            page = self.session.get(url, headers=headers, timeout=self.timeout)
+            status_code = page.status_code
+        finally:
+            if self.throttle is not None:
+                self.throttle.release(time.perf_counter() - start, status_code)
+
+        self.metrics.observe_fetch(time.perf_counter() - start, page.status_code, len(page.content))
+
+        return page
+
+    def make_soup(self, html_content, parse_only=None):
+        """
+        Parses html with the scraper's configured parser backend.
+
+        :param html_content: String containing html
+        :param parse_only: Optional SoupStrainer restricting which tags are built into the tree
+        :return: BeautifulSoup object
+        """
+
+        return bs4.BeautifulSoup(html_content, self.parser_backend, parse_only=parse_only)
+
+    def export_to_excel(self, athlete_statistics, normalize=False):
         """
         Exports the compiled data into an Excel file.
 
         :param athlete_statisitcs : Dict containing the compiled statistics of athlete data
-        :param filename: Name of the Excel file to create
+        :param normalize: Whether to export typed numeric and date columns instead of the raw strings
         :return: Filepath of .xlsx file as a string
         """
 
+        # pandas is only needed by the exports, so workers and services that never export do not import it
+        from src.scraper.normalize import normalize_athlete_statistics
+
         excel_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-data.xlsx"
-        data = pd.DataFrame(athlete_statistics)
-        data.to_excel(excel_filepath, engine="xlsxwriter")
+
+        # Athletes that failed are listed in failed_athletes instead of as rows of empty statistics
+        athlete_statistics = [statistics for statistics in athlete_statistics if statistics]
+
+        with self.metrics.time_stage("export_to_excel"):
+            if normalize:
+                data = normalize_athlete_statistics(athlete_statistics)
+            else:
+                data = to_dataframe(athlete_statistics)
+
+            data.to_excel(excel_filepath, engine="xlsxwriter")
 
         return excel_filepath
 
-    def scrape_ufc_rankings_to_txt_file(self):
+    def export_rankings_to_excel(self, athlete_statistics, normalize=False):
         """
-        Scrapes the UFC rankings website to write the names of fighters listed on the webpage
-        into a .txt file.
+        Exports one row per ranking in current_rankings, followed by the ranked athlete's
+        statistics, into an Excel file. An athlete ranked in two divisions is in both rows.
 
-        :return: Filepath of .txt file as a string
+        :param athlete_statistics: List of the compiled statistics of the athletes in current_rankings_list
+        :param normalize: Whether to export typed numeric and date columns instead of the raw strings
+        :return: Filepath of .xlsx file as a string
         """
 
-        # Get the html for the rankings website
-        url = "https://www.ufc.com/rankings"
-        page = requests.get(url)
+        from src.scraper.normalize import normalize_athlete_statistics
 
-        if page.status_code != 200:
-            raise Exception("ERROR: Could not retrieve rankings website")
+        excel_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-rankings.xlsx"
+        ranked_statistics = self.join_rankings(athlete_statistics)
 
-        html_content = page.text
-        soup = bs4.BeautifulSoup(html_content, "html.parser")
+        with self.metrics.time_stage("export_rankings_to_excel"):
+            if normalize:
+                data = normalize_athlete_statistics(ranked_statistics)
+            else:
+                data = to_dataframe(ranked_statistics)
 
-        # Open the file we will write to
-        text_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-rankings.txt"
+            data.to_excel(excel_filepath, engine="xlsxwriter")
 
-        with open(text_filepath, "w") as file:
-            # Look at each grouping of rankings
-            groupings = soup.find_all(class_="view-grouping")
-
-            # Iterate through each grouping
-            for grouping in groupings:
-                if isinstance(grouping, bs4.element.Tag):
-                    division_html = grouping.find(class_="view-grouping-header")
-                    division = division_html.get_text()
-
-                    # Exclude the pound-for-pound rankings and women's featherweight
-                    if division in [
-                        "Pound-for-Pound Top Rank",
-                        "Women's Featherweight",
-                    ]:
-                        continue
+        return excel_filepath
+
+    def export_fight_history(self, fights):
+        """
+        Exports the fight history table, one row per fight, into an Excel file.
 
-                    # If no command line args specfied, pull all divisions
-                    if not args["all"]:
-                        current_division = DIVISON_MAPPING[division]
+        :param fights: List of dicts with the fields of each fight, from scrape_fight_histories()
+        :return: Filepath of .xlsx file as a string
+        """
 
-                        # Capture divisions specified in command line args
-                        if not args[current_division]:
-                            continue
+        import pandas as pd
 
-                    file.write(division + "\n")
+        excel_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-fights.xlsx"
 
-                    try:
-                        # Get the division's champion's name and clean the text
-                        champion_html = grouping.find(class_="info")
-                        champion_html = champion_html.find(class_="views-row")
-                        champion = champion_html.get_text().strip()
+        with self.metrics.time_stage("export_fight_history"):
+            pd.DataFrame(fights, columns=FIGHT_HISTORY_FIELDS).to_excel(excel_filepath, engine="xlsxwriter")
+
+        return excel_filepath
+
+    def export_to_columnar(
+        self, athlete_statistics, output_format="parquet", compression="zstd", partition_by=None, normalize=False
+    ):
+        """
+        Exports the compiled data into a Parquet or Arrow IPC file with a fixed schema, or
+        into a dataset under fighter_stats/athletes.<format>/ partitioned by division and/or
+        scrape date that every scrape adds its own files to.
+
+        :param athlete_statistics: List of dicts containing the compiled statistics of athlete data
+        :param output_format: "parquet" or "arrow"
+        :param compression: Compression codec, one of "zstd", "snappy", "gzip", "lz4" and "none"
+        :param partition_by: Optional list of "division" and/or "scrape_date"
+        :param normalize: Whether to export typed numeric and date columns instead of the raw strings
+        :return: Filepath of the file, or of the dataset directory, as a string
+        """
+
+        from src.scraper.columnar import build_athlete_table, parse_scrape_datetime, write_athlete_table
+
+        if partition_by:
+            path = os.getcwd() + f"/fighter_stats/athletes.{output_format}"
+        else:
+            path = os.getcwd() + f"/fighter_stats/{self.current_datetime}-data.{output_format}"
+
+        with self.metrics.time_stage("export_to_columnar"):
+            table = build_athlete_table(
+                athlete_statistics,
+                self.get_athlete_columns(),
+                parse_scrape_datetime(self.current_datetime),
+                normalize=normalize,
+            )
+            write_athlete_table(table, path, output_format, compression, partition_by, basename=self.current_datetime)
+
+        return path
+
+    def start_store_run(self, store):
+        """
+        Registers the run in a history store along with the rankings scraped so far.
+
+        :param store: HistoryStore object
+        :return: Integer ID of the run
+        """
+
+        run_id = store.start_run(datetime.strptime(self.current_datetime, "%d%m%Y%H%M%S"))
+        store.write_rankings(run_id, self.current_rankings)
+
+        return run_id
+
+    def export_to_store(self, store, athlete_statistics, athlete_list):
+        """
+        Upserts the run's rankings and compiled data into a SQLite history store, keying
+        each athlete on the slug of their page.
+
+        :param store: HistoryStore object
+        :param athlete_statistics: List of dicts containing the compiled statistics of athlete data
+        :param athlete_list: The list of athletes the statistics were scraped for, in the same order
+        :return: Filepath of the SQLite database as a string
+        """
+
+        athlete_slugs = [self.get_athlete_slug(*as_athlete(athlete)) for athlete in athlete_list]
+
+        with self.metrics.time_stage("export_to_store"):
+            store.write_athlete_stats(self.start_store_run(store), athlete_statistics, athlete_slugs)
+
+        return store.database_path
+
+    def stream_athlete_stats(self, athlete_list, output_formats, store=None):
+        """
+        Scrapes athletes and appends each one to the output files as soon as they are
+        scraped, in completion order rather than ranking order, so memory stays flat
+        however many athletes are scraped.
+
+        :param athlete_list: An ordered list of athletes to be scraped
+        :param output_formats: List of output formats, any of "csv", "jsonl" and "xlsx"
+        :param store: Optional HistoryStore the athletes are also upserted into, in batches
+        :return: List of the filepaths of the output files as strings
+        """
+
+        from src.scraper.writers import RECORD_WRITERS
+
+        columns = self.get_athlete_columns()
+        writers = [
+            RECORD_WRITERS[output_format](
+                os.getcwd() + f"/fighter_stats/{self.current_datetime}-data.{output_format}", columns
+            )
+            for output_format in output_formats
+        ]
+
+        # The store keys athletes on their slug, which the record writers do not export
+        store_writer = HistoryStoreWriter(store, self.start_store_run(store)) if store is not None else None
+
+        try:
+            for _, athlete, athlete_statistics in self.iter_scrape_athlete_stats(athlete_list):
+                # Athletes that failed are listed in failed_athletes instead
+                if not athlete_statistics:
+                    continue
+
+                with self.metrics.time_stage("stream_write"):
+                    for writer in writers:
+                        writer.write(athlete_statistics)
+
+                    if store_writer is not None:
+                        store_writer.write(athlete_statistics, self.get_athlete_slug(*as_athlete(athlete)))
+
+        finally:
+            filepaths = [writer.close() for writer in writers]
+
+            if store_writer is not None:
+                filepaths.append(store_writer.close())
+
+        return filepaths
+
+    def export_run_state(self, athlete_statistics):
+        """
+        Exports each athlete's page content hash alongside their compiled statistics, so a
+        later run can skip re-parsing athletes whose pages have not changed.
+
+        :param athlete_statistics: List of dicts containing the compiled statistics of athlete data
+        :return: Filepath of .json file as a string
+        """
+
+        state_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-state.json"
+
+        athletes = []
+
+        for statistics in athlete_statistics:
+            if not statistics:
+                continue
+
+            athletes.append(
+                {
+                    "name": statistics["name"],
+                    "content_hash": self.content_hashes.get(statistics["name"], ""),
+                    "statistics": dict(statistics),
+                }
+            )
+
+        with open(state_filepath, "w") as file:
+            json.dump(
+                {"scraped_at": self.current_datetime, "athletes": athletes, "failed_athletes": self.failed_athletes},
+                file,
+            )
+
+        return state_filepath
+
+    def load_previous_run(self, state_filepath):
+        """
+        Loads the athlete statistics and page content hashes exported by a previous run.
+
+        :param state_filepath: Filepath of the .json file written by export_run_state()
+        :return: Number of athletes loaded
+        """
 
-                        # Write the champion into file
-                        self.current_rankings_list.append(champion)
-                        champion = "".join(["\t", champion, "\n"])
-                        file.write(champion)
+        with open(state_filepath) as file:
+            state = json.load(file)
 
-                    except AttributeError:
-                        # There is no active champion!
-                        pass
+        self.previous_run = {
+            athlete["name"]: (athlete["content_hash"], athlete["statistics"])
+            for athlete in state["athletes"]
+            if athlete["content_hash"]
+        }
 
-                    # Get the top 15 fighters in the current division
-                    top_15 = grouping.find_all(class_="views-field views-field-title")
+        return len(self.previous_run)
 
-                    for fighter in top_15:
-                        # Get the current fighter's name and clean the text
-                        fighter_name_html = fighter.find(class_="views-row")
-                        fighter_name = fighter_name_html.get_text().strip()
+    def hash_page_content(self, html_content):
+        """
+        :param html_content: String containing the html of a webpage
+        :return: Hex digest of the page's content, ignoring scripts and whitespace
+        """
+
+        stable_content = VOLATILE_MARKUP_PATTERN.sub("", html_content)
+        return hashlib.sha256(stable_content.encode("utf-8")).hexdigest()
+
+    def get_unchanged_athlete_stats(self, athlete_name, html_content):
+        """
+        Records the content hash of the athlete's webpage and, when it matches the hash
+        from the previous run, returns the previous run's statistics instead of re-parsing.
+
+        :param athlete_name: String containing the athlete's name
+        :param html_content: String containing the html of the UFC athlete's webpage
+        :return: Dict containing athlete's compiled fighter statistics, or None if the page changed
+        """
+
+        content_hash = self.hash_page_content(html_content)
+        self.content_hashes[athlete_name] = content_hash
+
+        previous_hash, previous_statistics = self.previous_run.get(athlete_name, ("", None))
+
+        if previous_hash != content_hash:
+            return None
+
+        logger.debug("Page unchanged for %s, reusing previous stats", athlete_name, extra={"athlete": athlete_name})
+
+        return self.make_athlete_record(dict(previous_statistics))
+
+    def scrape_ufc_rankings(self):
+        """
+        Scrapes the UFC rankings website into structured entries. The rankings are kept in
+        current_rankings and the athletes to scrape in current_rankings_list, as Athlete
+        tuples carrying the slug each athlete is linked with, each athlete listed once
+        even when they are ranked in more than one division.
+
+        :return: List of RankingEntry tuples of (division, rank, name, champion)
+        """
+
+        # Get the html for the rankings website
+        page = self.fetch_page(self.RANKINGS_URL)
+
+        if page.status_code != 200:
+            raise Exception("ERROR: Could not retrieve rankings website")
+
+        soup = self.make_soup(page.text)
+
+        self.current_rankings = parse_rankings(soup, self.divisions)
+        self.current_rankings_list = get_athlete_list(self.current_rankings)
+
+        # Index the real slugs linked from the rankings, so athlete URLs are not guessed from names
+        for entry in self.current_rankings:
+            if entry.slug:
+                self.slug_index.add(entry.name, entry.slug)
+
+        return self.current_rankings
+
+    def scrape_ufc_rankings_to_txt_file(self):
+        """
+        Scrapes the UFC rankings website to write the names of fighters listed on the webpage
+        into a .txt file.
+
+        :return: Filepath of .txt file as a string
+        """
+
+        text_filepath = os.getcwd() + f"/fighter_stats/{self.current_datetime}-rankings.txt"
 
-                        # Write the fighter's name into file
-                        self.current_rankings_list.append(fighter_name)
-                        fighter_name = "".join(["\t", fighter_name, "\n"])
-                        file.write(fighter_name)
+        return write_rankings_txt_file(self.scrape_ufc_rankings(), text_filepath)
 
-        return text_filepath
+    def join_rankings(self, athlete_statistics):
+        """
+        :param athlete_statistics: List of the compiled statistics of the athletes in current_rankings_list
+        :return: List of dicts with one row per ranking in current_rankings, followed by the athlete's statistics
+        """
+
+        return join_rankings(self.current_rankings, self.current_rankings_list, athlete_statistics)
 
     def scrape_athlete_biography(self, soup):
         """
@@ -152,12 +610,20 @@ class UFCWebsiteScraper:
         :return: compiled_statistics: Dict with the scraped statistics.
         """
 
+        return self.parse_athlete_biography(soup.find(class_="c-bio__info-details"))
+
+    def parse_athlete_biography(self, biography):
+        """
+        Parses the athlete's biography section.
+
+        :param biography: Tag of the c-bio__info-details section, or None if it does not exist
+        :return: compiled_statistics: Dict with the scraped statistics.
+        """
+
         # Initialize the dictionary
         compiled_statistics = dict()
 
         try:
-            biography = soup.find(class_="c-bio__info-details")
-
             if biography is None:
                 raise AttributeError()
 
@@ -177,7 +643,8 @@ class UFCWebsiteScraper:
                         compiled_statistics[label] = entry
 
         except AttributeError:
-            print("Athlete does not have a biography section")
+            logger.debug("Athlete does not have a biography section")
+            self.metrics.count_fallback("biography")
             compiled_statistics.update(
                 {
                     "status": "",
@@ -202,14 +669,24 @@ class UFCWebsiteScraper:
         :return: The athlete's nickname as a string
         """
 
+        return self.parse_athlete_nickname(soup.find(class_="field field-name-nickname"))
+
+    def parse_athlete_nickname(self, nickname_html):
+        """
+        Parses the athlete's nickname.
+
+        :param nickname_html: Tag containing the nickname, or None if it does not exist
+        :return: The athlete's nickname as a string
+        """
+
         nickname = ""
 
         try:
-            nickname_html = soup.find(class_="field field-name-nickname")
             nickname = nickname_html.get_text().replace('"', "")
 
         except AttributeError:
-            print("Athlete does not have a nickname")
+            logger.debug("Athlete does not have a nickname")
+            self.metrics.count_fallback("nickname")
 
         return nickname
 
@@ -222,17 +699,27 @@ class UFCWebsiteScraper:
         :return: The athlete's fight record as a string
         """
 
+        return self.parse_athlete_record(soup.find(class_="c-hero__headline-suffix tz-change-inner"))
+
+    def parse_athlete_record(self, record_html):
+        """
+        Parses the athlete's fight record out of the hero headline.
+
+        :param record_html: Tag of the c-hero__headline-suffix section, or None if it does not exist
+        :return: The athlete's fight record as a string
+        """
+
         record = ""
 
         try:
-            record_html = soup.find(class_="c-hero__headline-suffix tz-change-inner")
             record_string = record_html.get_text()
 
             record_string = record_string.strip().split("\n")
             record = record_string[-1].strip()
 
         except AttributeError:
-            print("Athlete does not have a record")
+            logger.debug("Athlete does not have a record")
+            self.metrics.count_fallback("record")
 
         return record
 
@@ -245,10 +732,19 @@ class UFCWebsiteScraper:
         :return: The athlete's UFC ranking as a string
         """
 
+        return self.parse_athlete_ranking(soup.find(class_="c-hero__headline-suffix tz-change-inner"))
+
+    def parse_athlete_ranking(self, ranking_html):
+        """
+        Parses the athlete's ranking out of the hero headline.
+
+        :param ranking_html: Tag of the c-hero__headline-suffix section, or None if it does not exist
+        :return: The athlete's UFC ranking as a string
+        """
+
         ranking = ""
 
         try:
-            ranking_html = soup.find(class_="c-hero__headline-suffix tz-change-inner")
             ranking_info = ranking_html.get_text()
             ranking_info = ranking_info.strip().split("\n")
 
@@ -261,7 +757,8 @@ class UFCWebsiteScraper:
             ranking = ranking.split("•")[0].strip()
 
         except AttributeError:
-            print("Athlete does not have a ranking")
+            logger.debug("Athlete does not have a ranking")
+            self.metrics.count_fallback("ranking")
 
         return ranking
 
@@ -274,15 +771,27 @@ class UFCWebsiteScraper:
         :return: Dict containing athlete's compiled striking statistics
         """
 
+        striking_accuracy_html = soup.find(class_="l-overlap-group__item--odd")
+        full_width_html = None if striking_accuracy_html else soup.find(class_="l-overlap-group__item--odd--full-width")
+
+        return self.parse_striking_accuracy(striking_accuracy_html, full_width_html)
+
+    def parse_striking_accuracy(self, striking_accuracy_html, full_width_html):
+        """
+        Parses the athlete's striking accuracy detail card.
+
+        :param striking_accuracy_html: Tag of the odd detail card, or None if it does not exist
+        :param full_width_html: Tag of the full-width detail card used when there is only one card
+        :return: Dict containing athlete's compiled striking statistics
+        """
+
         # Initialize the dictionary
         compiled_statistics = dict()
 
         try:
-            striking_accuracy_html = soup.find(class_="l-overlap-group__item--odd")
-
             # Case when there is only one athlete detail card
             if not striking_accuracy_html:
-                striking_accuracy_html = soup.find(class_="l-overlap-group__item--odd--full-width")
+                striking_accuracy_html = full_width_html
 
                 # If the athlete detail card is not for Striking Accuracy, then it does not exist
                 striking_accuracy_label_html = striking_accuracy_html.find(class_="c-overlap--stats__title")
@@ -310,7 +819,8 @@ class UFCWebsiteScraper:
             compiled_statistics["significant_strike_accuracy"] = significant_strike_accuracy
 
         except AttributeError:
-            print("The Striking Accuracy detail card does not exist.")
+            logger.debug("The Striking Accuracy detail card does not exist.")
+            self.metrics.count_fallback("striking_accuracy")
             compiled_statistics.update(
                 {
                     "significant_strikes_landed": "0",
@@ -330,15 +840,29 @@ class UFCWebsiteScraper:
         :return: Dict containing athlete's compiled grappling statistics.
         """
 
+        grappling_accuracy_html = soup.find(class_="l-overlap-group__item--even")
+        full_width_html = (
+            None if grappling_accuracy_html else soup.find(class_="l-overlap-group__item--odd--full-width")
+        )
+
+        return self.parse_grappling_accuracy(grappling_accuracy_html, full_width_html)
+
+    def parse_grappling_accuracy(self, grappling_accuracy_html, full_width_html):
+        """
+        Parses the athlete's grappling accuracy detail card.
+
+        :param grappling_accuracy_html: Tag of the even detail card, or None if it does not exist
+        :param full_width_html: Tag of the full-width detail card used when there is only one card
+        :return: Dict containing athlete's compiled grappling statistics.
+        """
+
         # Initialize the dictionary
         compiled_statistics = dict()
 
         try:
-            grappling_accuracy_html = soup.find(class_="l-overlap-group__item--even")
-
             # Case when there is only one athlete detail card
             if not grappling_accuracy_html:
-                grappling_accuracy_html = soup.find(class_="l-overlap-group__item--odd--full-width")
+                grappling_accuracy_html = full_width_html
 
                 # If the athlete detail card is not for Grappling Accuracy, then it does not exist
                 grappling_accuracy_label_html = grappling_accuracy_html.find(class_="c-overlap--stats__title")
@@ -366,7 +890,8 @@ class UFCWebsiteScraper:
             compiled_statistics["takedown_accuracy"] = takedown_accuracy
 
         except AttributeError:
-            print("The Grappling Accuracy detail card does not exist")
+            logger.debug("The Grappling Accuracy detail card does not exist")
+            self.metrics.count_fallback("grappling_accuracy")
             compiled_statistics.update(
                 {
                     "takedowns_landed": "0",
@@ -386,12 +911,20 @@ class UFCWebsiteScraper:
         :return: Dict containing athlete's compiled fight statistics.
         """
 
+        return self.parse_fight_metrics(soup.find(class_="l-container__content--narrow stats-records__outer-container"))
+
+    def parse_fight_metrics(self, fight_metric_html):
+        """
+        Parses the athlete's fight metrics section.
+
+        :param fight_metric_html: Tag of the stats-records__outer-container section, or None if it does not exist
+        :return: Dict containing athlete's compiled fight statistics.
+        """
+
         # Initialize the dictionary
         compiled_statistics = dict()
 
         try:
-            fight_metric_html = soup.find(class_="l-container__content--narrow stats-records__outer-container")
-
             # Get all the rows of metrics that have 2 columns
             metric_rows = fight_metric_html.find_all(class_="c-stats-group-2col")
 
@@ -510,7 +1043,8 @@ class UFCWebsiteScraper:
                                 compiled_statistics[full_label] = stat
 
         except AttributeError:
-            print("Athlete does not have fight metrics.")
+            logger.debug("Athlete does not have fight metrics.")
+            self.metrics.count_fallback("fight_metrics")
             compiled_statistics.update(
                 {
                     "significant_strikes_landed_per_min": "0",
@@ -535,88 +1069,933 @@ class UFCWebsiteScraper:
 
         return compiled_statistics
 
-    def scrape_athelete_stats(self, athlete_name):
+    def find_athlete_page_sections(self, soup):
         """
-        Driver function to scrape, extract, and clean the
-        various athletes' statistics from their webpage,
+        Walks the athlete's webpage once and collects the first tag of every section the
+        extractors read, matching classes the same way soup.find(class_=...) does.
 
-        :param athlete_name: String containing the athlete's name
-        :return: Dict containing athlete's compiled fighter statistics
+        :param soup: BeautifulSoup object containing the html of the UFC athlete's webpage
+        :return: Dict mapping each class in ATHLETE_PAGE_SECTIONS to its Tag, or None if it does not exist
+        """
+
+        sections = dict.fromkeys(ATHLETE_PAGE_SECTIONS)
+        sections_left = len(sections)
+
+        for tag in soup.descendants:
+            if sections_left == 0:
+                break
+
+            if not isinstance(tag, bs4.element.Tag):
+                continue
+
+            css_classes = tag.get("class")
+
+            if not css_classes:
+                continue
+
+            full_class = " ".join(css_classes)
+
+            for section in ATHLETE_PAGE_SECTIONS:
+                if sections[section] is None and (section == full_class or section in css_classes):
+                    sections[section] = tag
+                    sections_left -= 1
+
+        return sections
+
+    def scrape_athlete_page(self, soup):
+        """
+        Single-pass extractor that locates every section of the athlete's webpage in one walk
+        of the document, then parses each section. Returns the same statistics as calling
+        each scrape_* extractor on the whole page.
+
+        :param soup: BeautifulSoup object containing the html of the UFC athlete's webpage
+        :return: Dict containing athlete's compiled fighter statistics, without their name
         """
 
-        print(f"Scraping fighter stats for {athlete_name}")
+        with self.metrics.time_stage("find_athlete_page_sections"):
+            sections = self.find_athlete_page_sections(soup)
+
+        headline_html = sections["c-hero__headline-suffix tz-change-inner"]
+        full_width_html = sections["l-overlap-group__item--odd--full-width"]
 
         athlete_statistics = dict()
-        athlete_statistics["name"] = athlete_name
 
-        # Get the html of the athlete's page on the UFC website
-        url = self.BASE_URL + athlete_name.lower().replace(" ", "-")
-        page = requests.get(url)
+        with self.metrics.time_stage("parse_athlete_nickname"):
+            athlete_statistics["nickname"] = self.parse_athlete_nickname(sections["field field-name-nickname"])
 
-        if page.status_code != 200:
-            print(f"{athlete_name} not found!")
+        with self.metrics.time_stage("parse_athlete_record"):
+            athlete_statistics["record"] = self.parse_athlete_record(headline_html)
 
-        html_content = page.text
-        soup = bs4.BeautifulSoup(html_content, "html.parser")
+        with self.metrics.time_stage("parse_athlete_ranking"):
+            athlete_statistics["ranking"] = self.parse_athlete_ranking(headline_html)
 
-        # Get the data from the html
-        athlete_statistics["nickname"] = self.scrape_athlete_nickname(soup)
-        athlete_statistics["record"] = self.scrape_athlete_record(soup)
-        athlete_statistics["ranking"] = self.scrape_athlete_ranking(soup)
-        athlete_statistics.update(self.scrape_athlete_biography(soup))
-        athlete_statistics.update(self.scrape_striking_accuracy(soup))
-        athlete_statistics.update(self.scrape_grappling_accuracy(soup))
-        athlete_statistics.update(self.scrape_fight_metrics(soup))
+        with self.metrics.time_stage("parse_athlete_biography"):
+            athlete_statistics.update(self.parse_athlete_biography(sections["c-bio__info-details"]))
+
+        with self.metrics.time_stage("parse_striking_accuracy"):
+            athlete_statistics.update(
+                self.parse_striking_accuracy(sections["l-overlap-group__item--odd"], full_width_html)
+            )
 
-        print(f"Successfully scraped fighter stats for {athlete_name}!")
+        with self.metrics.time_stage("parse_grappling_accuracy"):
+            athlete_statistics.update(
+                self.parse_grappling_accuracy(sections["l-overlap-group__item--even"], full_width_html)
+            )
+
+        with self.metrics.time_stage("parse_fight_metrics"):
+            athlete_statistics.update(
+                self.parse_fight_metrics(sections["l-container__content--narrow stats-records__outer-container"])
+            )
 
         return athlete_statistics
 
-    def scrape_athlete_stats_thread_worker(self, athlete_name, athlete_index, results):
+    def get_athlete_url(self, athlete_name, athlete_slug=None):
         """
-        Worker function for threaded scraping of athlete stats and preserving order.
+        Builds the URL of the athlete's page on the UFC website, from the athlete's slug when
+        it is known, from the slug index when the name is indexed and from the name otherwise.
 
         :param athlete_name: String containing the athlete's name
-        :param athlete_index: Index the athlete's data will be inserted into results
-        :param results: List of dictionaries containing athlete data
-        :return: None
+        :param athlete_slug: Optional string containing the slug of the athlete's page, e.g. "bruno-silva-0"
+        :return: URL of the athlete's webpage as a string
         """
 
-        athlete_stats = self.scrape_athelete_stats(athlete_name.strip())
-        results[athlete_index] = athlete_stats
+        return self.BASE_URL + self.get_athlete_slug(athlete_name, athlete_slug)
 
-    def threaded_scrape_athlete_stats(self, athlete_list):
+    def get_athlete_slug(self, athlete_name, athlete_slug=None):
         """
-        Uses threads to collect data from UFC website.
-
-        :param athlete_list: An ordered list of athletes to be scraped
-        :return: A list of dictionaries containing athlete data in order
+        :param athlete_name: String containing the athlete's name
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: The slug of the athlete's page, resolved from the slug index or guessed from the name when not given
         """
 
-        results = [{} for athlete in athlete_list]
-
-        num_athletes_to_be_scraped = len(athlete_list)
-        current_athlete_index = 0
+        return athlete_slug or self.slug_index.resolve(athlete_name) or make_slug(athlete_name)
 
-        while num_athletes_to_be_scraped > 0:
-            number_of_threads = min(50, num_athletes_to_be_scraped)
+    def extract_athlete_stats(self, athlete_name, html_content, url=None):
+        """
+        Extracts and cleans the various athletes' statistics from
+        the html of their webpage.
 
-            threads = []
+        :param athlete_name: String containing the athlete's name
+        :param html_content: String containing the html of the UFC athlete's webpage
+        :param url: Optional URL of the athlete's webpage, to keep the first page of their fight history
+                    from the same parse when the scraper scrapes fight histories
+        :return: Dict containing athlete's compiled fighter statistics
+        """
+
+        athlete_statistics = dict()
+        athlete_statistics["name"] = athlete_name
+        keep_fight_history = self.fight_history and url is not None
+
+        # Skip building the navigation, scripts and other regions the extractors never read
+        parse_only = None
+
+        if self.partial_parse:
+            parse_only = ATHLETE_HISTORY_PAGE_STRAINER if keep_fight_history else ATHLETE_PAGE_STRAINER
+
+        with self.metrics.time_stage("make_soup"):
+            soup = self.make_soup(html_content, parse_only=parse_only)
+
+        # Get the data from the html
+        athlete_statistics.update(self.scrape_athlete_page(soup))
+
+        if keep_fight_history:
+            self.keep_first_fight_history_page(url, athlete_name, soup)
+
+        return self.make_athlete_record(athlete_statistics)
+
+    def make_athlete_record(self, athlete_statistics):
+        """
+        :param athlete_statistics: Dict containing athlete's compiled fighter statistics
+        :return: The statistics as an AthleteRecord if the scraper keeps compact records, else the dict itself
+        """
+
+        if self.compact_records:
+            return AthleteRecord.from_dict(athlete_statistics)
+
+        return athlete_statistics
+
+    def fetch_athlete_page(self, url):
+        """
+        Fetches an athlete's webpage, retrying timeouts, connection errors and throttled
+        or server error responses according to the scraper's retry policy.
+
+        :param url: String containing the URL of the athlete's webpage
+        :return: requests.Response object
+        """
+
+        def attempt_fetch():
+            page = self.fetch_page(url)
+
+            # Throttled and server error pages hold no statistics
+            if page.status_code in THROTTLING_STATUS_CODES:
+                raise ThrottledResponseError(url, page.status_code, parse_retry_after(page.headers.get("Retry-After")))
+
+            return page
+
+        return self.retry_policy.call(attempt_fetch)
+
+    def get_missing_athlete_stats(self, athlete_name):
+        """
+        Builds the statistics of an athlete whose webpage does not exist, without parsing
+        the error page.
+
+        :param athlete_name: String containing the athlete's name
+        :return: Dict containing the athlete's name and empty statistics
+        """
+
+        logger.warning("%s not found!", athlete_name, extra={"athlete": athlete_name})
+        self.metrics.count_athlete_not_found()
+
+        athlete_statistics = {"name": athlete_name}
+        athlete_statistics.update(self.empty_athlete_statistics)
+
+        return self.make_athlete_record(athlete_statistics)
+
+    def get_missing_athlete_stats_template(self):
+        """
+        Parses an empty page into throwaway metrics, so the fallbacks and stage timings of a
+        page that does not exist stay out of this run's metrics. It swaps self.metrics, so it
+        is only called from the constructor, before any thread shares the scraper.
+
+        :return: Dict of the empty statistics the extractors fall back to, without the athlete's name
+        """
+
+        run_metrics = self.metrics
+        self.metrics = ScrapeMetrics()
+
+        try:
+            return self.scrape_athlete_page(self.make_soup(""))
+        finally:
+            self.metrics = run_metrics
+
+    def scrape_athelete_stats(self, athlete_name, athlete_slug=None):
+        """
+        Driver function to scrape, extract, and clean the
+        various athletes' statistics from their webpage,
+
+        :param athlete_name: String containing the athlete's name
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: Dict containing athlete's compiled fighter statistics
+        """
+
+        logger.debug("Scraping fighter stats for %s", athlete_name, extra={"athlete": athlete_name})
+
+        # Get the html of the athlete's page on the UFC website
+        url = self.get_athlete_url(athlete_name, athlete_slug)
+        page = self.fetch_athlete_page(url)
+
+        if page.status_code != 200:
+            self.keep_first_fight_history_page(url, athlete_name)
+            return self.get_missing_athlete_stats(athlete_name)
+
+        athlete_statistics = self.get_unchanged_athlete_stats(athlete_name, page.text)
+
+        if athlete_statistics is None:
+            athlete_statistics = self.extract_athlete_stats(athlete_name, page.text, url)
+
+        logger.debug("Successfully scraped fighter stats for %s!", athlete_name, extra={"athlete": athlete_name})
+
+        return athlete_statistics
+
+    def scrape_athlete_stats_thread_worker(self, athlete, athlete_index, results, queued_at=None):
+        """
+        Worker function for threaded scraping of athlete stats and preserving order.
+
+        :param athlete: String containing the athlete's name, or an Athlete tuple of their name and slug
+        :param athlete_index: Index the athlete's data will be inserted into results
+        :param results: List of dictionaries containing athlete data
+        :param queued_at: Optional time.perf_counter() timestamp of when the athlete was queued
+        :return: None
+        """
+
+        if queued_at is not None:
+            self.metrics.observe_queue_wait(time.perf_counter() - queued_at)
+
+        with self.progress.track():
+            athlete_stats = self.scrape_athelete_stats(*as_athlete(athlete))
+
+        results[athlete_index] = athlete_stats
+
+    def threaded_scrape_athlete_stats(self, athlete_list):
+        """
+        Uses a bounded pool of worker threads to collect data from UFC website. As soon as
+        a worker finishes an athlete it picks up the next one, so a single slow page only
+        ever occupies one slot.
+
+        :param athlete_list: An ordered list of athletes to be scraped, each either a name or an Athlete tuple of
+                             their name and the slug of their page
+        :return: A list of dictionaries containing athlete data in order
+        """
+
+        results = [{} for athlete in athlete_list]
+
+        if not athlete_list:
+            return results
+
+        number_of_workers = max(1, min(self.max_workers, len(athlete_list)))
+        self.progress = ProgressReporter(len(athlete_list), self.progress_interval)
+
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.scrape_athlete_stats_thread_worker, athlete, athlete_index, results, time.perf_counter()
+                ): athlete_index
+                for athlete_index, athlete in enumerate(athlete_list)
+            }
+
+        failures = {
+            athlete_index: future.exception() for future, athlete_index in futures.items() if future.exception()
+        }
+
+        self.progress.report()
+        self.requeue_failed_athletes(athlete_list, results, failures)
+
+        return results
+
+    def requeue_failed_athletes(self, athlete_list, results, failures):
+        """
+        Gives the athletes that failed during the run one more attempt each, one at a
+        time once the rest of the run is done, and records those that fail again in
+        failed_athletes.
+
+        :param athlete_list: An ordered list of athletes that were scraped
+        :param results: A list of dictionaries containing athlete data in order, updated in place
+        :param failures: Dict mapping the index of each failed athlete to the error it failed with
+        :return: Dict mapping the name of each athlete that failed again to a description of the error
+        """
+
+        self.failed_athletes = dict()
+
+        if failures:
+            logger.info("Requeueing %s athletes that failed", len(failures))
+
+        for athlete_index, error in sorted(failures.items()):
+            athlete_name, athlete_slug = as_athlete(athlete_list[athlete_index])
+            results[athlete_index] = self.requeue_athlete(athlete_name, error, athlete_slug)
+
+        return self.failed_athletes
+
+    def requeue_athlete(self, athlete_name, error, athlete_slug=None):
+        """
+        Scrapes an athlete that failed once more, recording them in failed_athletes if they fail again.
+
+        :param athlete_name: String containing the athlete's name
+        :param error: Exception the athlete failed with
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: Dict containing athlete's compiled fighter statistics, empty if they failed again
+        """
+
+        logger.warning(
+            "Failed to scrape fighter stats for %s, requeueing: %r",
+            athlete_name,
+            error,
+            extra={"athlete": athlete_name},
+        )
+
+        try:
+            return self.scrape_athelete_stats(athlete_name, athlete_slug)
+
+        except Exception as requeue_error:
+            # A failed athlete leaves an empty dict in its slot, report why
+            logger.error(
+                "Failed to scrape fighter stats for %s: %r",
+                athlete_name,
+                requeue_error,
+                extra={"athlete": athlete_name},
+            )
+            self.failed_athletes[athlete_name] = repr(requeue_error)
+
+            return {}
+
+    def iter_scrape_athlete_stats(self, athlete_list):
+        """
+        Streaming counterpart of threaded_scrape_athlete_stats() that yields each athlete
+        as soon as they are scraped, so the caller can write them out instead of holding
+        the whole run in memory. Only a bounded window of athletes is in flight at a time,
+        and the athletes that failed are requeued once the rest are done.
+
+        :param athlete_list: An ordered list, or any iterable such as a generator, of athletes to be scraped, each
+                             either a name or an Athlete tuple of their name and slug
+        :return: Generator of (index in athlete_list, athlete, dict containing athlete data) tuples in completion order
+        """
+
+        self.failed_athletes = dict()
+
+        # Athletes streamed from a generator are only counted as they are discovered
+        number_of_athletes = len(athlete_list) if isinstance(athlete_list, Sized) else None
+
+        if number_of_athletes == 0:
+            return
+
+        number_of_workers = max(1, min(self.max_workers, number_of_athletes or self.max_workers))
+        self.progress = ProgressReporter(number_of_athletes or 0, self.progress_interval)
+        failures = dict()
+
+        def scrape_athlete(athlete, queued_at):
+            self.metrics.observe_queue_wait(time.perf_counter() - queued_at)
+
+            with self.progress.track():
+                return self.scrape_athelete_stats(*as_athlete(athlete))
+
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            athlete_queue = enumerate(athlete_list)
+            pending = dict()
+
+            while True:
+                # Keep the workers busy without queueing the whole athlete list at once
+                for athlete_index, athlete in athlete_queue:
+                    if number_of_athletes is None:
+                        self.progress.add()
+
+                    future = executor.submit(scrape_athlete, athlete, time.perf_counter())
+                    pending[future] = athlete_index, athlete
+
+                    if len(pending) >= 2 * number_of_workers:
+                        break
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    athlete_index, athlete = pending.pop(future)
+
+                    if future.exception() is not None:
+                        failures[athlete_index] = athlete, future.exception()
+                    else:
+                        yield athlete_index, athlete, future.result()
+
+        self.progress.report()
+
+        if failures:
+            logger.info("Requeueing %s athletes that failed", len(failures))
+
+        for athlete_index, (athlete, error) in sorted(failures.items()):
+            athlete_name, athlete_slug = as_athlete(athlete)
+            yield athlete_index, athlete, self.requeue_athlete(athlete_name, error, athlete_slug)
+
+    def fetch_directory_page(self, page_number):
+        """
+        Fetches and parses one page of the UFC athletes directory.
+
+        :param page_number: Number of the page, starting at 0
+        :return: Tuple of the page's list of (name, slug) tuples and whether there is a next page
+        """
+
+        page = self.fetch_athlete_page(f"{self.ATHLETES_DIRECTORY_URL}?page={page_number}")
+
+        # Pages past the end of the directory do not exist
+        if page.status_code != 200:
+            return [], False
+
+        soup = self.make_soup(page.text)
+
+        return parse_athletes_directory(soup), has_next_page(soup)
+
+    def iter_directory_athletes(self, max_pages=None, prefetch_pages=2):
+        """
+        Walks the UFC athletes directory page by page, yielding each athlete as soon as
+        their page is parsed. The next prefetch_pages pages are fetched while the
+        athletes of the current one are being scraped. Each athlete is yielded with the
+        slug of the page the directory links to, and the slug is added to the slug index
+        for later runs. A directory page that still fails after its retries ends the walk
+        and is recorded in failed_athletes, keeping the athletes found so far.
+
+        :param max_pages: Optional maximum number of directory pages to walk
+        :param prefetch_pages: Number of directory pages fetched ahead of the one being consumed
+        :return: Generator of Athlete tuples of the athletes' names and slugs, each athlete once, in directory order
+        """
+
+        self.current_roster = []
+        seen_slugs = set()
+
+        with ThreadPoolExecutor(max_workers=prefetch_pages) as executor:
+            page_futures = deque()
+            next_page_number = 0
+
+            while True:
+                # Keep the next pages in flight, stopping at max_pages
+                while len(page_futures) < prefetch_pages and (max_pages is None or next_page_number < max_pages):
+                    page_futures.append(
+                        (next_page_number, executor.submit(self.fetch_directory_page, next_page_number))
+                    )
+                    next_page_number += 1
+
+                if not page_futures:
+                    break
+
+                page_number, page_future = page_futures.popleft()
+
+                try:
+                    athletes, next_page_exists = page_future.result()
+
+                except Exception as error:
+                    # Scrape the athletes found so far instead of failing the whole run
+                    page_url = f"{self.ATHLETES_DIRECTORY_URL}?page={page_number}"
+                    logger.error("Failed to fetch %s, stopping the crawl: %r", page_url, error)
+                    self.failed_athletes[page_url] = repr(error)
+                    break
+
+                for athlete_name, slug in athletes:
+                    # The listing can shift while it is walked, listing an athlete on two pages
+                    if slug in seen_slugs:
+                        continue
+
+                    seen_slugs.add(slug)
+                    self.slug_index.add(athlete_name, slug)
+                    athlete = Athlete(athlete_name, slug)
+                    self.current_roster.append(athlete)
+
+                    yield athlete
+
+                if not athletes or not next_page_exists:
+                    break
+
+            # Pages fetched past the end of the directory are not needed
+            for _, page_future in page_futures:
+                page_future.cancel()
 
-            for _ in range(number_of_threads):
-                athlete_name = athlete_list[current_athlete_index]
-                t = threading.Thread(
-                    target=self.scrape_athlete_stats_thread_worker,
-                    args=(athlete_name, current_athlete_index, results),
+        logger.info("Found %s athletes in the athletes directory", len(self.current_roster))
+
+    def crawl_athlete_stats(self, max_pages=None):
+        """
+        Scrapes the whole roster of the UFC athletes directory, streaming the athletes of
+        each directory page into the scrape workers instead of collecting the roster first.
+
+        :param max_pages: Optional maximum number of directory pages to walk
+        :return: A list of dictionaries containing athlete data, in the order of current_roster
+        """
+
+        results = []
+
+        for athlete_index, _, athlete_statistics in self.iter_scrape_athlete_stats(
+            self.iter_directory_athletes(max_pages)
+        ):
+            if athlete_index >= len(results):
+                results.extend({} for _ in range(athlete_index + 1 - len(results)))
+
+            results[athlete_index] = athlete_statistics
+
+        return results
+
+    def fetch_fight_history_page(self, url, athlete_name, athlete_slug, page_number):
+        """
+        Fetches and parses one of the "load more" pages of an athlete's fight history.
+
+        :param url: String containing the URL of the athlete's webpage
+        :param athlete_name: String containing the athlete's name
+        :param athlete_slug: String containing the slug of the athlete's page
+        :param page_number: Number of the page, the athlete's webpage itself being page 0
+        :return: Tuple of the page's list of fights and whether there is a next page
+        """
+
+        page = self.fetch_athlete_page(f"{url}?page={page_number}")
+
+        # Pages past the end of the record do not exist
+        if page.status_code != 200:
+            return [], False
+
+        soup = self.make_soup(page.text)
+
+        return parse_fight_history(soup, athlete_name, athlete_slug), has_next_page(soup)
+
+    def parse_first_fight_history_page(self, url, athlete_name, soup):
+        """
+        Parses the fights listed on the athlete's webpage itself, the first page of their fight history.
+
+        :param url: String containing the URL of the athlete's webpage
+        :param athlete_name: String containing the athlete's name
+        :param soup: BeautifulSoup object containing html of the UFC athlete's webpage
+        :return: Tuple of the page's list of fights, whether there is a next page and the athlete's record
+        """
+
+        athlete_slug = url.rstrip("/").rsplit("/", 1)[-1]
+
+        return (
+            parse_fight_history(soup, athlete_name, athlete_slug),
+            has_next_page(soup),
+            self.scrape_athlete_record(soup),
+        )
+
+    def keep_first_fight_history_page(self, url, athlete_name, soup=None):
+        """
+        Keeps the first page of the athlete's fight history, parsed from the soup their statistics
+        are extracted from, when the scraper scrapes fight histories, so scrape_fight_history()
+        neither downloads nor parses the webpage a second time. Unchanged pages reuse the previous
+        run's statistics without a soup, so their history is left for scrape_fight_history().
+
+        :param url: String containing the URL of the athlete's webpage
+        :param athlete_name: String containing the athlete's name
+        :param soup: BeautifulSoup object containing html of the UFC athlete's webpage, or None if it does not exist
+        :return: None
+        """
+
+        if not self.fight_history:
+            return
+
+        if soup is None:
+            self.first_fight_history_pages[url] = [], False, ""
+        else:
+            self.first_fight_history_pages[url] = self.parse_first_fight_history_page(url, athlete_name, soup)
+
+    def scrape_fight_history(self, athlete_name, athlete_slug=None):
+        """
+        Scrapes every fight of an athlete's record. The pages after the first are fetched
+        in parallel windows of at most history_concurrency pages, until a page without a
+        next one. The record also counts fights outside the UFC, so the number of pages
+        estimated from it only ever shrinks the first window.
+
+        :param athlete_name: String containing the athlete's name
+        :param athlete_slug: Optional string containing the slug of the athlete's page
+        :return: List of dicts with the fields of each fight, most recent first
+        """
+
+        url = self.get_athlete_url(athlete_name, athlete_slug)
+        athlete_slug = url.rstrip("/").rsplit("/", 1)[-1]
+
+        # The first page is the athlete's webpage, usually already fetched for their statistics
+        first_page = self.first_fight_history_pages.pop(url, None)
+
+        if first_page is None:
+            page = self.fetch_athlete_page(url)
+
+            if page.status_code != 200:
+                return []
+
+            first_page = self.parse_first_fight_history_page(url, athlete_name, self.make_soup(page.text))
+
+        fights, next_page_exists, record = first_page
+
+        if not fights or not next_page_exists:
+            return fights
+
+        number_of_pages = estimate_fight_history_pages(record, len(fights))
+        page_number = 1
+        window_size = self.history_concurrency
+
+        if number_of_pages and number_of_pages > 1:
+            window_size = min(number_of_pages - 1, self.history_concurrency)
+
+        with ThreadPoolExecutor(max_workers=self.history_concurrency) as executor:
+            while True:
+                page_futures = [
+                    executor.submit(self.fetch_fight_history_page, url, athlete_name, athlete_slug, number)
+                    for number in range(page_number, page_number + window_size)
+                ]
+                last_page_reached = False
+
+                # Pages are read in order, anything past the last page is cancelled or dropped
+                for page_future in page_futures:
+                    if last_page_reached:
+                        page_future.cancel()
+                        continue
+
+                    page_fights, next_page_exists = page_future.result()
+                    fights.extend(page_fights)
+                    last_page_reached = not page_fights or not next_page_exists
+
+                if last_page_reached:
+                    break
+
+                page_number += window_size
+                window_size = self.history_concurrency
+
+        return fights
+
+    def scrape_fight_histories(self, athlete_list):
+        """
+        Scrapes the fight history of each athlete with a pool of threads into one long
+        table. Athletes whose history fails to scrape are logged and left out.
+
+        :param athlete_list: An ordered list of athletes
+        :return: List of dicts with the fields of each fight, grouped by athlete in the order of athlete_list
+        """
+
+        def scrape_athlete_fights(athlete):
+            athlete_name, athlete_slug = as_athlete(athlete)
+
+            try:
+                return self.scrape_fight_history(athlete_name, athlete_slug)
+
+            except Exception as error:
+                logger.error(
+                    "Failed to scrape the fight history of %s: %r", athlete_name, error, extra={"athlete": athlete_name}
+                )
+                return []
+
+        if not athlete_list:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(athlete_list)))) as executor:
+            histories = list(executor.map(scrape_athlete_fights, athlete_list))
+
+        return [fight for fights in histories for fight in fights]
+
+    def get_athlete_columns(self):
+        """
+        :return: Ordered list of the fields of an athlete's compiled fighter statistics
+        """
+
+        return list(ATHLETE_FIELDS)
+
+    async def async_fetch_page(self, session, semaphore, url):
+        """
+        Coroutine counterpart of fetch_page() that downloads a page on the event loop,
+        sharing the scraper's response cache, recorder and replay archive.
+
+        :param session: aiohttp.ClientSession shared by all coroutines
+        :param semaphore: asyncio.Semaphore capping the number of in-flight requests
+        :param url: String containing the URL to fetch
+        :return: Tuple of the HTTP status code, the html of the page as a string and the seconds of
+                 its Retry-After header, or None when it has none
+        """
+
+        start = time.perf_counter()
+        retry_after = None
+
+        if self.replayer is not None:
+            page = self.replayer.get_response(url)
+            self.metrics.observe_fetch(time.perf_counter() - start, page.status_code, len(page.content))
+            return page.status_code, page.text, parse_retry_after(page.headers.get("Retry-After"))
+
+        entry = self.cache.get(url) if self.cache is not None else None
+
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            self.metrics.count_cache_hit("fresh")
+            status_code, content, encoding = entry.status_code, entry.content, entry.encoding
+
+        else:
+            headers = entry.conditional_headers() if entry is not None else {}
+
+            async with semaphore:
+                if self.throttle is not None:
+                    await self.throttle.async_acquire()
+
+                # Time spent waiting for a free slot under the concurrency cap
+                self.metrics.observe_queue_wait(time.perf_counter() - start)
+                start = time.perf_counter()
+                status_code = None
+
+                try:
+                    async with session.get(url, headers=headers) as page:
+                        status_code, content = page.status, await page.read()
+                        retry_after = parse_retry_after(page.headers.get("Retry-After"))
+                        self.metrics.observe_fetch(time.perf_counter() - start, status_code, len(content))
+
+                        if page.status == 304 and entry is not None:
+                            self.metrics.count_cache_hit("revalidated")
+                            entry = self.cache.refresh(entry)
+                            status_code, content, encoding = entry.status_code, entry.content, entry.encoding
+
+                        else:
+                            encoding = page.get_encoding()
+
+                            if page.status == 200 and self.cache is not None:
+                                self.cache.store(url, page.status, page.headers, content, encoding)
+
+                finally:
+                    if self.throttle is not None:
+                        self.throttle.release(time.perf_counter() - start, status_code)
+
+        if self.recorder is not None:
+            self.recorder.record(url, status_code, content, encoding)
+
+        return status_code, content.decode(encoding or "utf-8", errors="replace"), retry_after
+
+    async def async_fetch_athlete_page(self, session, semaphore, url):
+        """
+        Coroutine counterpart of fetch_athlete_page() that retries transient failures on the event loop.
+
+        :param session: aiohttp.ClientSession shared by all coroutines
+        :param semaphore: asyncio.Semaphore capping the number of in-flight requests
+        :param url: String containing the URL of the athlete's webpage
+        :return: Tuple of the HTTP status code and the html of the page as a string
+        """
+
+        async def attempt_fetch():
+            status_code, html_content, retry_after = await self.async_fetch_page(session, semaphore, url)
+
+            # Throttled and server error pages hold no statistics
+            if status_code in THROTTLING_STATUS_CODES:
+                raise ThrottledResponseError(url, status_code, retry_after)
+
+            return status_code, html_content
+
+        return await self.retry_policy.async_call(attempt_fetch)
+
+    async def async_scrape_athlete_stats_worker(self, session, semaphore, athlete):
+        """
+        Coroutine that fetches a single athlete's webpage on the event loop and
+        extracts their statistics.
+
+        :param session: aiohttp.ClientSession shared by all coroutines
+        :param semaphore: asyncio.Semaphore capping the number of in-flight requests
+        :param athlete: String containing the athlete's name, or an Athlete tuple of their name and slug
+        :return: Dict containing athlete's compiled fighter statistics
+        """
+
+        athlete_name, athlete_slug = as_athlete(athlete)
+        logger.debug("Scraping fighter stats for %s", athlete_name, extra={"athlete": athlete_name})
+
+        with self.progress.track():
+            url = self.get_athlete_url(athlete_name, athlete_slug)
+            status_code, html_content = await self.async_fetch_athlete_page(session, semaphore, url)
+
+            if status_code != 200:
+                self.keep_first_fight_history_page(url, athlete_name)
+                return self.get_missing_athlete_stats(athlete_name)
+
+            athlete_statistics = self.get_unchanged_athlete_stats(athlete_name, html_content)
+
+            if athlete_statistics is None:
+                athlete_statistics = self.extract_athlete_stats(athlete_name, html_content, url)
+
+        logger.debug("Successfully scraped fighter stats for %s!", athlete_name, extra={"athlete": athlete_name})
+
+        return athlete_statistics
+
+    async def async_scrape_athlete_stats(self, athlete_list, max_concurrency=None):
+        """
+        Uses a single asyncio event loop to collect data from UFC website, with a
+        semaphore capping the number of requests in flight.
+
+        :param athlete_list: An ordered list of athletes to be scraped
+        :param max_concurrency: Maximum number of in-flight requests, defaults to max_workers
+        :return: A list of dictionaries containing athlete data in order
+        """
+
+        # aiohttp is only needed by the async engine
+        import aiohttp
+
+        max_concurrency = max_concurrency or self.max_workers
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        if self.throttle is not None:
+            self.throttle.cap_limit(max_concurrency)
+
+        self.progress = ProgressReporter(len(athlete_list), self.progress_interval)
+
+        if isinstance(self.timeout, tuple):
+            connect_timeout, read_timeout = self.timeout
+        else:
+            connect_timeout = read_timeout = self.timeout
+
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        connector = aiohttp.TCPConnector(limit=max_concurrency)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            tasks = [self.async_scrape_athlete_stats_worker(session, semaphore, athlete) for athlete in athlete_list]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        failures = dict()
+
+        for athlete_index, athlete_statistics in enumerate(results):
+            if isinstance(athlete_statistics, Exception):
+                failures[athlete_index] = athlete_statistics
+                results[athlete_index] = {}
+
+        self.progress.report()
+
+        # The requeue pass uses the blocking fetch path, keep it off the event loop
+        await asyncio.to_thread(self.requeue_failed_athletes, athlete_list, results, failures)
+
+        return results
+
+    def run_async_scrape_athlete_stats(self, athlete_list, max_concurrency=None):
+        """
+        Synchronous entry point for async_scrape_athlete_stats().
+
+        :param athlete_list: An ordered list of athletes to be scraped
+        :param max_concurrency: Maximum number of in-flight requests, defaults to max_workers
+        :return: A list of dictionaries containing athlete data in order
+        """
+
+        return asyncio.run(self.async_scrape_athlete_stats(athlete_list, max_concurrency))
+
+    def pipelined_scrape_athlete_stats(self, athlete_list, parse_workers=None):
+        """
+        Collects data from UFC website with I/O threads fetching the raw html of each
+        athlete's webpage and a pool of processes parsing it, so parsing is not held
+        to a single core by the GIL.
+
+        :param athlete_list: An ordered list of athletes to be scraped
+        :param parse_workers: Number of parsing processes, defaults to the number of CPUs
+        :return: A list of dictionaries containing athlete data in order
+        """
+
+        results = [{} for athlete in athlete_list]
+
+        if not athlete_list:
+            return results
+
+        number_of_workers = max(1, min(self.max_workers, len(athlete_list)))
+        self.progress = ProgressReporter(len(athlete_list), self.progress_interval)
+        failures = dict()
+
+        with ProcessPoolExecutor(
+            max_workers=parse_workers, mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+        ) as process_pool:
+
+            def fetch_and_submit(athlete, queued_at):
+                self.metrics.observe_queue_wait(time.perf_counter() - queued_at)
+                self.progress.start()
+                athlete_name, athlete_slug = as_athlete(athlete)
+                logger.debug("Scraping fighter stats for %s", athlete_name, extra={"athlete": athlete_name})
+
+                url = self.get_athlete_url(athlete_name, athlete_slug)
+                page = self.fetch_athlete_page(url)
+
+                # Missing and unchanged athletes need no parsing
+                if page.status_code != 200:
+                    self.keep_first_fight_history_page(url, athlete_name)
+                    ready_statistics = self.get_missing_athlete_stats(athlete_name)
+                else:
+                    ready_statistics = self.get_unchanged_athlete_stats(athlete_name, page.text)
+
+                if ready_statistics is not None:
+                    ready_future = Future()
+                    ready_future.set_result((ready_statistics, None, {}))
+                    return ready_future
+
+                # Hand the html straight to a parsing process and free this thread up, the process also
+                # parses the first page of the fight history from the same soup
+                return process_pool.submit(
+                    extract_athlete_stats_in_process,
+                    athlete_name,
+                    page.text,
+                    self.parser_backend,
+                    self.partial_parse,
+                    url if self.fight_history else None,
                 )
-                t.daemon = True
-                t.start()
-                threads.append(t)
-                current_athlete_index += 1
 
-            for t in threads:
-                t.join()
+            with ThreadPoolExecutor(max_workers=number_of_workers) as thread_pool:
+                fetch_futures = [
+                    thread_pool.submit(fetch_and_submit, athlete, time.perf_counter()) for athlete in athlete_list
+                ]
+
+                for athlete_index, fetch_future in enumerate(fetch_futures):
+                    athlete_name = as_athlete(athlete_list[athlete_index]).name
+
+                    try:
+                        athlete_statistics, process_metrics, first_fight_history_pages = fetch_future.result().result()
+                        results[athlete_index] = self.make_athlete_record(athlete_statistics)
+                        self.first_fight_history_pages.update(first_fight_history_pages)
+
+                        # Fold the parsing process' timings and fallbacks into this run's metrics
+                        if process_metrics is not None:
+                            self.metrics.merge(process_metrics)
+
+                        logger.debug(
+                            "Successfully scraped fighter stats for %s!", athlete_name, extra={"athlete": athlete_name}
+                        )
+                        self.progress.finish()
+
+                    except Exception as error:
+                        failures[athlete_index] = error
+                        self.progress.finish(succeeded=False)
 
-            num_athletes_to_be_scraped -= number_of_threads
+        self.progress.report()
+        self.requeue_failed_athletes(athlete_list, results, failures)
 
         return results
@@ -0,0 +1,136 @@
+import abc
+import csv
+import json
+import logging
+
+import xlsxwriter
+
+logger = logging.getLogger(__name__)
+
+
+class AthleteRecordWriter(abc.ABC):
+    # Writers that keep every field, rather than only the columns, set this
+    keeps_unknown_fields = False
+
+    def __init__(self, filepath, columns):
+        """
+        Appends athlete records to an output file as they are scraped, so the run never
+        holds every record in memory and the rows written so far survive a crash.
+
+        :param filepath: Filepath of the output file to create
+        :param columns: Ordered list of the columns written for each record
+        """
+
+        self.filepath = filepath
+        self.columns = list(columns)
+        self.known_columns = set(columns)
+        self.records_written = 0
+
+    def write(self, athlete_statistics):
+        """
+        :param athlete_statistics: Dict containing an athlete's compiled fighter statistics
+        :return: None
+        """
+
+        # Columns are fixed once the header is written, report any field that does not fit
+        unknown_columns = [] if self.keeps_unknown_fields else athlete_statistics
+
+        for column in unknown_columns:
+            if column not in self.known_columns:
+                logger.warning("Dropping the %s field, which is not one of the output's columns", column)
+                self.known_columns.add(column)
+
+        self.write_row([athlete_statistics.get(column, "") for column in self.columns], athlete_statistics)
+        self.records_written += 1
+
+    @abc.abstractmethod
+    def write_row(self, row, athlete_statistics):
+        """
+        :param row: List of the record's values in column order
+        :param athlete_statistics: Dict containing an athlete's compiled fighter statistics
+        :return: None
+        """
+
+    def close(self):
+        """
+        :return: Filepath of the output file as a string
+        """
+
+        return self.filepath
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvRecordWriter(AthleteRecordWriter):
+    def __init__(self, filepath, columns):
+        super().__init__(filepath, columns)
+
+        # Line buffered, so every row is on disk as soon as it is written
+        self.file = open(filepath, "w", newline="", buffering=1)
+        self.csv_writer = csv.writer(self.file)
+        self.csv_writer.writerow(self.columns)
+
+    def write_row(self, row, athlete_statistics):
+        self.csv_writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+        return self.filepath
+
+
+class JsonlRecordWriter(AthleteRecordWriter):
+    keeps_unknown_fields = True
+
+    def __init__(self, filepath, columns):
+        super().__init__(filepath, columns)
+
+        # Every field is kept, columns only sets the order of the known ones
+        self.file = open(filepath, "w", buffering=1)
+
+    def write_row(self, row, athlete_statistics):
+        ordered_statistics = {
+            column: athlete_statistics[column] for column in self.columns if column in athlete_statistics
+        }
+        ordered_statistics.update(athlete_statistics)
+
+        self.file.write(json.dumps(ordered_statistics) + "\n")
+
+    def close(self):
+        self.file.close()
+        return self.filepath
+
+
+class ExcelRecordWriter(AthleteRecordWriter):
+    def __init__(self, filepath, columns):
+        """
+        Writes rows with xlsxwriter's constant memory mode, which flushes each row to a
+        temporary file as soon as the next one starts. The workbook itself is only
+        assembled on close(), so unlike the CSV and JSONL writers a crash loses it.
+
+        :param filepath: Filepath of the .xlsx file to create
+        :param columns: Ordered list of the columns written for each record
+        """
+
+        super().__init__(filepath, columns)
+
+        self.workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+        self.worksheet = self.workbook.add_worksheet()
+        self.worksheet.write_row(0, 0, self.columns)
+
+    def write_row(self, row, athlete_statistics):
+        self.worksheet.write_row(self.records_written + 1, 0, row)
+
+    def close(self):
+        self.workbook.close()
+        return self.filepath
+
+
+RECORD_WRITERS = {
+    "csv": CsvRecordWriter,
+    "jsonl": JsonlRecordWriter,
+    "xlsx": ExcelRecordWriter,
+}
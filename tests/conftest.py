@@ -0,0 +1,117 @@
+import hashlib
+import http.server
+import os
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+
+from src.scraper.corpus import PageRecorder
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(*path):
+    """
+    Helper function to read a saved html fixture.
+
+    :param path: Path components of the fixture relative to tests/fixtures
+    :return: Str of the fixture's contents
+    """
+
+    with open(os.path.join(FIXTURES_DIRECTORY, *path), encoding="utf-8") as file:
+        return file.read()
+
+
+def build_fixture_corpus(archive_path):
+    """
+    Records the saved html fixtures into a replay archive, as if they had been scraped from ufc.com.
+
+    :param archive_path: Filepath of the .zip archive to create
+    :return: Filepath of the .zip archive as a string
+    """
+
+    with PageRecorder(archive_path) as recorder:
+        recorder.record("https://www.ufc.com/rankings", 200, read_fixture("rankings.html").encode("utf-8"), "utf-8")
+
+        for filename in sorted(os.listdir(os.path.join(FIXTURES_DIRECTORY, "athletes"))):
+            url = "https://www.ufc.com/athlete/" + filename[: -len(".html")]
+            recorder.record(url, 200, read_fixture("athletes", filename).encode("utf-8"), "utf-8")
+
+        # The real website answers unknown athletes with a not found page
+        not_found_content = read_fixture("not-found.html").encode("utf-8")
+        recorder.record("https://www.ufc.com/athlete/andrew-ghorbani", 404, not_found_content, "utf-8")
+
+    return archive_path
+
+
+class FixturePageHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the saved rankings and athlete pages the way ufc.com lays them out."""
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        path = path.rstrip("/")
+
+        if path == "/rankings":
+            fixture_path = ("rankings.html",)
+        elif path == "/athletes/all":
+            page_number = parse_qs(query).get("page", ["0"])[0]
+            fixture_path = ("athletes-directory", f"page-{page_number}.html")
+        elif parse_qs(query).get("page", ["0"])[0] != "0":
+            # The "load more" pages of an athlete's fight history
+            page_number = parse_qs(query)["page"][0]
+            fixture_path = ("fight-history", f"{path.rsplit('/', 1)[-1]}-page-{page_number}.html")
+        else:
+            fixture_path = ("athletes", path.rsplit("/", 1)[-1] + ".html")
+
+        if os.path.exists(os.path.join(FIXTURES_DIRECTORY, *fixture_path)):
+            status, body = 200, read_fixture(*fixture_path)
+        else:
+            status, body = 404, read_fixture("not-found.html")
+
+        body = body.encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        # Answer revalidation requests for unchanged pages without a body
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+
+        self.server.request_log.append((path, status))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixturePageHandler)
+        self.request_log = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def fixture_server():
+    """
+    Runs a local stand-in for ufc.com serving the saved html fixtures.
+
+    :return: FixtureServer object, with the base URL in url and every (path, status) served in request_log
+    """
+
+    server = FixtureServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,95 @@
+import os
+import time
+
+from src.scraper.cache import ResponseCache
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import read_fixture
+
+
+def test_cached_page_is_revalidated_with_etag(fixture_server, tmp_path):
+    """Tests that a stale cached page is revalidated and an unchanged page comes back as a 304."""
+
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cached_scraper = UFCWebsiteScraper(max_workers=1, cache=cache)
+    url = fixture_server.url + "/athlete/jon-jones"
+
+    first_page = cached_scraper.fetch_page(url)
+    second_page = cached_scraper.fetch_page(url)
+
+    assert [status for _, status in fixture_server.request_log] == [200, 304]
+    assert first_page.status_code == second_page.status_code == 200
+    assert second_page.text == first_page.text == read_fixture("athletes", "jon-jones.html")
+
+    # The metrics count the 304 as it came over the wire, without the cached body
+    snapshot = cached_scraper.metrics.to_dict()
+    assert snapshot["http_status_counts"] == {"200": 1, "304": 1}
+    assert snapshot["bytes_downloaded"] == len(first_page.content)
+    assert snapshot["cache_hits"] == {"revalidated": 1}
+
+
+def test_fresh_cached_page_skips_the_request(fixture_server, tmp_path):
+    """Tests that a page younger than the TTL is served from disk without any request."""
+
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    cached_scraper = UFCWebsiteScraper(max_workers=1, cache=cache)
+    url = fixture_server.url + "/athlete/jon-jones"
+
+    cached_scraper.fetch_page(url)
+    page = cached_scraper.fetch_page(url)
+
+    assert len(fixture_server.request_log) == 1
+    assert page.text == read_fixture("athletes", "jon-jones.html")
+
+    # A page served from disk is a cache hit, not a fetch
+    snapshot = cached_scraper.metrics.to_dict()
+    assert snapshot["fetch_latency_seconds"]["count"] == 1
+    assert snapshot["http_status_counts"] == {"200": 1}
+    assert snapshot["cache_hits"] == {"fresh": 1}
+
+
+def test_not_found_page_is_not_cached(fixture_server, tmp_path):
+    """Tests that only successful responses are written to the cache."""
+
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    cached_scraper = UFCWebsiteScraper(max_workers=1, cache=cache)
+
+    cached_scraper.fetch_page(fixture_server.url + "/athlete/andrew-ghorbani")
+
+    assert cache.get(fixture_server.url + "/athlete/andrew-ghorbani") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Tests that the cache evicts the least recently used bodies once it exceeds its size bound."""
+
+    cache = ResponseCache(str(tmp_path), max_size_bytes=250)
+
+    for index in range(3):
+        cache.store(f"https://www.ufc.com/athlete/{index}", 200, {"ETag": f'"{index}"'}, b"x" * 100, "utf-8")
+
+        # Give each entry a distinct access time
+        _, body_path = cache.get_paths(f"https://www.ufc.com/athlete/{index}")
+        os.utime(body_path, (time.time() - 10 + index, time.time() - 10 + index))
+
+    cache.store("https://www.ufc.com/athlete/3", 200, {}, b"x" * 100, "utf-8")
+
+    assert cache.get("https://www.ufc.com/athlete/0") is None
+    assert cache.get("https://www.ufc.com/athlete/1") is None
+    assert cache.get("https://www.ufc.com/athlete/3") is not None
+    assert cache.total_size <= 250
+
+
+def test_async_engine_revalidates_cached_pages(fixture_server, tmp_path):
+    """Tests that the async engine shares the cache and gets 304s for unchanged pages."""
+
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cached_scraper = UFCWebsiteScraper(max_workers=2, cache=cache)
+    cached_scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    first_results = cached_scraper.run_async_scrape_athlete_stats(["Jon Jones", "Conor McGregor"])
+    second_results = cached_scraper.run_async_scrape_athlete_stats(["Jon Jones", "Conor McGregor"])
+
+    assert sorted(status for _, status in fixture_server.request_log) == [200, 200, 304, 304]
+    assert cached_scraper.metrics.to_dict()["http_status_counts"] == {"200": 2, "304": 2}
+    assert cached_scraper.metrics.to_dict()["cache_hits"] == {"revalidated": 2}
+    assert second_results == first_results
+    assert first_results[0]["nickname"] == "Bones"
@@ -0,0 +1,44 @@
+import pytest
+
+from src.scraper.cli import parse_arguments
+
+
+def test_parse_arguments_defaults_to_all_divisions():
+    """Tests that no division flags selects every division."""
+
+    args = parse_arguments([])
+
+    assert args["all"] is True
+    assert args["divisions"] is None
+    assert args["engine"] == "threaded"
+
+
+def test_parse_arguments_selects_divisions():
+    """Tests that division flags are turned into the division names the scraper is configured with."""
+
+    args = parse_arguments(["-lw", "-wsw", "-engine", "async"])
+
+    assert args["all"] is False
+    assert args["divisions"] == ["Lightweight", "Women's Strawweight"]
+    assert args["engine"] == "async"
+
+
+def test_parse_arguments_rejects_unknown_options():
+    """Tests that unknown options are still rejected by the command line interface."""
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["-not_a_scraper_option"])
+
+
+def test_parse_arguments_rejects_columnar_without_pyarrow(monkeypatch):
+    """Tests that a columnar export without pyarrow installed fails before anything is scraped."""
+
+    def import_pyarrow():
+        raise ImportError("The columnar export needs pyarrow, install it with `pip install pyarrow`")
+
+    monkeypatch.setattr("src.scraper.cli.import_pyarrow", import_pyarrow)
+
+    assert parse_arguments([])["columnar"] is None
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["-columnar", "parquet"])
@@ -0,0 +1,101 @@
+import os
+from datetime import date, datetime
+
+import pytest
+
+from src.scraper.columnar import build_athlete_table, get_division, write_athlete_table
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("pyarrow.dataset")
+pytest.importorskip("pyarrow.parquet")
+
+columns = ["name", "nickname", "ranking"]
+athlete_statistics = [
+    {"name": "Jon Jones", "nickname": "Bones", "ranking": "Light Heavyweight Champion"},
+    {},
+    {"name": "Conor McGregor", "ranking": "#12 Lightweight Division", "trains_at": "SBG Ireland"},
+    {"name": "Khabib Nurmagomedov", "nickname": "", "ranking": ""},
+]
+
+
+@pytest.mark.parametrize(
+    "ranking, expected_division",
+    [
+        ("Light Heavyweight Champion", "Light Heavyweight"),
+        ("#12 Lightweight Division", "Lightweight"),
+        ("Welterweight Division", "Welterweight"),
+        ("#3 Women's Strawweight Division", "Women's Strawweight"),
+        ("", None),
+    ],
+)
+def test_get_division(ranking, expected_division):
+    """Tests that the division is taken from the athlete's ranking."""
+
+    assert get_division(ranking) == expected_division
+
+
+def test_build_athlete_table():
+    """Tests the fixed schema, the null handling and that failed athletes are skipped."""
+
+    table = build_athlete_table(athlete_statistics, columns, datetime(2023, 5, 1, 12, 30))
+
+    assert table.schema.names == ["name", "nickname", "ranking", "division", "scrape_date"]
+    assert table.schema.field("scrape_date").type == pa.date32()
+    assert table.num_rows == 3
+    assert table.column("nickname").to_pylist() == ["Bones", None, ""]
+    assert table.column("division").to_pylist() == ["Light Heavyweight", "Lightweight", None]
+    assert table.column("scrape_date").to_pylist() == [date(2023, 5, 1)] * 3
+
+
+@pytest.mark.parametrize("output_format, compression", [("parquet", "zstd"), ("parquet", "none"), ("arrow", "lz4")])
+def test_write_athlete_table(tmp_path, output_format, compression):
+    """Tests that a single file round-trips with its schema."""
+
+    table = build_athlete_table(athlete_statistics, columns, datetime(2023, 5, 1))
+    path = write_athlete_table(table, str(tmp_path / f"athletes.{output_format}"), output_format, compression)
+
+    assert pa.dataset.dataset(path, format="parquet" if output_format == "parquet" else "ipc").to_table() == table
+
+
+def test_write_partitioned_dataset(tmp_path):
+    """Tests that scrapes on different dates add their own partitions to the same dataset."""
+
+    path = str(tmp_path / "athletes.parquet")
+
+    for day in [1, 2]:
+        table = build_athlete_table(athlete_statistics, columns, datetime(2023, 5, day))
+        write_athlete_table(table, path, partition_by=["scrape_date", "division"], basename=f"0{day}052023")
+
+    assert os.path.isdir(os.path.join(path, "scrape_date=2023-05-02", "division=Lightweight"))
+
+    dataset = pa.dataset.dataset(path, format="parquet", partitioning="hive")
+    lightweights = dataset.to_table(filter=pa.dataset.field("division") == "Lightweight")
+    assert lightweights.column("name").to_pylist() == ["Conor McGregor", "Conor McGregor"]
+    assert dataset.count_rows() == 6
+
+
+def test_write_athlete_table_rejects_unsupported_codec(tmp_path):
+    """Tests that Arrow IPC files only accept the codecs the format supports."""
+
+    table = build_athlete_table(athlete_statistics, columns, datetime(2023, 5, 1))
+
+    with pytest.raises(ValueError):
+        write_athlete_table(table, str(tmp_path / "athletes.arrow"), "arrow", "snappy")
+
+
+def test_export_to_columnar(fixture_server, tmp_path, monkeypatch):
+    """Tests that the scraper's columnar export holds the same statistics as its Excel export."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    results = scraper.threaded_scrape_athlete_stats(["Jon Jones", "John Doe"])
+
+    table = pa.parquet.read_table(scraper.export_to_columnar(results))
+
+    assert table.schema.names[: len(scraper.get_athlete_columns())] == scraper.get_athlete_columns()
+    assert table.column("record").to_pylist() == ["26-1-0 (W-L-D)", "9-1-0 (W-L-D)"]
+    assert table.column("division").to_pylist() == ["Light Heavyweight", "Welterweight"]
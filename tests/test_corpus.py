@@ -0,0 +1,32 @@
+from src.scraper.corpus import PageRecorder, PageReplayer, get_corpus_key
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+def test_get_corpus_key():
+    """Tests that pages are archived independently of the host they were fetched from."""
+
+    assert get_corpus_key("https://www.ufc.com/athlete/jon-jones") == "athlete/jon-jones"
+    assert get_corpus_key("http://127.0.0.1:8000/athlete/jon-jones/") == "athlete/jon-jones"
+    assert get_corpus_key("https://www.ufc.com/athletes/all?page=2") == "athletes/all?page=2"
+
+
+def test_record_then_replay(fixture_server, tmp_path):
+    """Tests that a replayed run returns exactly what the recorded run scraped, without any request."""
+
+    athlete_list = ["Jon Jones", "Khabib Nurmagomedov", "Andrew Ghorbani"]
+    archive_path = str(tmp_path / "corpus.zip")
+
+    recording_scraper = UFCWebsiteScraper(max_workers=2, recorder=PageRecorder(archive_path))
+    recording_scraper.BASE_URL = fixture_server.url + "/athlete/"
+    recorded_results = recording_scraper.threaded_scrape_athlete_stats(athlete_list)
+    recording_scraper.recorder.close()
+
+    number_of_requests = len(fixture_server.request_log)
+
+    replaying_scraper = UFCWebsiteScraper(max_workers=2, replayer=PageReplayer(archive_path))
+    replayed_results = replaying_scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert len(fixture_server.request_log) == number_of_requests
+    assert replayed_results == recorded_results
+    assert replaying_scraper.fetch_page("https://www.ufc.com/athlete/andrew-ghorbani").status_code == 404
+    assert replaying_scraper.fetch_page("https://www.ufc.com/athlete/never-recorded").status_code == 404
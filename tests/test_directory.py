@@ -0,0 +1,130 @@
+import json
+
+import bs4
+
+from src.scraper.directory import has_next_page, parse_athletes_directory
+from src.scraper.slugs import Athlete
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import read_fixture
+
+
+def get_directory_scraper(fixture_server):
+    """
+    Helper function to get a scraper crawling the fixture server's athletes directory.
+
+    :param fixture_server: FixtureServer object
+    :return: UFCWebsiteScraper object
+    """
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.ATHLETES_DIRECTORY_URL = fixture_server.url + "/athletes/all"
+
+    return scraper
+
+
+def test_parse_athletes_directory():
+    """Tests that each athlete card of a directory page is parsed into a name and a slug."""
+
+    first_page = bs4.BeautifulSoup(read_fixture("athletes-directory", "page-0.html"), "html.parser")
+    last_page = bs4.BeautifulSoup(read_fixture("athletes-directory", "page-1.html"), "html.parser")
+
+    assert parse_athletes_directory(first_page) == [
+        ("Jon Jones", "jon-jones"),
+        ("Khabib Nurmagomedov", "khabib-nurmagomedov"),
+        ("Conor McGregor", "conor-mcgregor"),
+    ]
+    assert has_next_page(first_page)
+    assert not has_next_page(last_page)
+
+
+def test_iter_directory_athletes(fixture_server):
+    """Tests that the directory is walked until its last page, listing each athlete once."""
+
+    scraper = get_directory_scraper(fixture_server)
+
+    assert list(scraper.iter_directory_athletes()) == [
+        Athlete("Jon Jones", "jon-jones"),
+        Athlete("Khabib Nurmagomedov", "khabib-nurmagomedov"),
+        Athlete("Conor McGregor", "conor-mcgregor"),
+        Athlete("John Doe", "john-doe"),
+        Athlete("Andrew Ghorbani", "andrew-ghorbani"),
+    ]
+    assert scraper.slug_index.resolve("Andrew Ghorbani") == "andrew-ghorbani"
+
+    # The page after the last one may have been prefetched, but nothing past it
+    directory_requests = [path for path, _ in fixture_server.request_log if path == "/athletes/all"]
+    assert 2 <= len(directory_requests) <= 3
+
+    assert [athlete.name for athlete in scraper.iter_directory_athletes(max_pages=1)] == [
+        "Jon Jones",
+        "Khabib Nurmagomedov",
+        "Conor McGregor",
+    ]
+
+
+def test_athletes_sharing_a_name_are_each_crawled(fixture_server, monkeypatch):
+    """Tests that two directory athletes with the same name are each scraped from their own page."""
+
+    scraper = get_directory_scraper(fixture_server)
+    monkeypatch.setattr(
+        scraper,
+        "fetch_directory_page",
+        lambda page_number: ([("Jon Jones", "jon-jones"), ("Jon Jones", "conor-mcgregor")], False),
+    )
+
+    results = scraper.crawl_athlete_stats()
+
+    assert scraper.current_roster == [Athlete("Jon Jones", "jon-jones"), Athlete("Jon Jones", "conor-mcgregor")]
+    assert [statistics["nickname"] for statistics in results] == ["Bones", "The Notorious"]
+
+
+def test_crawl_keeps_the_athletes_found_before_a_failed_page(fixture_server, monkeypatch):
+    """Tests that a directory page failing every retry ends the walk without losing the athletes already found."""
+
+    scraper = get_directory_scraper(fixture_server)
+    fetch_directory_page = scraper.fetch_directory_page
+
+    def fail_second_page(page_number):
+        if page_number == 1:
+            raise ConnectionError("directory page unavailable")
+
+        return fetch_directory_page(page_number)
+
+    monkeypatch.setattr(scraper, "fetch_directory_page", fail_second_page)
+
+    results = scraper.crawl_athlete_stats()
+
+    assert [statistics["name"] for statistics in results] == ["Jon Jones", "Khabib Nurmagomedov", "Conor McGregor"]
+    assert list(scraper.failed_athletes) == [scraper.ATHLETES_DIRECTORY_URL + "?page=1"]
+
+
+def test_crawl_athlete_stats(fixture_server):
+    """Tests that crawling the directory scrapes the same statistics as scraping the roster as a list."""
+
+    scraper = get_directory_scraper(fixture_server)
+
+    crawled_results = scraper.crawl_athlete_stats()
+    expected_results = scraper.threaded_scrape_athlete_stats(scraper.current_roster)
+
+    assert crawled_results == expected_results
+    assert [statistics["name"] for statistics in crawled_results] == [
+        athlete.name for athlete in scraper.current_roster
+    ]
+    assert scraper.progress.total == len(scraper.current_roster)
+
+
+def test_stream_crawled_athletes(fixture_server, tmp_path, monkeypatch):
+    """Tests that athletes discovered in the directory stream straight into the output files."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = get_directory_scraper(fixture_server)
+
+    [filepath] = scraper.stream_athlete_stats(scraper.iter_directory_athletes(), ["jsonl"])
+
+    with open(filepath) as file:
+        names = sorted(json.loads(line)["name"] for line in file)
+
+    assert names == sorted(athlete.name for athlete in scraper.current_roster)
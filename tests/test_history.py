@@ -0,0 +1,147 @@
+import os
+
+import bs4
+import pytest
+
+from src.scraper.history import estimate_fight_history_pages, get_event_slug, parse_fight_history
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import read_fixture
+
+
+def get_history_scraper(fixture_server, history_concurrency=4):
+    """
+    Helper function to get a scraper fetching athlete pages from the fixture server.
+
+    :param fixture_server: FixtureServer object
+    :param history_concurrency: Maximum number of history pages of one athlete fetched concurrently
+    :return: UFCWebsiteScraper object
+    """
+
+    scraper = UFCWebsiteScraper(max_workers=2, history_concurrency=history_concurrency)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    return scraper
+
+
+def test_parse_fight_history():
+    """Tests that each fight card is parsed from the athlete's point of view."""
+
+    soup = bs4.BeautifulSoup(read_fixture("athletes", "jane-roe.html"), "html.parser")
+    fights = parse_fight_history(soup, "Jane Roe", "jane-roe")
+
+    assert len(fights) == 3
+    assert fights[0] == {
+        "name": "Jane Roe",
+        "opponent": "Smith",
+        "opponent_slug": "alice-smith",
+        "result": "Win",
+        "method": "Decision - Unanimous",
+        "round": "3",
+        "time": "5:00",
+        "event": "ufc-290",
+        "date": "Jul. 8, 2023",
+    }
+    assert [fight["result"] for fight in fights] == ["Win", "Win", "Loss"]
+
+
+def test_estimate_fight_history_pages():
+    """Tests that the number of pages is estimated from the record, and left unknown without one."""
+
+    assert estimate_fight_history_pages("7-1-0 (W-L-D)", 3) == 3
+    assert estimate_fight_history_pages("2-0-0 (W-L-D)", 3) == 1
+    assert estimate_fight_history_pages("", 3) is None
+    assert get_event_slug("https://www.ufc.com/event/ufc-285#10411") == "ufc-285"
+    assert get_event_slug("https://www.ufc.com/athlete/jon-jones") is None
+
+
+def test_scrape_fight_history_fetches_every_page(fixture_server):
+    """Tests that every "load more" page is scraped, with the pages after the first fetched in one window."""
+
+    scraper = get_history_scraper(fixture_server)
+    fights = scraper.scrape_fight_history("Jane Roe")
+
+    assert len(fights) == 8
+    assert [fight["opponent_slug"] for fight in fights][-2:] == ["lena-weber", "mia-park"]
+    assert {fight["name"] for fight in fights} == {"Jane Roe"}
+
+    # The record's 8 fights at 3 per page fit on 3 pages, nothing past them is fetched
+    assert fixture_server.request_log == [("/athlete/jane-roe", 200)] * 3
+
+
+def test_scrape_fight_history_with_fights_outside_the_ufc(fixture_server, monkeypatch):
+    """Tests that a record larger than the listed history fetches at most one window of pages past its end."""
+
+    scraper = get_history_scraper(fixture_server, history_concurrency=3)
+    monkeypatch.setattr(scraper, "scrape_athlete_record", lambda soup: "26-1-0 (W-L-D)")
+
+    fights = scraper.scrape_fight_history("Jane Roe")
+
+    assert len(fights) == 8
+    assert sorted(status for _, status in fixture_server.request_log) == [200, 200, 200, 404]
+
+
+def test_scrape_fight_history_without_an_estimate(fixture_server, monkeypatch):
+    """Tests that the history is followed window by window when the record does not give the number of pages."""
+
+    scraper = get_history_scraper(fixture_server, history_concurrency=2)
+    monkeypatch.setattr(scraper, "scrape_athlete_record", lambda soup: "")
+
+    fights = scraper.scrape_fight_history("Jane Roe")
+
+    assert len(fights) == 8
+
+
+@pytest.mark.parametrize("partial_parse", [False, True])
+@pytest.mark.parametrize("engine", ["threaded", "async", "pipeline"])
+def test_fight_history_reuses_the_page_scraped_for_statistics(fixture_server, monkeypatch, engine, partial_parse):
+    """Tests that the athlete's webpage is neither downloaded nor parsed again for their history."""
+
+    scraper = UFCWebsiteScraper(max_workers=2, fight_history=True, partial_parse=partial_parse)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    athlete_list = ["Jane Roe", "Andrew Ghorbani"]
+
+    parsed_pages = []
+    make_soup = scraper.make_soup
+
+    def tracking_make_soup(html_content, *args, **kwargs):
+        parsed_pages.append(html_content)
+        return make_soup(html_content, *args, **kwargs)
+
+    monkeypatch.setattr(scraper, "make_soup", tracking_make_soup)
+
+    if engine == "async":
+        statistics = scraper.run_async_scrape_athlete_stats(athlete_list)
+    elif engine == "pipeline":
+        statistics = scraper.pipelined_scrape_athlete_stats(athlete_list, parse_workers=1)
+    else:
+        statistics = scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    fights = scraper.scrape_fight_histories(athlete_list)
+
+    assert statistics[0]["nickname"] == "The Example"
+    assert len(fights) == 8
+
+    # The webpage is parsed once for both its statistics and the first history page, in a parsing process with
+    # the pipeline engine, and only the two "load more" pages are parsed by scrape_fight_history()
+    assert len(parsed_pages) == (2 if engine == "pipeline" else 3)
+
+    # One request for each athlete's webpage and one for each "load more" page
+    assert sorted(fixture_server.request_log) == [("/athlete/andrew-ghorbani", 404)] + [("/athlete/jane-roe", 200)] * 3
+    assert scraper.first_fight_history_pages == {}
+
+
+def test_scrape_fight_histories(fixture_server, tmp_path, monkeypatch):
+    """Tests that the histories of several athletes are joined into one long table and exported."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = get_history_scraper(fixture_server)
+    fights = scraper.scrape_fight_histories(["Jane Roe", "Jon Jones", "Andrew Ghorbani"])
+
+    # Athletes without a listed history, or without a page, have no rows
+    assert len(fights) == 8
+    assert {fight["name"] for fight in fights} == {"Jane Roe"}
+
+    excel_filepath = scraper.export_fight_history(fights)
+    assert excel_filepath.endswith("-fights.xlsx") and os.path.getsize(excel_filepath) > 0
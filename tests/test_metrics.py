@@ -0,0 +1,110 @@
+import json
+import urllib.request
+
+from src.scraper.metrics import ScrapeMetrics, serve_metrics
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+def test_histogram_buckets_and_merge():
+    """Tests that observations land in the right buckets and that snapshots merge additively."""
+
+    metrics = ScrapeMetrics()
+    metrics.observe_fetch(0.01, 200, 100)
+    metrics.observe_fetch(0.3, 200, 50)
+    metrics.observe_fetch(120, 404, 0)
+
+    snapshot = metrics.to_dict()
+    assert snapshot["fetch_latency_seconds"]["counts"][0] == 1
+    assert snapshot["fetch_latency_seconds"]["counts"][3] == 1
+    assert snapshot["fetch_latency_seconds"]["counts"][-1] == 1
+    assert snapshot["bytes_downloaded"] == 150
+    assert snapshot["http_status_counts"] == {"200": 2, "404": 1}
+
+    other_metrics = ScrapeMetrics()
+    other_metrics.observe_stage("make_soup", 0.5)
+    other_metrics.count_fallback("ranking")
+    metrics.count_cache_hit("fresh")
+    snapshot = metrics.to_dict()
+    other_metrics.merge(snapshot)
+    other_metrics.merge(snapshot)
+
+    merged_snapshot = other_metrics.to_dict()
+    assert merged_snapshot["fetch_latency_seconds"]["count"] == 6
+    assert merged_snapshot["bytes_downloaded"] == 300
+    assert merged_snapshot["http_status_counts"] == {"200": 4, "404": 2}
+    assert merged_snapshot["stages"] == {"make_soup": {"seconds": 0.5, "count": 1}}
+    assert merged_snapshot["fallback_counts"] == {"ranking": 1}
+    assert merged_snapshot["cache_hits"] == {"fresh": 2}
+    assert merged_snapshot["athletes_not_found"] == 0
+
+
+def test_scrape_collects_metrics(fixture_server):
+    """Tests that a threaded run records its fetches, parsing stages, queue waits and extractor fallbacks."""
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.threaded_scrape_athlete_stats(["Khabib Nurmagomedov", "John Doe", "Andrew Ghorbani"])
+
+    snapshot = scraper.metrics.to_dict()
+    assert snapshot["http_status_counts"] == {"200": 2, "404": 1}
+    assert snapshot["fetch_latency_seconds"]["count"] == 3
+    assert snapshot["queue_wait_seconds"]["count"] == 3
+    assert snapshot["bytes_downloaded"] > 0
+    assert snapshot["stages"]["parse_fight_metrics"]["count"] >= 2
+
+    # The not found page is not parsed, its athlete gets the extractors' fallback values without counting them
+    assert snapshot["athletes_not_found"] == 1
+    assert snapshot["stages"]["make_soup"]["count"] == 2
+    assert snapshot["stages"]["parse_fight_metrics"]["count"] == 2
+    assert "biography" not in snapshot["fallback_counts"]
+
+
+def test_pipeline_merges_process_metrics(fixture_server):
+    """Tests that parsing stages timed in the worker processes are folded into the parent's metrics."""
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.pipelined_scrape_athlete_stats(["Jon Jones", "Conor McGregor"], parse_workers=2)
+
+    snapshot = scraper.metrics.to_dict()
+    assert snapshot["fetch_latency_seconds"]["count"] == 2
+    assert snapshot["stages"]["make_soup"]["count"] == 2
+    assert snapshot["stages"]["parse_athlete_biography"]["count"] == 2
+
+
+def test_serve_metrics(tmp_path):
+    """Tests the Prometheus and JSON endpoints and the JSON export."""
+
+    metrics = ScrapeMetrics()
+    metrics.observe_fetch(0.2, 200, 1024)
+    metrics.observe_stage("export_to_excel", 1.5)
+    metrics.count_fallback("nickname")
+    metrics.count_cache_hit("revalidated")
+
+    server = serve_metrics(metrics, port=0)
+    metrics_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with urllib.request.urlopen(metrics_url + "/metrics") as response:
+            prometheus_text = response.read().decode("utf-8")
+
+        with urllib.request.urlopen(metrics_url + "/metrics.json") as response:
+            served_snapshot = json.loads(response.read())
+
+    finally:
+        server.shutdown()
+
+    assert 'ufc_scraper_fetch_latency_seconds_bucket{le="0.25"} 1' in prometheus_text
+    assert 'ufc_scraper_fetch_latency_seconds_bucket{le="+Inf"} 1' in prometheus_text
+    assert 'ufc_scraper_http_responses_total{code="200"} 1' in prometheus_text
+    assert "ufc_scraper_downloaded_bytes_total 1024" in prometheus_text
+    assert 'ufc_scraper_stage_seconds_total{stage="export_to_excel"} 1.5' in prometheus_text
+    assert 'ufc_scraper_fallbacks_total{section="nickname"} 1' in prometheus_text
+    assert 'ufc_scraper_cache_hits_total{kind="revalidated"} 1' in prometheus_text
+    assert "ufc_scraper_athletes_not_found_total 0" in prometheus_text
+    assert served_snapshot["bytes_downloaded"] == 1024
+
+    json_filepath = metrics.export_json(str(tmp_path / "metrics.json"))
+
+    with open(json_filepath) as file:
+        assert json.load(file)["stages"]["export_to_excel"]["count"] == 1
@@ -0,0 +1,140 @@
+import pandas as pd
+import pytest
+
+from src.scraper.normalize import (
+    get_normalized_columns,
+    normalize_athlete_statistics,
+    normalize_date,
+    normalize_duration,
+    normalize_inches,
+    normalize_percent,
+)
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+def test_normalize_percent():
+    """Tests that percentages with and without a percent sign become floats."""
+
+    values = pd.Series(["47%", "0", "100%", None], dtype="string")
+    assert normalize_percent(values).tolist() == [47.0, 0.0, 100.0, pd.NA]
+
+
+def test_normalize_duration():
+    """Tests that minutes:seconds and hours:minutes:seconds become seconds."""
+
+    values = pd.Series(["5:43", "15:28", "1:02:10", "5 min", None], dtype="string")
+    assert normalize_duration(values).tolist() == [343, 928, 3730, pd.NA, pd.NA]
+
+
+def test_normalize_inches():
+    """Tests that decimal inches and feet'inches" heights become inches."""
+
+    values = pd.Series(["76.00", "84.5 in", "5' 11\"", "6'", None], dtype="string")
+    assert normalize_inches(values).tolist() == [76.0, 84.5, 71.0, 72.0, pd.NA]
+
+
+def test_normalize_date():
+    """Tests the abbreviated month formats of the octagon debut."""
+
+    values = pd.Series(["Aug. 09, 2008", "Sept. 9, 2017", "May 1, 2020", "soon", None], dtype="string")
+    normalized_values = normalize_date(values)
+
+    assert normalized_values[:3].dt.strftime("%Y-%m-%d").tolist() == ["2008-08-09", "2017-09-09", "2020-05-01"]
+    assert normalized_values[3:].isna().all()
+
+
+def test_get_normalized_columns():
+    """Tests that the split record columns follow the record."""
+
+    assert get_normalized_columns(["name", "record", "age"]) == ["name", "record", "wins", "losses", "draws", "age"]
+    assert get_normalized_columns(["name", "age"]) == ["name", "age"]
+
+
+def test_normalize_athlete_statistics(caplog):
+    """Tests the typed columns, the null handling and the reporting of unparsable values."""
+
+    athlete_statistics = [
+        {
+            "name": "Jon Jones",
+            "record": "26-1-0 (W-L-D)",
+            "age": "34",
+            "weight": "204.00",
+            "significant_strikes_landed": "1,463",
+            "takedown_defense": "95%",
+            "average_fight_time": "15:28",
+        },
+        {
+            "name": "Andrew Ghorbani",
+            "record": "",
+            "age": "",
+            "weight": "N/A",
+            "significant_strikes_landed": "lots",
+            "takedown_defense": "",
+            "average_fight_time": "",
+        },
+    ]
+
+    data = normalize_athlete_statistics(athlete_statistics)
+
+    assert list(data.columns) == [
+        "name",
+        "record",
+        "wins",
+        "losses",
+        "draws",
+        "age",
+        "weight",
+        "significant_strikes_landed",
+        "takedown_defense",
+        "average_fight_time",
+    ]
+    assert data.loc[0, ["wins", "losses", "draws"]].tolist() == [26, 1, 0]
+    assert str(data["wins"].dtype) == "Int64"
+    assert str(data["takedown_defense"].dtype) == "Float64"
+    assert data.loc[0, "significant_strikes_landed"] == 1463
+    assert data.loc[0, "average_fight_time"] == 928
+    assert data.loc[1, ["wins", "age", "weight", "significant_strikes_landed", "average_fight_time"]].isna().all()
+    assert "Could not parse 1 values of the significant_strikes_landed column" in caplog.text
+
+
+def test_normalize_scraped_athletes(fixture_server):
+    """Tests that every statistic of the scraped fixtures parses, with nulls only for the missing athlete."""
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    results = scraper.threaded_scrape_athlete_stats(["Jon Jones", "John Doe", "Andrew Ghorbani"])
+
+    data = normalize_athlete_statistics(results)
+
+    assert data.loc[0, "height"] == 76.0
+    assert data.loc[0, "significant_strike_accuracy"] == 58.0
+    assert data.loc[0, "octagon_debut"] == pd.Timestamp(2008, 8, 9)
+    assert data.loc[1, "takedown_accuracy"] == 0.0
+    assert data.loc[:1].drop(columns=["nickname"]).notna().all().all()
+    assert data.loc[2, ["age", "height", "wins", "octagon_debut"]].isna().all()
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+def test_export_to_columnar_normalized(fixture_server, tmp_path, monkeypatch, normalize):
+    """Tests that the normalized columnar export has typed columns and the raw export strings."""
+
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("pyarrow.parquet")
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    results = scraper.threaded_scrape_athlete_stats(["Jon Jones"])
+
+    table = pa.parquet.read_table(scraper.export_to_columnar(results, normalize=normalize))
+
+    if normalize:
+        assert table.schema.field("wins").type == pa.int64()
+        assert table.schema.field("reach").type == pa.float64()
+        assert table.schema.field("octagon_debut").type == pa.date32()
+        assert table.column("average_fight_time").to_pylist() == [928]
+    else:
+        assert "wins" not in table.schema.names
+        assert table.column("average_fight_time").to_pylist() == ["15:28"]
@@ -0,0 +1,147 @@
+import pytest
+
+from src.scraper.ufc_scraper import PARSER_BACKENDS, UFCWebsiteScraper
+from tests.conftest import read_fixture
+
+reference_scraper = UFCWebsiteScraper(max_workers=1)
+
+athlete_fixtures = [
+    ("Khabib Nurmagomedov", "athletes/khabib-nurmagomedov.html"),
+    ("Conor McGregor", "athletes/conor-mcgregor.html"),
+    ("Jon Jones", "athletes/jon-jones.html"),
+    ("Andrew Ghorbani", "not-found.html"),
+    ("John Doe", "athletes/john-doe.html"),
+]
+
+extractor_names = [
+    "scrape_athlete_nickname",
+    "scrape_athlete_record",
+    "scrape_athlete_ranking",
+    "scrape_athlete_biography",
+    "scrape_striking_accuracy",
+    "scrape_grappling_accuracy",
+    "scrape_fight_metrics",
+]
+
+
+@pytest.mark.parametrize("parser_backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("extractor_name", extractor_names)
+@pytest.mark.parametrize("athlete_name,fixture_name", athlete_fixtures)
+def test_extractor_parity(athlete_name, fixture_name, extractor_name, parser_backend):
+    """
+    Tests that every extractor returns exactly what the html.parser backend returns
+    when the page is parsed with another backend.
+
+    :param athlete_name: Str of the fighter's name
+    :param fixture_name: Str of the saved athlete page
+    :param extractor_name: Str of the scraper method under test
+    :param parser_backend: Str of the parser backend under test
+    """
+
+    html_content = read_fixture(fixture_name)
+    backend_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=parser_backend)
+
+    expected = getattr(reference_scraper, extractor_name)(reference_scraper.make_soup(html_content))
+    scraped = getattr(backend_scraper, extractor_name)(backend_scraper.make_soup(html_content))
+
+    assert scraped == expected
+
+
+@pytest.mark.parametrize("parser_backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("athlete_name,fixture_name", athlete_fixtures)
+def test_extract_athlete_stats_parity(athlete_name, fixture_name, parser_backend):
+    """
+    Tests that the full athlete dict is identical across parser backends.
+
+    :param athlete_name: Str of the fighter's name
+    :param fixture_name: Str of the saved athlete page
+    :param parser_backend: Str of the parser backend under test
+    """
+
+    html_content = read_fixture(fixture_name)
+    backend_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=parser_backend)
+
+    expected = reference_scraper.extract_athlete_stats(athlete_name, html_content)
+    scraped = backend_scraper.extract_athlete_stats(athlete_name, html_content)
+
+    assert scraped == expected
+
+
+@pytest.mark.parametrize("parser_backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("athlete_name,fixture_name", athlete_fixtures)
+def test_scrape_athlete_page_parity(athlete_name, fixture_name, parser_backend):
+    """
+    Tests that the single-pass scrape_athlete_page() returns exactly what the seven
+    individual extractors return together.
+
+    :param athlete_name: Str of the fighter's name
+    :param fixture_name: Str of the saved athlete page
+    :param parser_backend: Str of the parser backend under test
+    """
+
+    backend_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=parser_backend)
+    soup = backend_scraper.make_soup(read_fixture(fixture_name))
+
+    expected = dict()
+    expected["nickname"] = backend_scraper.scrape_athlete_nickname(soup)
+    expected["record"] = backend_scraper.scrape_athlete_record(soup)
+    expected["ranking"] = backend_scraper.scrape_athlete_ranking(soup)
+    expected.update(backend_scraper.scrape_athlete_biography(soup))
+    expected.update(backend_scraper.scrape_striking_accuracy(soup))
+    expected.update(backend_scraper.scrape_grappling_accuracy(soup))
+    expected.update(backend_scraper.scrape_fight_metrics(soup))
+
+    scraped = backend_scraper.scrape_athlete_page(soup)
+
+    assert scraped == expected
+    assert list(scraped) == list(expected)
+
+
+@pytest.mark.parametrize("parser_backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("athlete_name,fixture_name", athlete_fixtures)
+def test_partial_parse_parity(athlete_name, fixture_name, parser_backend):
+    """
+    Tests that building only the strained sections of the page yields the same athlete dict
+    as building the full document.
+
+    :param athlete_name: Str of the fighter's name
+    :param fixture_name: Str of the saved athlete page
+    :param parser_backend: Str of the parser backend under test
+    """
+
+    html_content = read_fixture(fixture_name)
+    partial_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=parser_backend, partial_parse=True)
+
+    expected = reference_scraper.extract_athlete_stats(athlete_name, html_content)
+    scraped = partial_scraper.extract_athlete_stats(athlete_name, html_content)
+
+    assert scraped == expected
+
+
+@pytest.mark.parametrize("parser_backend", PARSER_BACKENDS)
+def test_scrape_ufc_rankings_to_txt_file_parity(fixture_server, parser_backend):
+    """
+    Tests that the rankings text file and rankings list are identical across parser backends.
+
+    :param parser_backend: Str of the parser backend under test
+    """
+
+    scraped = []
+
+    for backend in ["html.parser", parser_backend]:
+        backend_scraper = UFCWebsiteScraper(max_workers=1, parser_backend=backend)
+        backend_scraper.RANKINGS_URL = fixture_server.url + "/rankings"
+        txt_filepath = backend_scraper.scrape_ufc_rankings_to_txt_file()
+
+        with open(txt_filepath) as file:
+            scraped.append((file.read(), backend_scraper.current_rankings_list))
+
+    assert scraped[0] == scraped[1]
+    assert len(scraped[0][1]) > 0
+
+
+def test_unsupported_parser_backend():
+    """Tests that an unknown parser backend is rejected up front."""
+
+    with pytest.raises(ValueError):
+        UFCWebsiteScraper(parser_backend="selectolax")
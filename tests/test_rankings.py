@@ -0,0 +1,143 @@
+import re
+import zipfile
+
+import bs4
+
+from src.scraper.rankings import (
+    RankingEntry,
+    get_athlete_list,
+    join_rankings,
+    parse_rankings,
+    write_rankings_txt_file,
+)
+from src.scraper.slugs import Athlete
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import read_fixture
+
+soup = bs4.BeautifulSoup(read_fixture("rankings.html"), "html.parser")
+
+
+def test_parse_rankings():
+    """Tests that each division's champion is rank 0 and that the excluded divisions are left out by default."""
+
+    rankings = parse_rankings(soup)
+
+    assert rankings[:3] == [
+        RankingEntry("Flyweight", 0, "Deiveson Figueiredo", champion=True, slug="deiveson-figueiredo"),
+        RankingEntry("Flyweight", 1, "Brandon Moreno", slug="brandon-moreno"),
+        RankingEntry("Flyweight", 2, "Kai Kara-France", slug="kai-kara-france"),
+    ]
+    assert "Pound-for-Pound" not in {entry.division for entry in rankings}
+    assert "Women's Featherweight" not in {entry.division for entry in rankings}
+
+
+def test_parse_rankings_of_selected_divisions():
+    """Tests that selected divisions are kept, including the pound-for-pound rankings."""
+
+    rankings = parse_rankings(soup, ["Pound-for-Pound", "Flyweight"])
+
+    assert {entry.division for entry in rankings} == {"Pound-for-Pound", "Flyweight"}
+    assert RankingEntry("Pound-for-Pound", 5, "Jon Jones", slug="jon-jones") in rankings
+    assert not any(entry.champion for entry in rankings if entry.division == "Pound-for-Pound")
+
+
+def test_athlete_list_is_deduplicated_and_fanned_back_out():
+    """Tests that an athlete ranked twice is scraped once and joined back to both of their rankings."""
+
+    rankings = parse_rankings(soup, ["Pound-for-Pound", "Lightweight"])
+    athlete_list = get_athlete_list(rankings)
+
+    assert [entry.name for entry in rankings].count("Charles Oliveira") == 2
+    assert [athlete.name for athlete in athlete_list].count("Charles Oliveira") == 1
+    assert len(athlete_list) == len({entry.name for entry in rankings})
+    assert Athlete("Charles Oliveira", "charles-oliveira") in athlete_list
+
+    athlete_statistics = [{"name": athlete.name, "record": f"record of {athlete.name}"} for athlete in athlete_list]
+    ranked_statistics = join_rankings(rankings, athlete_list, athlete_statistics)
+
+    assert len(ranked_statistics) == len(rankings)
+
+    oliveira_rows = [row for row in ranked_statistics if row["name"] == "Charles Oliveira"]
+    assert {row["division"] for row in oliveira_rows} == {"Pound-for-Pound", "Lightweight"}
+    assert all(row["record"] == "record of Charles Oliveira" for row in oliveira_rows)
+
+
+def test_athletes_sharing_a_name_are_kept_apart():
+    """Tests that two athletes with the same name but different pages are scraped and joined separately."""
+
+    rankings_html = """
+    <div class="view-grouping">
+      <div class="view-grouping-header">Welterweight</div>
+      <table><tr>
+        <td class="views-field views-field-weight-class-rank">14</td>
+        <td class="views-field views-field-title">
+          <div class="views-row"><a href="/athlete/bruno-silva">Bruno Silva</a></div>
+        </td>
+      </tr></table>
+    </div>
+    <div class="view-grouping">
+      <div class="view-grouping-header">Flyweight</div>
+      <table><tr>
+        <td class="views-field views-field-weight-class-rank">12</td>
+        <td class="views-field views-field-title">
+          <div class="views-row"><a href="/athlete/bruno-silva-0">Bruno Silva</a></div>
+        </td>
+      </tr></table>
+    </div>
+    """
+    rankings = parse_rankings(bs4.BeautifulSoup(rankings_html, "html.parser"))
+    athlete_list = get_athlete_list(rankings)
+
+    assert athlete_list == [Athlete("Bruno Silva", "bruno-silva"), Athlete("Bruno Silva", "bruno-silva-0")]
+
+    athlete_statistics = [{"name": athlete.name, "record": f"record of {athlete.slug}"} for athlete in athlete_list]
+    ranked_statistics = join_rankings(rankings, athlete_list, athlete_statistics)
+
+    assert [(row["division"], row["record"]) for row in ranked_statistics] == [
+        ("Welterweight", "record of bruno-silva"),
+        ("Flyweight", "record of bruno-silva-0"),
+    ]
+
+
+def test_write_rankings_txt_file(tmp_path):
+    """Tests that the text file lists each division followed by its tab-indented fighters."""
+
+    rankings = [
+        RankingEntry("Flyweight", 0, "Deiveson Figueiredo", champion=True),
+        RankingEntry("Flyweight", 1, "Brandon Moreno"),
+        RankingEntry("Lightweight", 1, "Charles Oliveira"),
+    ]
+    text_filepath = write_rankings_txt_file(rankings, str(tmp_path / "rankings.txt"))
+
+    with open(text_filepath) as file:
+        assert file.read() == "Flyweight\n\tDeiveson Figueiredo\n\tBrandon Moreno\nLightweight\n\tCharles Oliveira\n"
+
+
+def test_export_rankings_to_excel(fixture_server, tmp_path, monkeypatch):
+    """Tests that the rankings sheet has a row for every ranking, an athlete ranked twice being in both."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = UFCWebsiteScraper(max_workers=2, divisions=["Pound-for-Pound", "Lightweight"])
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.RANKINGS_URL = fixture_server.url + "/rankings"
+    scraper.scrape_ufc_rankings_to_txt_file()
+
+    results = scraper.threaded_scrape_athlete_stats(scraper.current_rankings_list)
+    excel_filepath = scraper.export_rankings_to_excel(results)
+
+    assert excel_filepath == str(tmp_path / "fighter_stats" / f"{scraper.current_datetime}-rankings.xlsx")
+    assert len(scraper.current_rankings) > len(scraper.current_rankings_list)
+
+    with zipfile.ZipFile(excel_filepath) as archive:
+        worksheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        shared_strings = archive.read("xl/sharedStrings.xml").decode("utf-8")
+
+    # A header row and one row per ranking
+    assert len(re.findall(r"<row ", worksheet)) == len(scraper.current_rankings) + 1
+
+    for column in ["division", "rank", "champion", "name", "record", "Pound-for-Pound", "Lightweight"]:
+        assert f">{column}<" in shared_strings
+
+    assert shared_strings.count(">Charles Oliveira<") == 1
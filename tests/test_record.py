@@ -0,0 +1,109 @@
+import pickle
+import sys
+
+import pandas as pd
+import pytest
+
+from src.scraper.normalize import normalize_athlete_statistics
+from src.scraper.record import ATHLETE_FIELDS, AthleteRecord, to_dataframe
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+jones_statistics = {"name": "Jon Jones", "nickname": "Bones", "record": "26-1-0 (W-L-D)", "age": "34"}
+
+
+def test_record_behaves_like_dict():
+    """Tests that a record compares, iterates and converts like the dict it was built from."""
+
+    athlete_record = AthleteRecord.from_dict(jones_statistics)
+
+    assert athlete_record == jones_statistics
+    assert dict(athlete_record) == jones_statistics
+    assert athlete_record.to_dict() == jones_statistics
+    assert list(athlete_record) == ["name", "nickname", "record", "age"]
+    assert len(athlete_record) == 4
+    assert athlete_record["nickname"] == "Bones"
+    assert athlete_record.get("ranking", "unranked") == "unranked"
+    assert "ranking" not in athlete_record
+    assert AthleteRecord.from_dict(athlete_record) is athlete_record
+
+    with pytest.raises(KeyError):
+        athlete_record["ranking"]
+
+
+def test_record_keeps_extra_fields():
+    """Tests that biography fields outside the fixed fields are kept."""
+
+    athlete_record = AthleteRecord.from_dict(dict(jones_statistics, college="Morrisville State"))
+
+    assert athlete_record["college"] == "Morrisville State"
+    assert list(athlete_record)[-1] == "college"
+    assert athlete_record.to_row() == tuple(jones_statistics.get(field) for field in ATHLETE_FIELDS)
+
+
+def test_record_is_compact_and_read_only():
+    """Tests that records have no per-instance dict and cannot be modified."""
+
+    athlete_record = AthleteRecord.from_dict(jones_statistics)
+
+    assert not hasattr(athlete_record, "__dict__")
+
+    with pytest.raises(AttributeError):
+        athlete_record.nickname = "Jonny"
+
+    full_statistics = {field: "0" for field in ATHLETE_FIELDS}
+    assert sys.getsizeof(AthleteRecord.from_dict(full_statistics)) < sys.getsizeof(full_statistics)
+
+
+def test_record_pickles():
+    """Tests that records can be sent to and from parsing processes."""
+
+    athlete_record = AthleteRecord.from_dict(dict(jones_statistics, college="Morrisville State"))
+    assert pickle.loads(pickle.dumps(athlete_record)) == athlete_record
+
+
+def test_to_dataframe():
+    """Tests that records build a frame with the fixed columns, and that dicts keep the previous behavior."""
+
+    athlete_statistics = [jones_statistics, {}, {"name": "John Doe", "college": "Springfield"}]
+    athlete_records = [AthleteRecord.from_dict(statistics) for statistics in athlete_statistics]
+
+    record_data = to_dataframe(athlete_records)
+    assert list(record_data.columns) == list(ATHLETE_FIELDS) + ["college"]
+    assert record_data["name"].tolist()[::2] == ["Jon Jones", "John Doe"]
+    assert record_data.loc[2, "college"] == "Springfield"
+
+    dict_data = to_dataframe(athlete_statistics)
+    assert list(dict_data.columns) == ["name", "nickname", "record", "age", "college"]
+    assert dict_data.equals(pd.DataFrame(athlete_statistics))
+
+
+def test_all_extractor_fields_are_record_fields():
+    """Tests that the fixed fields cover every field the extractors always return."""
+
+    scraper = UFCWebsiteScraper(max_workers=1)
+    assert set(scraper.get_missing_athlete_stats("John Doe")) <= set(ATHLETE_FIELDS)
+
+
+@pytest.mark.parametrize("engine", ["threaded", "pipeline"])
+def test_compact_records_scrape(fixture_server, engine):
+    """Tests that a scraper keeping compact records returns the same statistics as one returning dicts."""
+
+    athlete_list = ["Khabib Nurmagomedov", "Jon Jones", "John Doe", "Andrew Ghorbani"]
+
+    dict_scraper = UFCWebsiteScraper(max_workers=2)
+    dict_scraper.BASE_URL = fixture_server.url + "/athlete/"
+    expected_results = dict_scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    record_scraper = UFCWebsiteScraper(max_workers=2, compact_records=True)
+    record_scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    if engine == "pipeline":
+        results = record_scraper.pipelined_scrape_athlete_stats(athlete_list, parse_workers=1)
+    else:
+        results = record_scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert all(isinstance(athlete_record, AthleteRecord) for athlete_record in results)
+    assert results == expected_results
+
+    normalized_data = normalize_athlete_statistics(results)
+    assert normalized_data.loc[1, "wins"] == 26
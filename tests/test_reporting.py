@@ -0,0 +1,108 @@
+import io
+import json
+import logging
+
+from src.scraper.reporting import JsonFormatter, ProgressReporter, configure_logging
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+def test_progress_reporter_counts():
+    """Tests the completed, failed and in-flight counts and the ETA of the progress reporter."""
+
+    progress = ProgressReporter(4, interval=60)
+    progress.start()
+    progress.start()
+    progress.finish()
+
+    try:
+        with progress.track():
+            raise ValueError("page failed")
+    except ValueError:
+        pass
+
+    snapshot = progress.snapshot()
+    assert snapshot["completed"] == 2
+    assert snapshot["failed"] == 1
+    assert snapshot["in_flight"] == 1
+    assert snapshot["total"] == 4
+    assert snapshot["rate"] > 0
+    assert snapshot["eta_seconds"] is not None
+
+
+def test_progress_reporter_is_rate_limited(caplog):
+    """Tests that finishing athletes only logs a progress line once per interval."""
+
+    progress = ProgressReporter(100, interval=60)
+
+    with caplog.at_level(logging.INFO, logger="src.scraper.reporting"):
+        for _ in range(100):
+            with progress.track():
+                pass
+
+    assert caplog.records == []
+
+    progress.interval = 0
+
+    with caplog.at_level(logging.INFO, logger="src.scraper.reporting"):
+        with progress.track():
+            pass
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].progress["completed"] == 101
+
+
+def test_json_formatter_includes_extra_fields():
+    """Tests that fields passed through extra={...} end up in the JSON event."""
+
+    record = logging.makeLogRecord(
+        {"name": "src.scraper.ufc_scraper", "levelname": "WARNING", "msg": "%s not found!", "args": ("John Doe",)}
+    )
+    record.athlete = "John Doe"
+
+    event = json.loads(JsonFormatter().format(record))
+    assert event["message"] == "John Doe not found!"
+    assert event["level"] == "WARNING"
+    assert event["athlete"] == "John Doe"
+
+
+def test_configure_logging_writes_through_queue():
+    """Tests that records logged from the scraper are written out by the background listener."""
+
+    stream = io.StringIO()
+    root_logger = logging.getLogger()
+    previous_handlers, previous_level = root_logger.handlers, root_logger.level
+
+    listener = configure_logging("WARNING", json_format=True, stream=stream)
+
+    try:
+        logging.getLogger("src.scraper.ufc_scraper").info("dropped")
+        logging.getLogger("src.scraper.ufc_scraper").warning("%s not found!", "John Doe", extra={"athlete": "John Doe"})
+    finally:
+        listener.stop()
+        root_logger.handlers, root_logger.level = previous_handlers, previous_level
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert events == [
+        {
+            "time": events[0]["time"],
+            "level": "WARNING",
+            "logger": "src.scraper.ufc_scraper",
+            "message": "John Doe not found!",
+            "athlete": "John Doe",
+        }
+    ]
+
+
+def test_scrape_reports_progress(fixture_server, caplog):
+    """Tests that a run logs missing athletes as warnings and ends with a progress summary."""
+
+    scraper = UFCWebsiteScraper(max_workers=2, progress_interval=60)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    with caplog.at_level(logging.DEBUG):
+        scraper.threaded_scrape_athlete_stats(["Jon Jones", "Andrew Ghorbani"])
+
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert warnings == ["Andrew Ghorbani not found!"]
+    assert caplog.records[-1].progress["completed"] == 2
+    assert caplog.records[-1].progress["in_flight"] == 0
@@ -0,0 +1,213 @@
+import http.server
+import json
+import threading
+from collections import Counter
+
+import pandas as pd
+import pytest
+import requests
+
+from src.scraper.metrics import ScrapeMetrics
+from src.scraper.retry import RetryPolicy, ThrottledResponseError, get_failure_reason
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+@pytest.mark.parametrize(
+    "error, expected_reason",
+    [
+        (ThrottledResponseError("https://www.ufc.com/athlete/jon-jones", 429), "429"),
+        (ThrottledResponseError("https://www.ufc.com/athlete/jon-jones", 503), "503"),
+        (requests.Timeout(), "timeout"),
+        (requests.ConnectionError(), "connection"),
+        (ConnectionResetError(), "connection"),
+        (ValueError(), None),
+        (KeyError("name"), None),
+    ],
+)
+def test_get_failure_reason(error, expected_reason):
+    """Tests that only transient fetch failures are classified as worth retrying."""
+
+    assert get_failure_reason(error) == expected_reason
+
+
+def test_retry_until_success():
+    """Tests that transient failures are retried and counted until the call succeeds."""
+
+    metrics = ScrapeMetrics()
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=0, metrics=metrics)
+    attempts = []
+
+    def flaky_fetch():
+        attempts.append(1)
+
+        if len(attempts) < 3:
+            raise requests.Timeout()
+
+        return "page"
+
+    assert retry_policy.call(flaky_fetch) == "page"
+    assert len(attempts) == 3
+    assert metrics.to_dict()["retry_counts"] == {"timeout": 2}
+
+
+def test_retry_gives_up():
+    """Tests that non-transient errors are raised at once and transient ones once attempts run out."""
+
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    attempts = []
+
+    def broken_parse():
+        attempts.append(1)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        retry_policy.call(broken_parse)
+
+    assert len(attempts) == 1
+
+    def throttled_fetch():
+        attempts.append(1)
+        raise ThrottledResponseError("https://www.ufc.com/athlete/jon-jones", 429)
+
+    with pytest.raises(ThrottledResponseError):
+        retry_policy.call(throttled_fetch)
+
+    assert len(attempts) == 4
+
+
+def test_retry_delay():
+    """Tests that the backoff grows exponentially up to max_delay and honors Retry-After."""
+
+    retry_policy = RetryPolicy(base_delay=1, max_delay=4)
+    error = requests.Timeout()
+
+    for attempt, maximum_delay in [(1, 1), (2, 2), (3, 4), (10, 4)]:
+        assert all(0 <= retry_policy.get_delay(attempt, error) <= maximum_delay for _ in range(50))
+
+    throttled_error = ThrottledResponseError("https://www.ufc.com/athlete/jon-jones", 429, retry_after=3)
+    assert retry_policy.get_delay(1, throttled_error) == 3
+
+
+@pytest.fixture
+def flaky_server():
+    """
+    Serves athlete pages that answer 503 to the first two requests of the "flaky" slug
+    and to every request of the "down" slug.
+
+    :return: Tuple of the base URL of the local server's athlete pages and a Counter of requests per slug
+    """
+
+    request_counts = Counter()
+
+    class FlakyHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            slug = self.path.rsplit("/", 1)[-1]
+            request_counts[slug] += 1
+            failing = slug == "down" or (slug == "flaky" and request_counts[slug] <= 2)
+            body = f'<html><body><div class="field field-name-nickname">"{slug}"</div></body></html>'.encode()
+            self.send_response(503 if failing else 200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/athlete/", request_counts
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("engine", ["threaded", "async", "pipeline"])
+def test_scrape_retries_and_requeues(flaky_server, engine, tmp_path, monkeypatch):
+    """Tests that flaky pages are retried, and that athletes failing every attempt are requeued and reported."""
+
+    base_url, request_counts = flaky_server
+    scraper = UFCWebsiteScraper(max_workers=4, retry_policy=RetryPolicy(max_attempts=3, base_delay=0))
+    scraper.BASE_URL = base_url
+    athlete_list = ["Healthy", "Flaky", "Down"]
+
+    if engine == "async":
+        results = scraper.run_async_scrape_athlete_stats(athlete_list)
+    elif engine == "pipeline":
+        results = scraper.pipelined_scrape_athlete_stats(athlete_list, parse_workers=1)
+    else:
+        results = scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert results[0]["nickname"] == "healthy"
+    assert results[1]["nickname"] == "flaky"
+    assert results[2] == {}
+    assert list(scraper.failed_athletes) == ["Down"]
+
+    # Three attempts in the main pass and three more in the requeue pass
+    assert request_counts["down"] == 6
+    assert scraper.metrics.to_dict()["retry_counts"]["503"] == 6
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    with open(scraper.export_run_state(results)) as file:
+        assert list(json.load(file)["failed_athletes"]) == ["Down"]
+
+    # The athlete that failed again is not exported as a row of empty statistics
+    exported_frames = []
+    monkeypatch.setattr(pd.DataFrame, "to_excel", lambda frame, *args, **kwargs: exported_frames.append(frame))
+    scraper.export_to_excel(results)
+
+    assert list(exported_frames[0]["name"]) == ["Healthy", "Flaky"]
+
+
+def test_async_scrape_honors_retry_after():
+    """Tests that the async engine passes a 429's Retry-After to the retry policy."""
+
+    request_counts = Counter()
+
+    class RateLimitingHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            request_counts[self.path] += 1
+            body = b'<html><body><div class="field field-name-nickname">"limited"</div></body></html>'
+
+            if request_counts[self.path] == 1:
+                self.send_response(429)
+                self.send_header("Retry-After", "7")
+            else:
+                self.send_response(200)
+
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RateLimitingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # max_delay keeps the test from actually waiting the 7 seconds
+    retry_policy = RetryPolicy(max_attempts=2, base_delay=0, max_delay=0.01)
+    retry_afters = []
+    get_delay = retry_policy.get_delay
+
+    def record_delay(attempt, error):
+        retry_afters.append(error.retry_after)
+        return get_delay(attempt, error)
+
+    retry_policy.get_delay = record_delay
+    scraper = UFCWebsiteScraper(max_workers=1, retry_policy=retry_policy)
+    scraper.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/athlete/"
+
+    try:
+        results = scraper.run_async_scrape_athlete_stats(["Limited"])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert results[0]["nickname"] == "limited"
+    assert retry_afters == [7]
+    assert scraper.metrics.to_dict()["retry_counts"] == {"429": 1}
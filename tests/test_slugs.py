@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from src.scraper.corpus import PageReplayer
+from src.scraper.slugs import Athlete, SlugIndex, as_athlete, get_slug_from_href, make_slug
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import build_fixture_corpus
+
+
+@pytest.mark.parametrize(
+    "athlete_name, slug",
+    [
+        ("Jon Jones", "jon-jones"),
+        ("Sean O'Malley", "sean-omalley"),
+        ("T.J. Dillashaw", "tj-dillashaw"),
+        ("Jiří Procházka", "jiri-prochazka"),
+        ("Kai Kara-France", "kai-kara-france"),
+        ("Jan Błachowicz", "jan-blachowicz"),
+    ],
+)
+def test_make_slug(athlete_name, slug):
+    """Tests that the fallback slug strips accents and punctuation the way ufc.com does."""
+
+    assert make_slug(athlete_name) == slug
+
+
+def test_get_slug_from_href():
+    """Tests that slugs are read from relative and absolute athlete links only."""
+
+    assert get_slug_from_href("/athlete/jan-blachowicz") == "jan-blachowicz"
+    assert get_slug_from_href("https://www.ufc.com/athlete/jon-jones/?tab=stats") == "jon-jones"
+    assert get_slug_from_href("/rankings") is None
+    assert get_slug_from_href(None) is None
+
+
+def test_slug_index_resolves_other_forms_of_a_name(tmp_path):
+    """Tests that a name spelled without accents or in another case resolves, and that the index is reloaded."""
+
+    filepath = str(tmp_path / "athlete_slugs.json")
+
+    slug_index = SlugIndex(filepath)
+    slug_index.add("Jan Błachowicz", "jan-blachowicz")
+    slug_index.add("Mackenzie Dern", "mackenzie-dern-0")
+
+    assert slug_index.resolve("Jan Blachowicz") == "jan-blachowicz"
+    assert slug_index.resolve("MACKENZIE DERN") == "mackenzie-dern-0"
+    assert slug_index.resolve("Jon Jones") is None
+
+    slug_index.save()
+
+    with open(filepath, encoding="utf-8") as file:
+        assert json.load(file) == {"Jan Błachowicz": "jan-blachowicz", "Mackenzie Dern": "mackenzie-dern-0"}
+
+    reloaded_index = SlugIndex(filepath)
+    assert len(reloaded_index) == 2
+    assert reloaded_index.resolve("jan blachowicz") == "jan-blachowicz"
+
+
+def test_scraper_uses_slugs_from_the_rankings(tmp_path, monkeypatch):
+    """Tests that athlete URLs come from the rankings page links once the rankings are scraped."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    replayer = PageReplayer(build_fixture_corpus(str(tmp_path / "fixtures.zip")))
+    scraper = UFCWebsiteScraper(replayer=replayer, slug_index=SlugIndex())
+    scraper.slug_index.add("Brandon Moreno", "brandon-moreno-0")
+    scraper.slug_index.add("Mackenzie Dern", "mackenzie-dern-0")
+
+    # Slugs of earlier runs are used until the rankings link to another one
+    assert scraper.get_athlete_url("Brandon Moreno") == scraper.BASE_URL + "brandon-moreno-0"
+
+    scraper.scrape_ufc_rankings()
+
+    assert scraper.get_athlete_url("Brandon Moreno") == scraper.BASE_URL + "brandon-moreno"
+    assert scraper.get_athlete_url("Mackenzie Dern") == scraper.BASE_URL + "mackenzie-dern-0"
+    assert scraper.get_athlete_url("T.J. Dillashaw") == scraper.BASE_URL + "tj-dillashaw"
+    assert len(scraper.slug_index) == len(scraper.current_rankings_list) + 1
+
+    # Athletes missing from the index fall back to a slug guessed from their name
+    assert scraper.get_athlete_url("Zhang Weili") == scraper.BASE_URL + "zhang-weili"
+
+
+def test_athletes_sharing_a_name_are_scraped_from_their_own_pages(fixture_server):
+    """Tests that the slug an athlete is listed with wins over the name index, so namesakes are both scraped."""
+
+    scraper = UFCWebsiteScraper(max_workers=2, slug_index=SlugIndex())
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.slug_index.add("Bruno Silva", "bruno-silva-0")
+
+    assert as_athlete(" Bruno Silva ") == Athlete("Bruno Silva")
+    assert scraper.get_athlete_url("Bruno Silva", "bruno-silva") == scraper.BASE_URL + "bruno-silva"
+
+    results = scraper.threaded_scrape_athlete_stats(
+        [Athlete("Bruno Silva", "bruno-silva"), Athlete("Bruno Silva", "bruno-silva-0")]
+    )
+
+    assert [statistics["name"] for statistics in results] == ["Bruno Silva", "Bruno Silva"]
+    assert sorted(path for path, _ in fixture_server.request_log) == ["/athlete/bruno-silva", "/athlete/bruno-silva-0"]
@@ -0,0 +1,165 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.scraper.rankings import RankingEntry
+from src.scraper.record import AthleteRecord
+from src.scraper.store import HistoryStore
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+scraped_at = datetime(2023, 5, 1, 12, 0, 0)
+rankings = [
+    RankingEntry("Lightweight", 0, "Islam Makhachev", champion=True),
+    RankingEntry("Lightweight", 1, "Charles Oliveira"),
+]
+makhachev_statistics = {"name": "Islam Makhachev", "record": "24-1-0 (W-L-D)", "significant_strike_accuracy": "59%"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(str(tmp_path / "history.db"), batch_size=2) as history_store:
+        yield history_store
+
+
+def test_store_uses_wal_and_indexes(store):
+    """Tests that the database is in WAL mode and that athlete lookups use an index."""
+
+    assert store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    query_plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM athlete_stats WHERE name = ?", ("Islam Makhachev",)
+    ).fetchall()
+    assert "USING INDEX" in " ".join(row[-1] for row in query_plan)
+
+
+def test_write_athlete_stats_upserts(store):
+    """Tests that writing an athlete twice into a run updates the row instead of duplicating it."""
+
+    run_id = store.start_run(scraped_at)
+    assert store.start_run(scraped_at) == run_id
+
+    assert store.write_athlete_stats(run_id, [makhachev_statistics, {}]) == 1
+    assert store.write_athlete_stats(run_id, [dict(makhachev_statistics, significant_strike_accuracy="60%")]) == 1
+
+    assert store.connection.execute("SELECT COUNT(*) FROM athlete_stats").fetchone()[0] == 1
+    assert store.get_athlete_history("Islam Makhachev", ["significant_strike_accuracy"]) == [
+        {"scraped_at": "2023-05-01T12:00:00", "significant_strike_accuracy": "60%"}
+    ]
+
+
+def test_get_athlete_history(store):
+    """Tests that an athlete's history is returned newest first and limited to the requested number of runs."""
+
+    for day in range(5):
+        run_id = store.start_run(scraped_at + timedelta(days=day))
+        store.write_rankings(run_id, rankings)
+        store.write_athlete_stats(
+            run_id,
+            [
+                AthleteRecord.from_dict(dict(makhachev_statistics, significant_strike_accuracy=f"{55 + day}%")),
+                {"name": "Charles Oliveira", "trains_at": "Chute Boxe"},
+            ],
+        )
+
+    history = store.get_athlete_history("Islam Makhachev", ["significant_strike_accuracy", "record"], limit=3)
+
+    assert [run["significant_strike_accuracy"] for run in history] == ["59%", "58%", "57%"]
+    assert history[0] == {
+        "scraped_at": "2023-05-05T12:00:00",
+        "significant_strike_accuracy": "59%",
+        "record": "24-1-0 (W-L-D)",
+    }
+    assert store.get_athlete_history("Charles Oliveira", ["trains_at"], limit=1)[0]["trains_at"] == "Chute Boxe"
+    assert store.get_ranking_history("Charles Oliveira", limit=1) == [
+        {"scraped_at": "2023-05-05T12:00:00", "division": "Lightweight", "rank": 1}
+    ]
+
+    with pytest.raises(ValueError):
+        store.get_athlete_history("Islam Makhachev", ["name; DROP TABLE runs"])
+
+
+def test_readers_do_not_block_the_writer(store):
+    """Tests that a reader with an open transaction does not block writes."""
+
+    run_id = store.start_run(scraped_at)
+    store.write_athlete_stats(run_id, [makhachev_statistics])
+
+    reader = sqlite3.connect(store.database_path)
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT COUNT(*) FROM athlete_stats").fetchone()[0] == 1
+
+    store.write_athlete_stats(run_id, [{"name": "Charles Oliveira"}])
+
+    # The reader's snapshot is unchanged until its transaction ends
+    assert reader.execute("SELECT COUNT(*) FROM athlete_stats").fetchone()[0] == 1
+    reader.execute("COMMIT")
+    assert reader.execute("SELECT COUNT(*) FROM athlete_stats").fetchone()[0] == 2
+    reader.close()
+
+
+def test_athletes_are_keyed_on_their_slug(store):
+    """Tests that namesakes with different pages are kept apart and that tied athletes share a rank."""
+
+    run_id = store.start_run(scraped_at)
+    namesakes = [
+        {"name": "Bruno Silva", "record": "23-10-0 (W-L-D)"},
+        {"name": "Bruno Silva", "record": "13-4-0 (W-L-D)"},
+    ]
+
+    assert store.write_athlete_stats(run_id, namesakes, ["bruno-silva", "bruno-silva-0"]) == 2
+    assert sorted(run["record"] for run in store.get_athlete_history("Bruno Silva", ["record"])) == [
+        "13-4-0 (W-L-D)",
+        "23-10-0 (W-L-D)",
+    ]
+
+    tied_rankings = rankings + [RankingEntry("Lightweight", 1, "Dustin Poirier")]
+    store.write_rankings(run_id, tied_rankings)
+    assert store.connection.execute("SELECT COUNT(*) FROM rankings WHERE rank = 1").fetchone()[0] == 2
+
+    # An athlete listed twice at the same rank is a scraping bug, not a row to silently replace
+    with pytest.raises(sqlite3.IntegrityError):
+        store.write_rankings(run_id, tied_rankings + [RankingEntry("Lightweight", 1, "Dustin Poirier")])
+
+    assert store.connection.execute("SELECT COUNT(*) FROM rankings").fetchone()[0] == 3
+
+
+def test_store_rejects_other_schema_versions(tmp_path):
+    """Tests that a database created with other keys is not silently written into."""
+
+    database_path = str(tmp_path / "history.db")
+
+    with sqlite3.connect(database_path) as connection:
+        connection.execute("PRAGMA user_version = 1")
+
+    with pytest.raises(ValueError):
+        HistoryStore(database_path)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_scraper_writes_into_store(fixture_server, store, streamed, tmp_path, monkeypatch):
+    """Tests that a run's rankings and athletes end up in the store, whether it is streamed or not."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+    scraper.RANKINGS_URL = fixture_server.url + "/rankings"
+    scraper.scrape_ufc_rankings_to_txt_file()
+
+    athlete_list = ["Jon Jones", "John Doe", "Andrew Ghorbani"]
+
+    if streamed:
+        scraper.stream_athlete_stats(athlete_list, ["jsonl"], store=store)
+    else:
+        results = scraper.threaded_scrape_athlete_stats(athlete_list)
+        assert scraper.export_to_store(store, results, athlete_list) == store.database_path
+
+    athletes = store.connection.execute("SELECT slug, name FROM athlete_stats ORDER BY name").fetchall()
+    assert athletes == [("andrew-ghorbani", "Andrew Ghorbani"), ("john-doe", "John Doe"), ("jon-jones", "Jon Jones")]
+
+    ranked = store.connection.execute("SELECT division, rank, name FROM rankings").fetchall()
+    assert len(ranked) == len(scraper.current_rankings)
+    assert set(ranked) == {(entry.division, entry.rank, entry.name) for entry in scraper.current_rankings}
+    assert {rank for _, rank, _ in ranked} >= {0, 1, 2}
@@ -0,0 +1,167 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+
+from src.scraper.retry import RetryPolicy
+from src.scraper.throttle import AdaptiveThrottle, TokenBucket
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+
+
+def test_token_bucket_caps_rate():
+    """Tests that the bucket allows a burst and then spaces requests at its rate."""
+
+    token_bucket = TokenBucket(rate=10, burst=2)
+
+    assert token_bucket.reserve() == 0
+    assert token_bucket.reserve() == 0
+    assert token_bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert token_bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_throttle_additive_increase():
+    """Tests that healthy responses raise the limit by about one request per round trip, up to max_limit."""
+
+    throttle = AdaptiveThrottle(max_limit=6, initial_limit=4)
+
+    for _ in range(4):
+        throttle.acquire()
+        throttle.release(0.1, 200)
+
+    assert throttle.limit == pytest.approx(5, abs=0.1)
+
+    for _ in range(100):
+        throttle.acquire()
+        throttle.release(0.1, 200)
+
+    assert throttle.limit == 6
+
+
+@pytest.mark.parametrize("status_code, latency", [(429, 0.1), (503, 0.1), (None, 0.1), (200, 5.0)])
+def test_throttle_multiplicative_decrease(status_code, latency):
+    """Tests that throttled, failed and slow responses halve the limit once per cooldown."""
+
+    throttle = AdaptiveThrottle(max_limit=50, initial_limit=40, latency_target=2.0, cooldown=60)
+
+    throttle.acquire()
+    throttle.release(latency, status_code)
+    assert throttle.limit == 20
+
+    throttle.acquire()
+    throttle.release(latency, status_code)
+    assert throttle.limit == 20
+
+
+def test_throttle_limits_requests_in_flight():
+    """Tests that no more requests than the limit are let through at once."""
+
+    throttle = AdaptiveThrottle(max_limit=50, initial_limit=2)
+
+    assert throttle.try_acquire()
+    assert throttle.try_acquire()
+    assert not throttle.try_acquire()
+
+    throttle.release(0.1, 200)
+    assert throttle.try_acquire()
+
+
+def test_throttle_is_capped_at_the_scraper_concurrency():
+    """Tests that the limit never grows past the number of requests the scraper can send at once."""
+
+    throttle = AdaptiveThrottle(max_limit=50, initial_limit=10)
+    UFCWebsiteScraper(max_workers=4, throttle=throttle)
+
+    assert throttle.max_limit == 4
+    assert throttle.limit == 4
+
+    for _ in range(20):
+        throttle.acquire()
+        throttle.release(0.1, 200)
+
+    assert throttle.limit == 4
+
+
+def test_async_acquire_is_woken_by_release():
+    """Tests that a coroutine waiting for a slot is woken by a release from another thread instead of polling."""
+
+    throttle = AdaptiveThrottle(max_limit=1, initial_limit=1)
+
+    async def wait_for_slot():
+        throttle.acquire()
+        waiting = asyncio.ensure_future(throttle.async_acquire())
+        await asyncio.sleep(0.05)
+
+        assert not waiting.done()
+        assert len(throttle.async_waiters) == 1
+
+        threading.Thread(target=throttle.release, args=(0.1, 200)).start()
+        await asyncio.wait_for(waiting, timeout=5)
+
+    asyncio.run(wait_for_slot())
+
+    assert throttle.in_flight == 1
+    assert throttle.async_waiters == []
+
+
+@pytest.fixture
+def throttling_server():
+    """
+    Serves athlete pages that answer 429 for the "throttled" slug, 404 for the
+    "missing" slug and a tiny athlete page for any other slug.
+
+    :return: Base URL of the local server's athlete pages
+    """
+
+    class ThrottlingHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            slug = self.path.rsplit("/", 1)[-1]
+            status_code = {"throttled": 429, "missing": 404}.get(slug, 200)
+            body = f'<html><body><div class="field field-name-nickname">"{slug}"</div></body></html>'.encode()
+            self.send_response(status_code)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/athlete/"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrape_backs_off_and_skips_error_pages(throttling_server):
+    """Tests that a 429 fails its athlete and lowers the limit, and that a 404 page is not parsed."""
+
+    throttle = AdaptiveThrottle(max_limit=8, initial_limit=8)
+    scraper = UFCWebsiteScraper(max_workers=8, throttle=throttle, retry_policy=RetryPolicy(max_attempts=1))
+    scraper.BASE_URL = throttling_server
+
+    results = scraper.threaded_scrape_athlete_stats(["Healthy", "Throttled", "Missing"])
+
+    assert results[0]["nickname"] == "healthy"
+    assert results[1] == {}
+    assert results[2]["name"] == "Missing"
+    assert results[2]["nickname"] == ""
+    assert throttle.limit < 8
+    assert throttle.in_flight == 0
+    assert scraper.metrics.to_dict()["stages"]["make_soup"]["count"] == 1
+
+
+def test_async_scrape_uses_throttle(throttling_server):
+    """Tests that the async engine takes and frees its slots through the throttle."""
+
+    throttle = AdaptiveThrottle(max_limit=4, initial_limit=2)
+    scraper = UFCWebsiteScraper(max_workers=4, throttle=throttle, retry_policy=RetryPolicy(max_attempts=1))
+    scraper.BASE_URL = throttling_server
+
+    results = scraper.run_async_scrape_athlete_stats(["First", "Second", "Third", "Throttled"])
+
+    assert [athlete_statistics.get("nickname") for athlete_statistics in results] == ["first", "second", "third", None]
+    assert throttle.in_flight == 0
@@ -1,12 +1,25 @@
+import http.server
+import json
 import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 
 import bs4
 import pytest
-import requests
 
+from src.scraper.corpus import PageReplayer
 from src.scraper.ufc_scraper import UFCWebsiteScraper
+from tests.conftest import build_fixture_corpus
 
-scraper = UFCWebsiteScraper()
+# Replay the saved fixtures offline unless the tests are asked to hit the live website
+if os.environ.get("UFC_LIVE_TESTS"):
+    scraper = UFCWebsiteScraper()
+else:
+    corpus_path = build_fixture_corpus(os.path.join(tempfile.mkdtemp(), "fixtures.zip"))
+    scraper = UFCWebsiteScraper(replayer=PageReplayer(corpus_path))
 
 
 def get_soup(athlete_name):
@@ -16,9 +29,8 @@ def get_soup(athlete_name):
     :param athlete_name: Str of the fighter's name
     :return: BeautifulSoup object
     """
-    athlete_name = athlete_name.lower().replace(" ", "-")
-    url = "https://www.ufc.com/athlete/" + athlete_name
-    page = requests.get(url)
+    url = scraper.get_athlete_url(athlete_name)
+    page = scraper.fetch_page(url)
     html_content = page.text
     soup = bs4.BeautifulSoup(html_content, "html.parser")
 
@@ -48,6 +60,42 @@ def test_scrape_ufc_rankings_to_txt_file():
     assert os.path.getsize(txt_filepath) > 0
 
 
+def test_scrape_ufc_rankings_of_selected_divisions(tmp_path, monkeypatch):
+    """Test that only the divisions passed to the scraper are scraped from the rankings."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    division_scraper = UFCWebsiteScraper(replayer=scraper.replayer, divisions=["Lightweight", "Flyweight"])
+    division_scraper.scrape_ufc_rankings_to_txt_file()
+
+    assert {entry.division for entry in division_scraper.current_rankings} == {"Lightweight", "Flyweight"}
+    assert len(division_scraper.current_rankings_list) == len(
+        {entry.name for entry in division_scraper.current_rankings}
+    )
+
+    with pytest.raises(ValueError):
+        UFCWebsiteScraper(divisions=["Cruiserweight"])
+
+
+def test_import_does_not_parse_command_line():
+    """Test that importing the scraper neither reads the command line nor imports the export dependencies."""
+
+    code = (
+        "import sys; import src.scraper.ufc_scraper; "
+        "print([module for module in ['argparse', 'pandas', 'xlsxwriter'] if module in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, "-not_a_scraper_option"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
 # Expected values for test_scrape_athelete_biography()
 khabib_bio = {
     "status": "Retired",
@@ -557,3 +605,147 @@ def test_scrape_athelete_stats(athlete_name, expected_stats):
 
     scraped_stats = scraper.scrape_athelete_stats(athlete_name)
     assert scraped_stats == expected_stats
+
+
+def test_threaded_scrape_athlete_stats_preserves_order(monkeypatch):
+    """
+    Tests that threaded_scrape_athlete_stats() returns results in the order of the given
+    list even when athletes finish out of order, and never exceeds max_workers.
+    """
+
+    pool_scraper = UFCWebsiteScraper(max_workers=3)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fake_scrape_athlete_stats(athlete_name, athlete_slug=None):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+
+        time.sleep(0.05 if athlete_name.endswith("0") else 0.01)
+
+        with lock:
+            in_flight[0] -= 1
+
+        return {"name": athlete_name}
+
+    monkeypatch.setattr(pool_scraper, "scrape_athelete_stats", fake_scrape_athlete_stats)
+
+    athlete_list = [f"Athlete {i}" for i in range(10)]
+    results = pool_scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert [result["name"] for result in results] == athlete_list
+    assert in_flight[1] <= 3
+
+
+def test_scraper_session_pool_sized_to_workers():
+    """Tests that the scraper's shared session keeps a connection pool as large as its concurrency."""
+
+    pooled_scraper = UFCWebsiteScraper(max_workers=8)
+    adapter = pooled_scraper.session.get_adapter("https://www.ufc.com/rankings")
+
+    assert adapter._pool_maxsize == 8
+    assert pooled_scraper.timeout is not None
+
+
+@pytest.fixture
+def local_athlete_server():
+    """
+    Serves a tiny athlete page for any path on a local HTTP server, echoing the slug
+    back as the athlete's nickname.
+
+    :return: Base URL of the local server's athlete pages
+    """
+
+    class AthletePageHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            slug = self.path.rsplit("/", 1)[-1]
+            body = f'<html><body><div class="field field-name-nickname">"{slug}"</div></body></html>'.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), AthletePageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/athlete/"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_async_scrape_athlete_stats(local_athlete_server):
+    """Tests that the async engine scrapes every athlete and returns results in order."""
+
+    async_scraper = UFCWebsiteScraper(max_workers=4)
+    async_scraper.BASE_URL = local_athlete_server
+
+    athlete_list = [f"Athlete {i}" for i in range(12)]
+    results = async_scraper.run_async_scrape_athlete_stats(athlete_list)
+
+    assert [result["name"] for result in results] == athlete_list
+    assert [result["nickname"] for result in results] == [f"athlete-{i}" for i in range(12)]
+    assert results[0]["significant_strikes_landed"] == "0"
+
+
+def test_pipelined_scrape_athlete_stats(local_athlete_server):
+    """Tests that the fetch/parse pipeline parses pages in worker processes and returns results in order."""
+
+    pipeline_scraper = UFCWebsiteScraper(max_workers=4)
+    pipeline_scraper.BASE_URL = local_athlete_server
+
+    athlete_list = [f"Athlete {i}" for i in range(8)]
+    results = pipeline_scraper.pipelined_scrape_athlete_stats(athlete_list, parse_workers=2)
+
+    assert [result["name"] for result in results] == athlete_list
+    assert [result["nickname"] for result in results] == [f"athlete-{i}" for i in range(8)]
+
+
+def test_incremental_scrape_reuses_unchanged_athletes(fixture_server, tmp_path, monkeypatch):
+    """
+    Tests that a run loaded with a previous run's state only re-parses athletes whose
+    page content changed.
+    """
+
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("fighter_stats")
+
+    athlete_list = ["Jon Jones", "Conor McGregor"]
+
+    first_scraper = UFCWebsiteScraper(max_workers=2)
+    first_scraper.BASE_URL = fixture_server.url + "/athlete/"
+    first_results = first_scraper.threaded_scrape_athlete_stats(athlete_list)
+    state_filepath = first_scraper.export_run_state(first_results)
+
+    # Pretend Conor McGregor's page changed since the previous run
+    with open(state_filepath) as file:
+        state = json.load(file)
+
+    state["athletes"][1]["content_hash"] = "stale"
+
+    with open(state_filepath, "w") as file:
+        json.dump(state, file)
+
+    parsed_athletes = []
+    second_scraper = UFCWebsiteScraper(max_workers=2)
+    second_scraper.BASE_URL = fixture_server.url + "/athlete/"
+    original_extract_athlete_stats = second_scraper.extract_athlete_stats
+
+    def tracking_extract_athlete_stats(athlete_name, html_content, url=None):
+        parsed_athletes.append(athlete_name)
+        return original_extract_athlete_stats(athlete_name, html_content, url)
+
+    monkeypatch.setattr(second_scraper, "extract_athlete_stats", tracking_extract_athlete_stats)
+
+    assert second_scraper.load_previous_run(state_filepath) == 2
+
+    second_results = second_scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert parsed_athletes == ["Conor McGregor"]
+    assert second_results == first_results
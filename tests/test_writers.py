@@ -0,0 +1,153 @@
+import csv
+import json
+import logging
+import zipfile
+
+import pytest
+
+from src.scraper.ufc_scraper import UFCWebsiteScraper
+from src.scraper.writers import CsvRecordWriter, ExcelRecordWriter, JsonlRecordWriter
+
+columns = ["name", "nickname", "record"]
+jones_statistics = {"name": "Jon Jones", "nickname": "Bones", "record": "26-1-0 (W-L-D)"}
+mcgregor_statistics = {"name": "Conor McGregor", "record": "22-6-0 (W-L-D)", "trains_at": "SBG Ireland"}
+
+
+def read_xlsx_text(filepath):
+    """
+    :param filepath: Filepath of an .xlsx file
+    :return: String containing the xml of the worksheet and its shared strings
+    """
+
+    with zipfile.ZipFile(filepath) as archive:
+        return "".join(
+            archive.read(name).decode("utf-8")
+            for name in archive.namelist()
+            if name in ["xl/worksheets/sheet1.xml", "xl/sharedStrings.xml"]
+        )
+
+
+def test_csv_writer(tmp_path, caplog):
+    """Tests that rows are written in column order and that fields outside the columns are reported."""
+
+    filepath = str(tmp_path / "athletes.csv")
+
+    with caplog.at_level(logging.WARNING, logger="src.scraper.writers"):
+        with CsvRecordWriter(filepath, columns) as writer:
+            writer.write(jones_statistics)
+
+            # Rows are on disk before the writer is closed
+            with open(filepath) as file:
+                assert len(file.readlines()) == 2
+
+            writer.write(mcgregor_statistics)
+            writer.write(mcgregor_statistics)
+
+    with open(filepath, newline="") as file:
+        rows = list(csv.reader(file))
+
+    assert rows == [
+        columns,
+        ["Jon Jones", "Bones", "26-1-0 (W-L-D)"],
+        ["Conor McGregor", "", "22-6-0 (W-L-D)"],
+        ["Conor McGregor", "", "22-6-0 (W-L-D)"],
+    ]
+    assert writer.records_written == 3
+    assert [record.getMessage() for record in caplog.records] == [
+        "Dropping the trains_at field, which is not one of the output's columns"
+    ]
+
+
+def test_jsonl_writer(tmp_path):
+    """Tests that every field is kept, with the known columns first."""
+
+    filepath = str(tmp_path / "athletes.jsonl")
+
+    with JsonlRecordWriter(filepath, columns) as writer:
+        writer.write(mcgregor_statistics)
+        writer.write(jones_statistics)
+
+    with open(filepath) as file:
+        records = [json.loads(line) for line in file]
+
+    assert records == [mcgregor_statistics, jones_statistics]
+    assert list(records[0]) == ["name", "record", "trains_at"]
+
+
+def test_excel_writer(tmp_path):
+    """Tests that the constant memory workbook holds the header and every row."""
+
+    filepath = str(tmp_path / "athletes.xlsx")
+
+    with ExcelRecordWriter(filepath, columns) as writer:
+        writer.write(jones_statistics)
+        writer.write(mcgregor_statistics)
+
+    xlsx_text = read_xlsx_text(filepath)
+
+    for value in columns + ["Jon Jones", "Bones", "Conor McGregor", "22-6-0 (W-L-D)"]:
+        assert value in xlsx_text
+
+    assert 'r="A3"' in xlsx_text
+
+
+def test_iter_scrape_athlete_stats(fixture_server):
+    """Tests that the generator yields every athlete once, with the same statistics as the threaded engine."""
+
+    athlete_list = ["Khabib Nurmagomedov", "Conor McGregor", "Jon Jones", "John Doe", "Andrew Ghorbani"]
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    streamed_results = dict()
+
+    for athlete_index, athlete, athlete_statistics in scraper.iter_scrape_athlete_stats(athlete_list):
+        assert athlete == athlete_list[athlete_index]
+        streamed_results[athlete_index] = athlete_statistics
+
+    expected_results = scraper.threaded_scrape_athlete_stats(athlete_list)
+
+    assert sorted(streamed_results) == list(range(len(athlete_list)))
+    assert [streamed_results[athlete_index] for athlete_index in range(len(athlete_list))] == expected_results
+
+
+@pytest.mark.parametrize("output_format", ["csv", "jsonl", "xlsx"])
+def test_stream_athlete_stats(fixture_server, output_format, tmp_path, monkeypatch):
+    """Tests that a streamed run writes one row per athlete to each output file."""
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fighter_stats").mkdir()
+
+    scraper = UFCWebsiteScraper(max_workers=2)
+    scraper.BASE_URL = fixture_server.url + "/athlete/"
+
+    [filepath] = scraper.stream_athlete_stats(["Jon Jones", "John Doe", "Andrew Ghorbani"], [output_format])
+    assert filepath.endswith(f"-data.{output_format}")
+
+    if output_format == "csv":
+        with open(filepath, newline="") as file:
+            rows = list(csv.DictReader(file))
+
+        assert sorted(row["name"] for row in rows) == ["Andrew Ghorbani", "John Doe", "Jon Jones"]
+        assert {row["name"]: row["nickname"] for row in rows}["Jon Jones"] == "Bones"
+
+    elif output_format == "jsonl":
+        with open(filepath) as file:
+            records = [json.loads(line) for line in file]
+
+        assert sorted(record["name"] for record in records) == ["Andrew Ghorbani", "John Doe", "Jon Jones"]
+
+    else:
+        xlsx_text = read_xlsx_text(filepath)
+        assert "Jon Jones" in xlsx_text and "John Doe" in xlsx_text and 'r="A4"' in xlsx_text
+
+
+def test_jsonl_writer_keeps_unknown_fields_silently(tmp_path, caplog):
+    """Tests that the JSONL writer does not report the fields it keeps as dropped."""
+
+    with caplog.at_level(logging.WARNING, logger="src.scraper.writers"):
+        with JsonlRecordWriter(str(tmp_path / "athletes.jsonl"), columns) as writer:
+            writer.write(mcgregor_statistics)
+
+    assert writer.records_written == 1
+    assert caplog.records == []